@@ -21,15 +21,84 @@ import subprocess
 import shutil
 import webbrowser
 import json
+import time
+_STARTED_AT = time.monotonic()  # Startup tracer origin, taken before the heavy Qt imports
+import hashlib
+import re
+import html
+import base64
+import bisect
+import difflib
+import mmap
+import mimetypes
+import pickle
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque
 from urllib.parse import quote_plus
+try:
+    import psutil  # Optional: process memory/CPU on platforms without /proc
+except ImportError:
+    psutil = None
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QTextEdit, QLineEdit,
-                             QPushButton, QFrame, QSplitter, QComboBox, QStackedLayout)
+                             QPushButton, QFrame, QSplitter, QComboBox, QStackedLayout, QMenu,
+                             QDialog, QListWidget, QListWidgetItem)
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-from PyQt6.QtCore import QUrl, Qt, pyqtSignal
-from PyQt6.QtGui import QAction, QGuiApplication, QKeyEvent, QColor
+from PyQt6.QtCore import QUrl, Qt, pyqtSignal, pyqtSlot, QObject, QFile, QIODevice, QTimer, QEvent, QPoint
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+from PyQt6.QtGui import QAction, QGuiApplication, QKeyEvent, QColor, QTextCursor
 from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEngineScript, QWebEngineUrlRequestInterceptor
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInfo
+
+class StartupTracer:
+    """Records startup phases with monotonic timestamps relative to the first import"""
+
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.phases = []  # (phase, seconds since start)
+        self.echo = False  # Print the trace once startup finished (--trace-startup)
+        self.finished = False
+
+    def mark(self, phase):
+        if not self.finished:
+            self.phases.append((phase, time.monotonic() - self.started_at))
+
+    def has(self, phase):
+        return any(name == phase for name, _at in self.phases)
+
+    def summary(self):
+        lines, previous = [], 0.0
+        for phase, at in self.phases:
+            lines.append(f"{phase:<24} {at * 1000:>8.1f} ms  (+{(at - previous) * 1000:.1f})")
+            previous = at
+        return "\n".join(lines)
+
+    def finish(self, trace_path=None):
+        """Stop recording; dump the trace if asked to on the command line"""
+        if self.finished:
+            return
+        self.mark('startup_done')
+        self.finished = True
+        debug_log("Startup trace:\n" + self.summary())
+        if not self.echo:
+            return
+        print(self.summary())
+        if trace_path:
+            record = {'timestamp': time.time(),
+                      'phases_ms': {phase: round(at * 1000, 1) for phase, at in self.phases}}
+            try:
+                with open(trace_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"Error saving startup trace: {e}")
+
+startup_trace = StartupTracer(_STARTED_AT)
+startup_trace.mark('imports_done')
 
 # Pre-computed header bytes for performance (avoid repeated encoding)
 _HEADER_ACCEPT_LANG = b"en-US,en;q=0.9"
@@ -37,22 +106,296 @@ _HEADER_SEC_CH_UA = b'"Not A(Brand";v="8", "Chromium";v="131", "Google Chrome";v
 _HEADER_SEC_CH_MOBILE = b"?0"
 _HEADER_SEC_CH_PLATFORM = b'"Windows"'
 
+# Common tracking/telemetry domains to block for faster load
+_BLOCK_LIST = {
+    "google-analytics.com", "analytics.google.com", "sentry.io",
+    "intercom.io", "intercomcdn.com", "segment.io", "facebook.net",
+    "hotjar.com", "mixpanel.com"
+}
+
+# Hosts-file entries that name the machine itself rather than a blocked domain
+_HOSTS_FILE_SKIP = {"localhost", "localhost.localdomain", "local", "broadcasthost", "ip6-localhost",
+                    "ip6-loopback", "0.0.0.0"}
+
+class DomainBlocklist:
+    """Domain-suffix index: a host is blocked if it or any parent domain is listed.
+
+    Rules live in a hash set, so a lookup costs one hash probe per host label no matter
+    how many rules are loaded. Exceptions (EasyList '@@' rules) are only consulted on a hit.
+    """
+    # Bump when the compiled format or parsing rules change to invalidate caches
+    CACHE_VERSION = 1
+
+    def __init__(self, domains=(), exceptions=()):
+        self.domains = set(domains)
+        self.exceptions = set(exceptions)
+
+    def __len__(self):
+        return len(self.domains)
+
+    @staticmethod
+    def _suffix_hit(host, index):
+        if host in index:
+            return True
+        dot = host.find('.')
+        while dot != -1:
+            host = host[dot + 1:]
+            if host in index:
+                return True
+            dot = host.find('.')
+        return False
+
+    def matches(self, host):
+        """True if host (already lower case) or one of its parent domains is blocked"""
+        return self._suffix_hit(host, self.domains) and not (
+            self.exceptions and self._suffix_hit(host, self.exceptions))
+
+    def add_rule_line(self, line):
+        """Parse one line of a hosts file, a plain domain list or an EasyList filter list"""
+        line = line.strip()
+        if not line or line[0] in '!#[':
+            return
+        if line.startswith('||') or line.startswith('@@||'):
+            # Only whole-domain network rules ('||example.com^') map onto a suffix index,
+            # rules with paths, wildcards or $options are skipped
+            exception = line.startswith('@@')
+            rule = line[4:] if exception else line[2:]
+            if rule.endswith('^'):
+                rule = rule[:-1]
+            if not rule or any(c in rule for c in '/*^$|'):
+                return
+            (self.exceptions if exception else self.domains).add(rule.lower().rstrip('.'))
+            return
+        if '##' in line or '#@#' in line or '/' in line:
+            return  # Cosmetic or URL rules
+        parts = line.split('#', 1)[0].split()
+        if len(parts) > 1:
+            names = parts[1:]  # hosts format: '0.0.0.0 example.com [more names]'
+        else:
+            names = parts
+        for name in names:
+            name = name.lower().rstrip('.')
+            if name and name not in _HOSTS_FILE_SKIP and '.' in name:
+                self.domains.add(name)
+
+    def load_file(self, path):
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                self.add_rule_line(line)
+
+    @classmethod
+    def load(cls, paths, cache_path=None):
+        """Build the built-in list plus all rule files, reusing the compiled cache when current"""
+        signature = [cls.CACHE_VERSION, sorted(_BLOCK_LIST)]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('signature') == signature:
+                    return cls(cached['domains'], cached['exceptions'])
+            except Exception as e:
+                print(f"Error loading blocklist cache: {e}")
+
+        blocklist = cls(_BLOCK_LIST)
+        for path in paths:
+            try:
+                blocklist.load_file(path)
+            except OSError as e:
+                print(f"Error loading blocklist {path}: {e}")
+        if cache_path:
+            try:
+                tmp_path = cache_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump({'signature': signature, 'domains': blocklist.domains,
+                                 'exceptions': blocklist.exceptions}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Error saving blocklist cache: {e}")
+        return blocklist
+
+    @classmethod
+    def load_directory(cls, directory):
+        """Load every rule file in directory, caching the compiled form next to them"""
+        try:
+            paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                           if not name.startswith('.') and os.path.isfile(os.path.join(directory, name)))
+        except FileNotFoundError:
+            paths = []
+        if not paths:
+            return cls(_BLOCK_LIST)
+        return cls.load(paths, cache_path=os.path.join(directory, ".compiled_blocklist.pickle"))
+
+_ResourceType = QWebEngineUrlRequestInfo.ResourceType
+
+# Requests carrying page logic and API traffic - these always get the aligned client-hint headers
+_HEADER_RESOURCE_TYPES = frozenset({
+    _ResourceType.ResourceTypeMainFrame, _ResourceType.ResourceTypeSubFrame,
+    _ResourceType.ResourceTypeNavigationPreloadMainFrame, _ResourceType.ResourceTypeNavigationPreloadSubFrame,
+    _ResourceType.ResourceTypeXhr, _ResourceType.ResourceTypeSubResource, _ResourceType.ResourceTypeWebSocket,
+    _ResourceType.ResourceTypeWorker, _ResourceType.ResourceTypeSharedWorker,
+    _ResourceType.ResourceTypeServiceWorker, _ResourceType.ResourceTypeUnknown,
+})
+
+# Lite mode block options -> resource types they drop ('third_party_image' is handled separately)
+_LITE_BLOCK_TYPES = {
+    'font': _ResourceType.ResourceTypeFontResource,
+    'media': _ResourceType.ResourceTypeMedia,
+    'image': _ResourceType.ResourceTypeImage,
+}
+_LITE_DEFAULT_BLOCK = ('font', 'media', 'third_party_image')
+
+# Two-label public suffixes common enough to matter when telling first from third party
+_TWO_LABEL_SUFFIXES = {"co.uk", "com.au", "co.jp", "com.br", "co.in", "com.cn", "co.kr", "com.tw"}
+
+def site_of(host):
+    """Approximate registrable domain (eTLD+1) of a host"""
+    labels = host.rsplit('.', 3)
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in _TWO_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+class InterceptionPolicy:
+    """Lite mode: per-provider request policy keyed on resource type and first/third party.
+
+    Pages whose first-party host is one of lite_hosts skip header rewriting on static
+    subresources and drop the resource kinds listed in block.
+    """
+
+    def __init__(self, lite_hosts=(), block=_LITE_DEFAULT_BLOCK):
+        self.lite_hosts = set(lite_hosts)
+        self.block_types = frozenset(_LITE_BLOCK_TYPES[kind] for kind in block if kind in _LITE_BLOCK_TYPES)
+        self.block_third_party_images = 'third_party_image' in block
+
+    def is_lite(self, first_party_host):
+        return bool(self.lite_hosts) and DomainBlocklist._suffix_hit(first_party_host, self.lite_hosts)
+
+# Requests that gate first render or first interaction - their hosts are worth preconnecting
+_CRITICAL_RESOURCE_TYPES = frozenset({
+    _ResourceType.ResourceTypeMainFrame, _ResourceType.ResourceTypeScript,
+    _ResourceType.ResourceTypeStylesheet, _ResourceType.ResourceTypeFontResource,
+    _ResourceType.ResourceTypeXhr, _ResourceType.ResourceTypeWebSocket,
+})
+
+class HostStats:
+    """Learns which hosts each provider pulls critical resources from, for preconnecting.
+
+    Per provider site it counts page loads and, per host, how many of those loads used
+    it and how early (EMA of the first request's offset from the main-frame request).
+    Persisted as JSON in the profile directory.
+    """
+    FILE_NAME = "learned_hosts.json"
+    MAX_HOSTS = 40  # Kept per provider site
+    MAX_AGE_S = 30 * 24 * 3600  # Hosts unseen this long are forgotten
+    OFFSET_WEIGHT = 0.3  # EMA weight of the newest offset
+
+    def __init__(self, path=None, sites=None):
+        self.path = path
+        self.sites = sites or {}  # Site -> {'loads': n, 'hosts': {host: {'loads', 'offset_ms', 'last_seen'}}}
+        self.dirty = False
+        self._page_started = {}  # Site -> monotonic time of the current main-frame request
+        self._page_seen = {}  # Site -> hosts already counted for the current page load
+        self._site_cache = {}  # First-party host -> site, a handful of entries per profile
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                sites = json.load(f)
+            if isinstance(sites, dict):
+                return cls(path, sites)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading learned hosts: {e}")
+        return cls(path)
+
+    def record(self, first_party_host, host, resource_type):
+        """Note a critical request; cheap when the host was already seen on this page load"""
+        site = self._site_cache.get(first_party_host)
+        if site is None:
+            site = self._site_cache[first_party_host] = site_of(first_party_host)
+        if resource_type == _ResourceType.ResourceTypeMainFrame:
+            self._page_started[site] = time.monotonic()
+            self._page_seen[site] = set()
+            self.sites.setdefault(site, {'loads': 0, 'hosts': {}})['loads'] += 1
+        seen = self._page_seen.get(site)
+        if seen is None or host in seen:
+            return
+        seen.add(host)
+        offset_ms = (time.monotonic() - self._page_started[site]) * 1000
+        entry = self.sites[site]['hosts'].setdefault(host, {'loads': 0, 'offset_ms': offset_ms})
+        entry['loads'] += 1
+        entry['offset_ms'] = round(entry['offset_ms'] + self.OFFSET_WEIGHT * (offset_ms - entry['offset_ms']), 1)
+        entry['last_seen'] = time.time()
+        self.dirty = True
+
+    def top_hosts(self, site, count=6):
+        """Hosts most pages of the site use, earliest first among equals"""
+        stats = self.sites.get(site)
+        if not stats or not stats['loads']:
+            return []
+        ranked = sorted(stats['hosts'].items(),
+                        key=lambda item: (-round(item[1]['loads'] / stats['loads'], 1), item[1]['offset_ms']))
+        return [host for host, _entry in ranked[:count]]
+
+    def save(self):
+        if not self.dirty or not self.path:
+            return
+        cutoff = time.time() - self.MAX_AGE_S
+        for stats in self.sites.values():
+            hosts = {host: entry for host, entry in stats['hosts'].items() if entry.get('last_seen', 0) >= cutoff}
+            if len(hosts) > self.MAX_HOSTS:
+                hosts = dict(sorted(hosts.items(), key=lambda item: -item[1]['loads'])[:self.MAX_HOSTS])
+            stats['hosts'] = hosts
+        try:
+            atomic_write_text(self.path, json.dumps(self.sites))
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving learned hosts: {e}")
+
 class RequestInterceptor(QWebEngineUrlRequestInterceptor):
     """Lightweight request interceptor - filters tracking and sets essential headers for speed"""
-    # Common tracking/telemetry domains to block for faster load
-    _BLOCK_LIST = {
-        b"google-analytics.com", b"analytics.google.com", b"sentry.io", 
-        b"intercom.io", b"intercomcdn.com", b"segment.io", b"facebook.net",
-        b"hotjar.com", b"mixpanel.com"
-    }
+
+    def __init__(self, parent=None, blocklist=None, policy=None, host_stats=None):
+        super().__init__(parent)
+        # Learns the hosts providers load critical resources from (preconnect list)
+        self.host_stats = host_stats
+        # Swapped in whole once large filter lists finish loading, never mutated in place
+        self.blocklist = blocklist if blocklist is not None else DomainBlocklist(_BLOCK_LIST)
+        # Likewise replaced whole when lite mode is toggled
+        self.policy = policy if policy is not None else InterceptionPolicy()
 
     def interceptRequest(self, info):
         # Block telemetry/tracking to speed up page logic
-        url_host = info.requestUrl().host().lower().encode()
-        for block_domain in self._BLOCK_LIST:
-            if block_domain in url_host:
-                info.block(True)
-                return
+        # QUrl already normalizes hosts to lower case, lookup is O(labels)
+        host = info.requestUrl().host()
+        if self.blocklist.matches(host):
+            info.block(True)
+            return
+
+        if self.host_stats is not None:
+            resource_type = info.resourceType()
+            if resource_type in _CRITICAL_RESOURCE_TYPES:
+                self.host_stats.record(info.firstPartyUrl().host(), host, resource_type)
+
+        policy = self.policy
+        if policy.lite_hosts:
+            first_party_host = info.firstPartyUrl().host()
+            if policy.is_lite(first_party_host):
+                resource_type = info.resourceType()
+                if resource_type in policy.block_types or (
+                        policy.block_third_party_images and resource_type == _ResourceType.ResourceTypeImage
+                        and site_of(host) != site_of(first_party_host)):
+                    info.block(True)
+                    return
+                if resource_type not in _HEADER_RESOURCE_TYPES:
+                    return  # Static subresources don't need client hints rewritten
 
         # Only set critical headers that affect site behavior
         info.setHttpHeader(b"Accept-Language", _HEADER_ACCEPT_LANG)
@@ -67,7 +410,2159 @@ _USER_AGENT = (
     "Chrome/131.0.0.0 Safari/537.36"
 )
 
+# Per-provider DOM adapters consumed by the in-page runtime below.
+# 'input'/'send' are selector lists tried in order, 'insert' picks the text insertion strategy.
+_PROVIDER_ADAPTERS = {
+    'ChatGPT': {
+        'input': ['div#prompt-textarea[contenteditable="true"]'],
+        'insert': 'paragraphs',
+        'insert_large': 'paste',
+        'send': ['button[data-testid="send-button"]'],
+        'upload': ['input[type="file"][multiple]', 'input[type="file"]'],
+        'response': ['div[data-message-author-role="assistant"]'],
+        'user': ['div[data-message-author-role="user"]'],
+        # Whole conversation turns, for DOM virtualization of long threads
+        'turn': ['article[data-testid^="conversation-turn"]', 'div[data-message-author-role]'],
+        'busy': ['button[data-testid="stop-button"]'],
+    },
+    'Claude': {
+        'input': ['div.ProseMirror[contenteditable="true"]'],
+        'insert': 'paragraphs',
+        'insert_large': 'paste',
+        'send': ['button[aria-label="Send message"]'],
+        'upload': ['input[data-testid="file-upload"]', 'input[type="file"]'],
+        'response': ['div.font-claude-response', 'div.font-claude-message'],
+        'user': ['div[data-testid="user-message"]'],
+        'turn': ['div[data-test-render-count]', 'div[data-is-streaming]'],
+        'busy': ['[data-is-streaming="true"]', 'button[aria-label="Stop response"]'],
+    },
+    'Grok': {
+        'input': ['textarea[placeholder="Ask anything"]'],
+        'insert': 'exec_command',
+        # execCommand makes the textarea re-layout as the text goes in, one assignment doesn't
+        'insert_large': 'value',
+        'send': ['button[aria-label="Grok something"]'],
+        'upload': ['input[type="file"][name="files"]', 'input[type="file"]'],
+        'response': ['div.response-content-markdown', 'div[data-testid="grok-response"]'],
+        'user': ['div[data-testid="user-message"]', 'div.items-end div.message-bubble'],
+        'turn': ['div[id^="response-"]', 'div.response-content-markdown'],
+        'busy': ['button[aria-label="Stop model response"]', 'button[aria-label="Stop"]'],
+    },
+    'AI Studio': {
+        # Try multiple selectors for Google AI Studio input field
+        'input': [
+            'ms-autosize-textarea textarea',
+            'textarea[placeholder*="Type something"]',
+            'textarea[aria-label*="prompt"]',
+            '.text-input-field textarea',
+            'textarea',
+        ],
+        'insert': 'value',
+        'send': [
+            'ms-run-button button',
+            'button[aria-label*="Run"]',
+            'button[aria-label*="Send"]',
+            '.run-button button',
+            'button.send-button',
+        ],
+        'send_timeout_ms': 2000,
+        # No file input until the upload menu is opened, files are dropped on the prompt instead
+        # Fallback: simulate Enter key press on the textarea
+        'enter_fallback': True,
+        'response': ['ms-chat-turn .chat-turn-container.model', 'ms-chat-turn .model-prompt-container'],
+        'user': ['ms-chat-turn .chat-turn-container.user', 'ms-chat-turn .user-prompt-container'],
+        'turn': ['ms-chat-turn'],
+        'busy': ['ms-run-button button[aria-label*="Stop"]', 'button[aria-label*="Stop"]'],
+    },
+    'Kimi K2': {
+        # Kimi K2 uses a contenteditable div with Lexical editor
+        'input': [
+            '#chat-container > div.layout-content-main > div > div.chat-editor > div.chat-input > div.chat-input-editor-container > div.chat-input-editor',
+            'div.chat-input-editor[contenteditable="true"]',
+            'div[data-lexical-editor="true"]',
+            '.chat-input-editor',
+        ],
+        # Select all existing content and replace it - most reliable way to work with Lexical
+        'insert': 'select_exec_command',
+        'insert_large': 'paste',
+        'send': ['.send-button-container:not(.disabled)'],
+        'upload': ['input[type="file"]'],
+        'disabled_class': 'disabled',
+        'response': ['.segment-assistant .markdown', '.chat-content-item-assistant .markdown'],
+        'user': ['.segment-user .segment-content', '.chat-content-item-user'],
+        'turn': ['.chat-content-item', '.segment-assistant'],
+        'busy': ['.send-button-container.stop', '.stop-message-btn'],
+    },
+}
+
+# Response capture tuning: coalesce DOM mutations, then call a response finished once
+# the provider's busy indicator is gone and the text stayed unchanged for 'idle_ms'
+_CAPTURE_FLUSH_MS = 150
+_CAPTURE_IDLE_MS = 1500
+_CAPTURE_TIMEOUT_MS = 10 * 60 * 1000
+# A send that produced no response node this long after the busy indicator went away
+# (changed DOM, error banner, login wall) is finished as 'no_response'
+_CAPTURE_NO_RESPONSE_MS = 8000
+# How long a send waits for the input box to appear (pages still hydrating after a reload)
+_INPUT_WAIT_MS = 15000
+# Prompts from this size on use the adapter's 'insert_large' strategy: a synthetic paste
+# lets the editor take the text in one transaction instead of per paragraph or keystroke
+_LARGE_PROMPT_CHARS = 16 * 1024
+
+# Provider runtime - installed once per page into an isolated world, so every send only
+# ships a short call with a JSON payload instead of a freshly formatted template to parse.
+_PROVIDER_RUNTIME_JS = """(function(){
+'use strict';
+if (window.__mvc) return;
+var ADAPTERS = %ADAPTERS%;
+var TIMING = %TIMING%;
+var transport = (typeof qt !== 'undefined') && qt.webChannelTransport;
+var bridge = null, pending = [];
+if (transport && typeof QWebChannel !== 'undefined') {
+  new QWebChannel(transport, function(channel){
+    bridge = channel.objects.mvcBridge;
+    pending.forEach(function(message){ bridge.post(message); });
+    pending = [];
+  });
+} else {
+  transport = null;
+}
+function emit(event){
+  // Only the bridge, never the console: page scripts can write to it and forge events
+  var message = JSON.stringify(event);
+  if (bridge) bridge.post(message);
+  else if (transport) pending.push(message);
+}
+function query(selectors){
+  for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (el) return el;
+  }
+  return null;
+}
+function queryAll(selectors){
+  for (var i = 0; i < (selectors || []).length; i++) {
+    var list = document.querySelectorAll(selectors[i]);
+    if (list.length) return list;
+  }
+  return [];
+}
+function pasteText(input, text){
+  // Synthetic paste over the whole content; editors (ProseMirror, Lexical) read
+  // clipboardData and cancel the event once they have inserted the text themselves
+  input.focus();
+  var sel = window.getSelection();
+  var range = document.createRange();
+  range.selectNodeContents(input);
+  sel.removeAllRanges();
+  sel.addRange(range);
+  var data = new DataTransfer();
+  data.setData('text/plain', text);
+  return !input.dispatchEvent(new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true}));
+}
+function insertText(input, text, mode, largeMode){
+  // Returns the strategy actually used
+  if (largeMode && text.length >= TIMING.large_prompt_chars) {
+    if (largeMode === 'paste' && pasteText(input, text)) return 'paste';
+    if (largeMode === 'value') mode = 'value';
+  }
+  if (mode === 'paragraphs') {
+    // Build nodes with textContent so HTML-like prompt text is never parsed as markup
+    var frag = document.createDocumentFragment();
+    text.split('\\n').forEach(function(line){
+      var p = document.createElement('p');
+      if (line) p.textContent = line; else p.appendChild(document.createElement('br'));
+      frag.appendChild(p);
+    });
+    input.replaceChildren(frag);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+  } else if (mode === 'exec_command' || mode === 'select_exec_command') {
+    input.focus();
+    if (mode === 'select_exec_command') {
+      var sel = window.getSelection();
+      var range = document.createRange();
+      range.selectNodeContents(input);
+      sel.removeAllRanges();
+      sel.addRange(range);
+    }
+    document.execCommand('insertText', false, text);
+  } else {
+    input.focus();
+    input.value = text;
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+  }
+  return mode;
+}
+function isReady(btn, adapter){
+  return !!btn && !btn.disabled && !(adapter.disabled_class && btn.classList.contains(adapter.disabled_class));
+}
+function pressEnter(input){
+  ['keydown', 'keypress', 'keyup'].forEach(function(type){
+    input.dispatchEvent(new KeyboardEvent(type, {key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true}));
+  });
+}
+var activeCapture = null;
+function captureResponse(provider, adapter, id){
+  // Stream the newest assistant message back as it grows, coalescing mutations
+  if (activeCapture) activeCapture.finish('superseded');
+  var baseline = queryAll(adapter.response).length;
+  var sent = '', flushTimer = null, idleTimer = null, observer = null, hardTimer = null, quietTimer = null;
+  var capture = {finish: finish};
+  activeCapture = capture;
+  function busy(){
+    return !!(adapter.busy && query(adapter.busy));
+  }
+  function flush(){
+    clearTimeout(flushTimer);
+    flushTimer = null;
+    var nodes = queryAll(adapter.response);
+    if (nodes.length <= baseline) return;
+    var text = nodes[nodes.length - 1].innerText;
+    if (text === sent) return;
+    if (text.length > sent.length && text.startsWith(sent)) {
+      emit({type: 'response_chunk', provider: provider, id: id, offset: sent.length, text: text.slice(sent.length)});
+    } else {
+      // Provider re-rendered the message (markdown, code blocks) - resend it whole
+      emit({type: 'response_chunk', provider: provider, id: id, offset: 0, text: text, reset: true});
+    }
+    sent = text;
+  }
+  function armIdle(){
+    clearTimeout(idleTimer);
+    if (!sent) return;
+    idleTimer = setTimeout(function(){
+      if (busy()) armIdle(); else finish('idle');
+    }, adapter.idle_ms || TIMING.idle_ms);
+  }
+  function armNoResponse(){
+    // Don't sit out the hard timeout when the response selector never matches anything
+    quietTimer = setTimeout(function(){
+      if (queryAll(adapter.response).length > baseline) return;
+      if (busy()) armNoResponse(); else finish('no_response');
+    }, TIMING.no_response_ms);
+  }
+  function finish(reason){
+    if (activeCapture !== capture) return;
+    activeCapture = null;
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(hardTimer);
+    clearTimeout(quietTimer);
+    flush();
+    emit({type: 'response_done', provider: provider, id: id, chars: sent.length, reason: reason});
+  }
+  observer = new MutationObserver(function(){
+    if (!flushTimer) flushTimer = setTimeout(function(){ flush(); armIdle(); }, TIMING.flush_ms);
+  });
+  observer.observe(document.body, {subtree: true, childList: true, characterData: true});
+  hardTimer = setTimeout(function(){ finish('timeout'); }, TIMING.timeout_ms);
+  armNoResponse();
+}
+function clickWhenReady(provider, adapter, input, id, startedAt){
+  // Watch the DOM instead of polling: click the moment the send button becomes enabled
+  var observer = null, timer = null, finished = false;
+  function finish(outcome){
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    emit({type: 'send_outcome', provider: provider, id: id, outcome: outcome,
+          elapsed_ms: Math.round(performance.now() - startedAt)});
+    if (outcome === 'clicked' || outcome === 'enter_fallback') captureResponse(provider, adapter, id);
+  }
+  function check(){
+    var btn = query(adapter.send);
+    if (!isReady(btn, adapter)) return false;
+    btn.click();
+    finish('clicked');
+    return true;
+  }
+  if (check()) return;
+  observer = new MutationObserver(check);
+  observer.observe(document.body, {subtree: true, childList: true, attributes: true,
+                                   attributeFilter: ['disabled', 'class', 'aria-disabled']});
+  timer = setTimeout(function(){
+    if (check()) return;
+    if (adapter.enter_fallback) {
+      pressEnter(input);
+      finish('enter_fallback');
+    } else {
+      finish('timeout');
+    }
+  }, adapter.send_timeout_ms || 3000);
+}
+function whenPresent(selectors, timeoutMs, callback){
+  // Resolve immediately if the element exists, otherwise watch for it up to timeoutMs
+  var el = query(selectors);
+  if (el) { callback(el); return; }
+  var timer = null;
+  var observer = new MutationObserver(function(){
+    var found = query(selectors);
+    if (!found) return;
+    observer.disconnect();
+    clearTimeout(timer);
+    callback(found);
+  });
+  observer.observe(document.documentElement, {childList: true, subtree: true});
+  timer = setTimeout(function(){
+    observer.disconnect();
+    callback(query(selectors));
+  }, timeoutMs);
+}
+function send(provider, payload){
+  var startedAt = performance.now();
+  var adapter = ADAPTERS[provider];
+  if (!adapter) return 'unknown_provider';
+  whenPresent(adapter.input, TIMING.input_wait_ms, function(input){
+    if (!input) {
+      emit({type: 'send_outcome', provider: provider, id: payload.id, outcome: 'no_input',
+            elapsed_ms: Math.round(performance.now() - startedAt)});
+      return;
+    }
+    var strategy = insertText(input, payload.text, adapter.insert, adapter.insert_large);
+    emit({type: 'input_accepted', provider: provider, id: payload.id, strategy: strategy,
+          elapsed_ms: Math.round(performance.now() - startedAt)});
+    clickWhenReady(provider, adapter, input, payload.id, startedAt);
+  });
+  return 'dispatched';
+}
+function decodeBase64(data){
+  var binary = atob(data), bytes = new Uint8Array(binary.length);
+  for (var i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+  return bytes;
+}
+function attach(provider, payload){
+  // Hand files to the page like a user would: through its file input, else by a drop
+  var startedAt = performance.now();
+  var adapter = ADAPTERS[provider];
+  if (!adapter) return 'unknown_provider';
+  var outcome, data = new DataTransfer();
+  try {
+    payload.files.forEach(function(file){
+      data.items.add(new File([decodeBase64(file.data)], file.name,
+                              {type: file.type, lastModified: file.modified}));
+    });
+    var input = query(adapter.upload || []);
+    var target = input ? null : query(adapter.drop || adapter.input);
+    if (input) {
+      input.files = data.files;
+      input.dispatchEvent(new Event('input', {bubbles: true}));
+      input.dispatchEvent(new Event('change', {bubbles: true}));
+      outcome = 'input';
+    } else if (target) {
+      var accepted = false;
+      ['dragenter', 'dragover', 'drop'].forEach(function(type){
+        // A drop zone cancels the drop event once it has taken the files
+        accepted = !target.dispatchEvent(new DragEvent(type, {dataTransfer: data, bubbles: true, cancelable: true}));
+      });
+      outcome = accepted ? 'drop' : 'drop_ignored';
+    } else {
+      outcome = 'no_target';
+    }
+  } catch (e) {
+    outcome = 'error: ' + e.message;
+  }
+  emit({type: 'attach_outcome', provider: provider, id: payload.id, outcome: outcome,
+        files: data.files.length, elapsed_ms: Math.round(performance.now() - startedAt)});
+  return outcome;
+}
+function firstPresent(selectors){
+  for (var i = 0; i < (selectors || []).length; i++) {
+    if (document.querySelector(selectors[i])) return selectors[i];
+  }
+  return null;
+}
+function exportConversation(provider, id, chunkChars){
+  // Stream the conversation as structured messages, a chunk at a time, yielding in
+  // between so a conversation with thousands of turns never blocks the page
+  var adapter = ADAPTERS[provider];
+  if (!adapter) return 'unknown_provider';
+  var user = firstPresent(adapter.user), response = firstPresent(adapter.response);
+  var selector = [user, response].filter(Boolean).join(', ');
+  var nodes = selector ? Array.prototype.filter.call(document.querySelectorAll(selector), function(node){
+    return !(node.parentElement && node.parentElement.closest(selector));  // Outermost matches only
+  }) : [];
+  var index = 0, seq = 0;
+  function next(){
+    var messages = [], size = 0, deadline = performance.now() + 8;
+    while (index < nodes.length && size < chunkChars && performance.now() < deadline) {
+      var node = nodes[index++];
+      var text = node.innerText;
+      messages.push({role: user && node.matches(user) ? 'user' : 'assistant', text: text});
+      size += text.length;
+    }
+    emit({type: 'export_chunk', provider: provider, id: id, seq: seq++, messages: messages,
+          total: nodes.length, done: index >= nodes.length});
+    if (index < nodes.length) setTimeout(next, 0);
+  }
+  next();
+  return 'exporting';
+}
+function isBusy(provider){
+  // Completion detector: a capture still streaming or the provider's busy indicator shown
+  var adapter = ADAPTERS[provider];
+  return !!activeCapture || !!(adapter && adapter.busy && query(adapter.busy));
+}
+// Report first contentful paint so the app can start loading the next pane
+if (typeof PerformanceObserver !== 'undefined') {
+  try {
+    new PerformanceObserver(function(list, observer){
+      list.getEntries().forEach(function(entry){
+        if (entry.name !== 'first-contentful-paint') return;
+        observer.disconnect();
+        emit({type: 'first_paint', elapsed_ms: Math.round(entry.startTime)});
+      });
+    }).observe({type: 'paint', buffered: true});
+  } catch (e) {}
+}
+Object.defineProperty(window, '__mvc', {value: Object.freeze({send: send, busy: isBusy, attach: attach,
+                                                       exportConversation: exportConversation})});
+})();"""
+
+# Isolated world for the runtime - page scripts can't see or clobber it
+_RUNTIME_WORLD_ID = QWebEngineScript.ScriptWorldId.ApplicationWorld
+
+def _load_qwebchannel_js():
+    """Read qwebchannel.js from Qt's resources so the runtime can talk to its bridge"""
+    source_file = QFile(":/qtwebchannel/qwebchannel.js")
+    if not source_file.open(QIODevice.OpenModeFlag.ReadOnly):
+        print("Error: qwebchannel.js not available, pane responses can't be captured")
+        return ""
+    try:
+        return bytes(source_file.readAll()).decode('utf-8')
+    finally:
+        source_file.close()
+
+def build_provider_runtime_script():
+    """Create the QWebEngineScript that installs the provider runtime on every page load"""
+    script = QWebEngineScript()
+    script.setName("mvc-provider-runtime")
+    timing = {'flush_ms': _CAPTURE_FLUSH_MS, 'idle_ms': _CAPTURE_IDLE_MS,
+              'timeout_ms': _CAPTURE_TIMEOUT_MS, 'no_response_ms': _CAPTURE_NO_RESPONSE_MS,
+              'input_wait_ms': _INPUT_WAIT_MS,
+              'large_prompt_chars': _LARGE_PROMPT_CHARS}
+    source = (_PROVIDER_RUNTIME_JS
+              .replace('%ADAPTERS%', json.dumps(_PROVIDER_ADAPTERS))
+              .replace('%TIMING%', json.dumps(timing)))
+    # qwebchannel.js goes first so QWebChannel is defined in the runtime's world
+    script.setSourceCode(_load_qwebchannel_js() + "\n" + source)
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    script.setWorldId(_RUNTIME_WORLD_ID)
+    script.setRunsOnSubFrames(False)
+    return script
+
+# Long-thread DOM virtualization: all but the newest turns get content-visibility:auto,
+# so the browser skips style, layout and paint for the ones scrolled out of view
+_VIRTUALIZE_JS = """(function(){
+'use strict';
+if (window.__mvcVirtualize) return;
+window.__mvcVirtualize = true;
+var CONFIG = %CONFIG%;
+var style = document.createElement('style');
+style.textContent = '[data-mvc-virtual]{content-visibility:auto;contain-intrinsic-size:auto ' +
+                    CONFIG.intrinsic_px + 'px}';
+var selector = null, scheduled = false, lastCount = -1;
+function apply(){
+  scheduled = false;
+  if (!style.isConnected) (document.head || document.documentElement).appendChild(style);
+  if (!selector) {
+    for (var i = 0; i < CONFIG.turns.length && !selector; i++) {
+      if (document.querySelector(CONFIG.turns[i])) selector = CONFIG.turns[i];
+    }
+    if (!selector) return;
+  }
+  var turns = document.querySelectorAll(selector);
+  if (turns.length === lastCount) return;
+  lastCount = turns.length;
+  // A data attribute survives framework re-renders that rewrite class names
+  var old = turns.length - CONFIG.keep_recent;
+  for (var j = 0; j < turns.length; j++) {
+    if ((j < old) !== turns[j].hasAttribute('data-mvc-virtual')) turns[j].toggleAttribute('data-mvc-virtual', j < old);
+  }
+}
+function schedule(){
+  if (!scheduled) {
+    scheduled = true;
+    setTimeout(apply, CONFIG.delay_ms);
+  }
+}
+new MutationObserver(schedule).observe(document.documentElement, {childList: true, subtree: true});
+schedule();
+})();"""
+
+def build_virtualization_script(providers, keep_recent=8, intrinsic_px=600):
+    """Create the QWebEngineScript virtualizing old conversation turns of the given providers"""
+    turns = [selector for name in providers for selector in _PROVIDER_ADAPTERS.get(name, {}).get('turn', [])]
+    config = {'turns': turns, 'keep_recent': keep_recent, 'intrinsic_px': intrinsic_px, 'delay_ms': 500}
+    script = QWebEngineScript()
+    script.setName("mvc-virtualize")
+    script.setSourceCode(_VIRTUALIZE_JS.replace('%CONFIG%', json.dumps(config)))
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+    script.setWorldId(_RUNTIME_WORLD_ID)
+    script.setRunsOnSubFrames(False)
+    return script
+
+def build_send_call(provider, payload_json):
+    """Build the tiny per-pane call for an already JSON-encoded payload"""
+    return f"window.__mvc&&__mvc.send({json.dumps(provider)},{payload_json})"
+
+def build_busy_call(provider):
+    """Build the call asking a pane's runtime whether it is still generating"""
+    return f"!!(window.__mvc&&__mvc.busy({json.dumps(provider)}))"
+
+def build_attach_call(provider, payload_json):
+    """Build the per-pane call handing an encoded attachment payload to the runtime"""
+    return f"window.__mvc&&__mvc.attach({json.dumps(provider)},{payload_json})"
+
+def build_export_call(provider, export_id, chunk_chars):
+    """Build the call that starts streaming a pane's conversation back in chunks"""
+    return f"window.__mvc&&__mvc.exportConversation({json.dumps(provider)},{export_id},{chunk_chars})"
+
+# Attachments from this size on are memory-mapped rather than read into a bytes copy
+_ATTACH_MMAP_BYTES = 1024 * 1024
+# Each pane keeps its own decoded copy, so broadcasts are capped
+_ATTACH_MAX_BYTES = 100 * 1024 * 1024
+
+def encode_attachments(attach_id, paths):
+    """Read every file once and encode them once into the JSON payload all panes share"""
+    files = []
+    for path in paths:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            if size >= _ATTACH_MMAP_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = base64.b64encode(mapped)
+            else:
+                data = base64.b64encode(f.read())
+        files.append({
+            'name': os.path.basename(path),
+            'type': mimetypes.guess_type(path)[0] or 'application/octet-stream',
+            'size': size,
+            'modified': int(os.path.getmtime(path) * 1000),
+            'data': data.decode('ascii'),
+        })
+    return json.dumps({'id': attach_id, 'files': files})
+
+class PaneBridge(QObject):
+    """QWebChannel endpoint the provider runtime posts its events to"""
+    eventPosted = pyqtSignal(dict)
+
+    @pyqtSlot(str)
+    def post(self, message):
+        try:
+            event = json.loads(message)
+        except ValueError:
+            return
+        self.eventPosted.emit(event)
+
+class ResponseTracker(QObject):
+    """Assembles streamed pane responses and derives per-provider latency metrics"""
+    responseUpdated = pyqtSignal(str, str)  # provider, text so far
+    responseFinished = pyqtSignal(str, str, dict)  # provider, final text, metrics
+    # Keep a rolling window of recent metrics per provider for averages
+    HISTORY_SIZE = 50
+    # Give up on a pane that never reports done, well after the runtime's own capture timeout
+    BUSY_TIMEOUT_S = _CAPTURE_TIMEOUT_MS / 1000 + 60
+    BUSY_CHECK_MS = 30000
+
+    def __init__(self, metrics_path=None, parent=None):
+        super().__init__(parent)
+        self.metrics_path = metrics_path
+        self._active = {}
+        self.history = {}
+        self._busy_timer = QTimer(self)
+        self._busy_timer.timeout.connect(self._expire)
+
+    def start(self, provider, broadcast_id):
+        """Mark the moment a prompt was dispatched to a provider's pane"""
+        self._active[provider] = {
+            'id': broadcast_id, 'dispatched_at': time.monotonic(),
+            'first_token_at': None, 'text': '',
+        }
+        if not self._busy_timer.isActive():
+            self._busy_timer.start(self.BUSY_CHECK_MS)
+
+    def abandon(self, provider, reason, broadcast_id=None):
+        """Stop waiting for a pane's answer (reloaded, stashed, no runtime), finishing it as is"""
+        state = self._active.get(provider)
+        if not state or (broadcast_id is not None and state['id'] != broadcast_id):
+            return
+        del self._active[provider]
+        metrics = self._finish_metrics(provider, state, reason)
+        self.responseFinished.emit(provider, state['text'], metrics)
+
+    def _expire(self):
+        now = time.monotonic()
+        for provider, state in list(self._active.items()):
+            if now - state['dispatched_at'] > self.BUSY_TIMEOUT_S:
+                debug_log(f"{provider} never reported its answer as done, freeing the pane")
+                self.abandon(provider, 'busy_timeout')
+        if not self._active:
+            self._busy_timer.stop()
+
+    def is_busy(self, provider):
+        """True while a prompt sent to this provider is still being answered"""
+        return provider in self._active
+
+    def text_of(self, provider):
+        state = self._active.get(provider)
+        return state['text'] if state else ''
+
+    def broadcast_of(self, provider):
+        """Id of the broadcast a provider is answering, None when idle"""
+        state = self._active.get(provider)
+        return state['id'] if state else None
+
+    def handle_event(self, provider, event):
+        state = self._active.get(provider)
+        if not state or event.get('id') != state['id']:
+            return
+        event_type = event.get('type')
+        if event_type == 'send_outcome':
+            if event['outcome'] not in ('clicked', 'enter_fallback'):
+                del self._active[provider]  # Nothing was submitted, nothing to capture
+        elif event_type == 'response_chunk':
+            if state['first_token_at'] is None and event['text']:
+                state['first_token_at'] = time.monotonic()
+            state['text'] = state['text'][:event['offset']] + event['text']
+            self.responseUpdated.emit(provider, state['text'])
+        elif event_type == 'response_done':
+            del self._active[provider]
+            metrics = self._finish_metrics(provider, state, event.get('reason'))
+            self.responseFinished.emit(provider, state['text'], metrics)
+
+    def _finish_metrics(self, provider, state, reason):
+        finished_at = time.monotonic()
+        first = state['first_token_at']
+        chars = len(state['text'])
+        generation_s = (finished_at - first) if first is not None else None
+        metrics = {
+            'provider': provider,
+            'broadcast_id': state['id'],
+            'ttft_s': round(first - state['dispatched_at'], 3) if first is not None else None,
+            'generation_s': round(generation_s, 3) if generation_s is not None else None,
+            'total_s': round(finished_at - state['dispatched_at'], 3),
+            'chars': chars,
+            'chars_per_s': round(chars / generation_s, 1) if generation_s else None,
+            'reason': reason,
+            'timestamp': time.time(),
+        }
+        self.history.setdefault(provider, deque(maxlen=self.HISTORY_SIZE)).append(metrics)
+        if self.metrics_path:
+            try:
+                with open(self.metrics_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(metrics) + "\n")
+            except OSError as e:
+                print(f"Error saving response metrics: {e}")
+        return metrics
+
+    def averages(self, provider):
+        """Average TTFT, throughput and total time over the recent responses of a provider"""
+        averages = {}
+        for key in ('ttft_s', 'chars_per_s', 'total_s'):
+            values = [m[key] for m in self.history.get(provider, ()) if m[key] is not None]
+            averages[key] = round(sum(values) / len(values), 3) if values else None
+        return averages
+
+class BroadcastTimeline(QObject):
+    """Stamps each broadcast with per-pane phases and writes them to a JSONL trace"""
+    timelineChanged = pyqtSignal()
+    # Phase order used for display; times are ms since the broadcast started
+    PHASES = ('dispatched', 'input_accepted', 'send_clicked', 'first_token', 'finished')
+    PHASE_LABELS = {'dispatched': 'js', 'input_accepted': 'input', 'send_clicked': 'click',
+                    'first_token': '1st', 'finished': 'done'}
+
+    def __init__(self, trace_path=None, parent=None):
+        super().__init__(parent)
+        self.trace_path = trace_path
+        self.current = None
+
+    def begin(self, broadcast_id, prompt_chars):
+        self.current = {
+            'id': broadcast_id, 'timestamp': time.time(), 't0': time.monotonic(),
+            'prompt_chars': prompt_chars, 'panes': {},
+        }
+        self.timelineChanged.emit()
+
+    def stamp(self, provider, phase, **extra):
+        """Record a phase for a pane of the current broadcast (first stamp wins)"""
+        if self.current is None:
+            return
+        pane = self.current['panes'].setdefault(provider, {'phases': {}})
+        if phase in pane['phases'] and not extra:
+            return
+        pane['phases'].setdefault(phase, round((time.monotonic() - self.current['t0']) * 1000, 1))
+        pane.update(extra)
+        self.timelineChanged.emit()
+
+    def handle_event(self, provider, event):
+        if self.current is None or event.get('id') != self.current['id']:
+            return
+        event_type = event.get('type')
+        if event_type == 'input_accepted':
+            self.stamp(provider, 'input_accepted', runtime_input_ms=event.get('elapsed_ms'),
+                       strategy=event.get('strategy'))
+        elif event_type == 'send_outcome':
+            if event['outcome'] in ('clicked', 'enter_fallback'):
+                self.stamp(provider, 'send_clicked', outcome=event['outcome'],
+                           runtime_send_ms=event.get('elapsed_ms'))
+            else:
+                self.stamp(provider, 'finished', outcome=event['outcome'])
+                self._write(provider)
+        elif event_type == 'response_chunk' and event.get('text'):
+            self.stamp(provider, 'first_token')
+        elif event_type == 'response_done':
+            self.stamp(provider, 'finished', reason=event.get('reason'))
+            self._write(provider)
+
+    def _write(self, provider):
+        if not self.trace_path:
+            return
+        pane = self.current['panes'][provider]
+        phases = pane['phases']
+        record = {
+            'broadcast_id': self.current['id'], 'timestamp': self.current['timestamp'],
+            'provider': provider, 'prompt_chars': self.current['prompt_chars'],
+            'phases_ms': phases,
+            # Injection = our side (dispatch to click), backend = theirs (click to first token)
+            'injection_ms': self._span(phases, 'dispatched', 'send_clicked'),
+            'backend_ms': self._span(phases, 'send_clicked', 'first_token'),
+        }
+        record.update({k: v for k, v in pane.items() if k != 'phases'})
+        try:
+            with open(self.trace_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Error writing broadcast trace: {e}")
+
+    @staticmethod
+    def _span(phases, start, end):
+        if start in phases and end in phases:
+            return round(phases[end] - phases[start], 1)
+        return None
+
+    def summary(self):
+        """One line per pane describing the live timeline of the current broadcast"""
+        if self.current is None:
+            return ""
+        parts = []
+        for provider, pane in self.current['panes'].items():
+            stamps = []
+            for phase in self.PHASES:
+                if phase in pane['phases']:
+                    stamps.append(f"{self.PHASE_LABELS[phase]} {pane['phases'][phase]:.0f}")
+            if pane.get('outcome') not in (None, 'clicked', 'enter_fallback'):
+                stamps.append(pane['outcome'])
+            parts.append(f"{provider}: " + " › ".join(stamps))
+        return f"#{self.current['id']} (ms)  " + "  |  ".join(parts)
+
+class ConversationArchive(QObject):
+    """Per-profile SQLite archive of every prompt and captured response, with FTS5 search.
+
+    One worker thread owns the connection, so writes stay in order and searches never
+    block the GUI; results come back through searchFinished / threadLoaded.
+    """
+    searchFinished = pyqtSignal(int, list, bool)  # search id, rows, more rows available
+    threadLoaded = pyqtSignal(int, list)  # message id, prompt and responses of its broadcast
+    PAGE_SIZE = 100
+    SNIPPET_MARKS = ('⟨', '⟩')
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            session TEXT NOT NULL,
+            broadcast_id INTEGER,
+            created REAL NOT NULL,
+            text TEXT NOT NULL,
+            metrics TEXT
+        );
+        CREATE INDEX IF NOT EXISTS messages_thread ON messages(session, broadcast_id);
+    """
+    # External-content index: the text is stored once, in messages
+    _FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            text, content='messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2');
+        CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+    """
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        # Broadcast ids restart with every run, the session tells runs apart
+        self.session = f"{int(time.time())}-{os.getpid()}"
+        self._db = None
+        self._fts = False
+        self._search_seq = 0
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        self._worker.submit(self._open)
+
+    @staticmethod
+    def path_for(profile_path):
+        """Archive file kept next to a profile's storage directory"""
+        return profile_path + ".archive.sqlite3"
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(self._SCHEMA)
+            try:
+                db.executescript(self._FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError as e:
+                # SQLite built without FTS5: fall back to substring scans
+                print(f"Error enabling archive full-text index: {e}")
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            print(f"Error opening conversation archive {self.path}: {e}")
+
+    def add_prompt(self, broadcast_id, text):
+        self._worker.submit(self._insert, 'prompt', '', broadcast_id, text, None)
+
+    def add_response(self, provider, text, metrics):
+        if text:
+            self._worker.submit(self._insert, 'response', provider, metrics.get('broadcast_id'),
+                                text, json.dumps(metrics))
+
+    def _insert(self, kind, provider, broadcast_id, text, metrics_json):
+        if self._db is None:
+            return
+        try:
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO messages (kind, provider, session, broadcast_id, created, text, metrics) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (kind, provider, self.session, broadcast_id, time.time(), text, metrics_json))
+        except sqlite3.Error as e:
+            print(f"Error archiving {kind}: {e}")
+
+    @staticmethod
+    def fts_query(text):
+        """Every word as a quoted prefix term, so typing matches as you go and never hits FTS syntax"""
+        terms = ['"' + word.replace('"', '""') + '"*' for word in text.split()]
+        return " ".join(terms)
+
+    def search(self, text, provider=None, before_id=None):
+        """Newest hits first, one page at a time; pass the last row's id to get the next page.
+
+        Returns the search id echoed by searchFinished. Starting a new search makes the
+        worker skip the older ones still waiting in the queue.
+        """
+        self._search_seq += 1
+        self._worker.submit(self._search, self._search_seq, text.strip(), provider, before_id)
+        return self._search_seq
+
+    def _search(self, search_id, text, provider, before_id):
+        if search_id != self._search_seq or self._db is None:
+            return
+        limit = self.PAGE_SIZE + 1  # One extra row tells whether there is another page
+        where, args = [], []
+        if provider:
+            where.append("m.provider = ?")
+            args.append(provider)
+        if before_id is not None:
+            where.append("m.id < ?")
+            args.append(before_id)
+        try:
+            if text and self._fts:
+                # Walking the index by rowid, newest first, lets LIMIT stop early
+                sql = ("SELECT m.id, m.kind, m.provider, m.created, "
+                       "snippet(messages_fts, 0, ?, ?, '…', 16) "
+                       "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                       "WHERE messages_fts MATCH ?" + "".join(f" AND {w}" for w in where) +
+                       " ORDER BY messages_fts.rowid DESC LIMIT ?")
+                rows = self._db.execute(sql, [*self.SNIPPET_MARKS, self.fts_query(text), *args, limit]).fetchall()
+            else:
+                if text:
+                    where.append("instr(lower(m.text), lower(?)) > 0")
+                    args.append(text)
+                sql = ("SELECT m.id, m.kind, m.provider, m.created, substr(m.text, 1, 200) FROM messages m" +
+                       (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY m.id DESC LIMIT ?")
+                rows = self._db.execute(sql, [*args, limit]).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching archive: {e}")
+            rows = []
+        results = [{'id': r[0], 'kind': r[1], 'provider': r[2], 'created': r[3],
+                    'snippet': " ".join(r[4].split())} for r in rows[:self.PAGE_SIZE]]
+        self.searchFinished.emit(search_id, results, len(rows) > self.PAGE_SIZE)
+
+    def load_thread(self, message_id):
+        """Prompt and every provider's response of the broadcast a message belongs to"""
+        self._worker.submit(self._load_thread, message_id)
+
+    def _load_thread(self, message_id):
+        if self._db is None:
+            return
+        try:
+            rows = self._db.execute(
+                "SELECT t.id, t.kind, t.provider, t.created, t.text FROM messages m "
+                "JOIN messages t ON t.session = m.session AND t.broadcast_id IS m.broadcast_id "
+                "WHERE m.id = ? ORDER BY t.id", (message_id,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error loading archived conversation: {e}")
+            rows = []
+        self.threadLoaded.emit(message_id, [{'id': r[0], 'kind': r[1], 'provider': r[2],
+                                             'created': r[3], 'text': r[4]} for r in rows])
+
+    def close(self, wait=False):
+        """Finish pending writes and close the database (waits when shutting down)"""
+        self._search_seq += 1
+        self._worker.submit(self._close)
+        self._worker.shutdown(wait=wait)
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+class ArchiveSearchDialog(QDialog):
+    """Search panel over the conversation archive: hits from every provider, loaded page by page"""
+    DEBOUNCE_MS = 150
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.main_window = window
+        self.archive = None
+        self._search_id = 0
+        self._more = False
+        self._loading = False
+        self.setWindowTitle("Search Conversations")
+        self.resize(900, 700)
+
+        layout = QVBoxLayout(self)
+        query_layout = QHBoxLayout()
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Search prompts and answers across all providers...")
+        self.provider_combo = QComboBox()
+        self.provider_combo.addItem("All providers", None)
+        for name in window.all_targets:
+            self.provider_combo.addItem(name, name)
+        query_layout.addWidget(self.query_edit, 1)
+        query_layout.addWidget(self.provider_combo)
+        layout.addLayout(query_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.detail = QTextEdit()
+        self.detail.setReadOnly(True)
+        splitter.addWidget(self.results)
+        splitter.addWidget(self.detail)
+        splitter.setSizes([400, 300])
+        layout.addWidget(splitter, 1)
+
+        bottom_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #888;")
+        copy_btn = QPushButton("Copy")
+        copy_btn.clicked.connect(lambda: QGuiApplication.clipboard().setText(self.detail.toPlainText()))
+        bottom_layout.addWidget(self.status_label, 1)
+        bottom_layout.addWidget(copy_btn)
+        layout.addLayout(bottom_layout)
+
+        # Typing restarts the timer, so only the settled query is searched
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self._debounce.start)
+        self.provider_combo.currentIndexChanged.connect(self.run_search)
+        self.results.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.results.currentItemChanged.connect(self._on_current_changed)
+
+    def set_archive(self, archive):
+        if self.archive is not None:
+            self.archive.searchFinished.disconnect(self._on_search_finished)
+            self.archive.threadLoaded.disconnect(self._on_thread_loaded)
+        self.archive = archive
+        archive.searchFinished.connect(self._on_search_finished)
+        archive.threadLoaded.connect(self._on_thread_loaded)
+        self.setWindowTitle(f"Search Conversations - Profile: {self.main_window.profile_name}")
+        self.run_search()
+
+    def run_search(self):
+        self._debounce.stop()
+        self.results.clear()
+        self.detail.clear()
+        self._more = False
+        self._loading = True
+        self._search_id = self.archive.search(self.query_edit.text(), self.provider_combo.currentData())
+
+    def _load_more(self):
+        last = self.results.item(self.results.count() - 1)
+        self._loading = True
+        self._search_id = self.archive.search(self.query_edit.text(), self.provider_combo.currentData(),
+                                              before_id=last.data(Qt.ItemDataRole.UserRole))
+
+    def _on_scrolled(self, value):
+        bar = self.results.verticalScrollBar()
+        if self._more and not self._loading and value >= bar.maximum() - 2:
+            self._load_more()
+
+    def _on_search_finished(self, search_id, rows, more):
+        if search_id != self._search_id:
+            return
+        self._loading = False
+        self._more = more
+        for row in rows:
+            who = row['provider'] if row['kind'] == 'response' else "You"
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row['created']))
+            item = QListWidgetItem(f"{when}  {who:<10}  {row['snippet']}")
+            item.setData(Qt.ItemDataRole.UserRole, row['id'])
+            self.results.addItem(item)
+        count = self.results.count()
+        self.status_label.setText(f"{count}{'+' if more else ''} hit{'s' if count != 1 else ''}")
+        # Keep filling until the list can scroll, otherwise there's nothing to trigger the next page
+        if more and self.results.verticalScrollBar().maximum() == 0:
+            self._load_more()
+
+    def _on_current_changed(self, current, previous):
+        if current is not None:
+            self.archive.load_thread(current.data(Qt.ItemDataRole.UserRole))
+
+    def _on_thread_loaded(self, message_id, rows):
+        current = self.results.currentItem()
+        if current is None or current.data(Qt.ItemDataRole.UserRole) != message_id:
+            return
+        parts = []
+        for row in rows:
+            who = row['provider'] if row['kind'] == 'response' else "You"
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row['created']))
+            parts.append(f"=== {who} · {when} ===\n{row['text']}")
+        self.detail.setPlainText("\n\n".join(parts))
+
+class ConversationExporter(QObject):
+    """Exports the conversation open in every pane to Markdown and JSONL files.
+
+    Panes stream their messages in chunks; a writer thread converts and appends each
+    chunk as it arrives, so a conversation is never held in memory as a whole.
+    """
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(str, dict)  # output directory, provider -> messages written
+    _flushed = pyqtSignal()
+    CHUNK_CHARS = 256 * 1024
+    # Give up on panes that stay silent this long (no runtime, page gone)
+    IDLE_TIMEOUT_MS = 30000
+
+    def __init__(self, window, out_dir, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.out_dir = out_dir
+        self.export_id = int(time.time() * 1000) % 2 ** 31
+        self.counts = {}
+        self.totals = {}
+        self.pending = set()
+        self.failed = set()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-writer")
+        self._next_index = {}  # Writer thread only: provider -> next message index
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.IDLE_TIMEOUT_MS)
+        self._timer.timeout.connect(self._on_timeout)
+        self._flushed.connect(self._on_flushed)
+
+    def start(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.window.runtimeEventReceived.connect(self._on_runtime_event)
+        for ai_info in self.window.browsers:
+            name = ai_info['name']
+            if name not in _PROVIDER_ADAPTERS:
+                continue
+            self.pending.add(name)
+            self.counts[name] = 0
+            call = build_export_call(name, self.export_id, self.CHUNK_CHARS)
+            self.window.lifecycle.wake(ai_info, lambda info=ai_info, call=call:
+                                       info['browser'].page().runJavaScript(call, _RUNTIME_WORLD_ID))
+        self._timer.start()
+        if not self.pending:
+            self._finish()
+
+    @staticmethod
+    def file_stem(provider):
+        return "".join(c if c.isalnum() else "_" for c in provider)
+
+    def _on_runtime_event(self, provider, event):
+        if (event.get('type') != 'export_chunk' or event.get('id') != self.export_id
+                or provider not in self.pending):
+            return
+        self._timer.start()
+        self._writer.submit(self._write_chunk, provider, event['messages'])
+        self.counts[provider] += len(event['messages'])
+        self.totals[provider] = event.get('total', 0)
+        if event.get('done'):
+            self.pending.discard(provider)
+        self.progress.emit("Exporting: " + " · ".join(
+            f"{name} {self.counts[name]}/{self.totals.get(name, '?')}" for name in self.counts))
+        if not self.pending:
+            self._finish()
+
+    def _write_chunk(self, provider, messages):
+        stem = os.path.join(self.out_dir, self.file_stem(provider))
+        index = self._next_index.get(provider, 0)
+        try:
+            with open(stem + ".md", 'a', encoding='utf-8') as markdown, \
+                    open(stem + ".jsonl", 'a', encoding='utf-8') as jsonl:
+                if index == 0:
+                    markdown.write(f"# {provider}\n\n")
+                for message in messages:
+                    speaker = "You" if message['role'] == 'user' else provider
+                    markdown.write(f"## {speaker}\n\n{message['text'].strip()}\n\n")
+                    jsonl.write(json.dumps({'provider': provider, 'index': index, 'role': message['role'],
+                                            'text': message['text']}, ensure_ascii=False) + "\n")
+                    index += 1
+        except OSError as e:
+            print(f"Error writing export for {provider}: {e}")
+        self._next_index[provider] = index
+
+    def _on_timeout(self):
+        self.failed |= self.pending
+        for name in self.pending:
+            debug_log(f"Export from {name} timed out after {self.counts.get(name, 0)} messages")
+        self.pending.clear()
+        self._finish()
+
+    def _finish(self):
+        self._timer.stop()
+        self.window.runtimeEventReceived.disconnect(self._on_runtime_event)
+        # Report once everything queued so far is on disk
+        self._writer.submit(self._flushed.emit)
+        self._writer.shutdown(wait=False)
+
+    def _on_flushed(self):
+        self.finished.emit(self.out_dir, dict(self.counts))
+
+# Response comparison: word and punctuation tokens, compared case-insensitively
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+# Gaps without unique common tokens are handed to difflib only up to this many cells
+_DIFF_FALLBACK_CELLS = 250000
+
+class TokenStream:
+    """Tokens of a growing response; appended text is tokenized from the last token on"""
+
+    def __init__(self):
+        self.text = ''
+        self.tokens = []  # Casefolded token strings
+        self.starts = []  # Offset of each token in text
+        self.version = 0
+
+    def update(self, text):
+        if text == self.text:
+            return False
+        if self.tokens and text.startswith(self.text):
+            # The last token may continue in the new text, so it is tokenized again
+            start = self.starts.pop()
+            self.tokens.pop()
+        else:
+            start = 0
+            self.tokens, self.starts = [], []
+        for match in _TOKEN_RE.finditer(text, start):
+            self.tokens.append(match.group().casefold())
+            self.starts.append(match.start())
+        self.text = text
+        self.version += 1
+        return True
+
+    def segment(self, first, last):
+        """Text of tokens [first, last) with the whitespace that follows them"""
+        start = self.starts[first] if first else 0
+        end = self.starts[last] if last < len(self.starts) else len(self.text)
+        return self.text[start:end]
+
+def diff_tokens(a, b):
+    """Matching blocks (i, j, size) of two token lists, ending with (len(a), len(b), 0).
+
+    Patience-style: tokens occurring exactly once on both sides anchor the alignment
+    (longest increasing subsequence), and the gaps between anchors are diffed the same
+    way. Long answers stay near O(n log n) where difflib alone goes quadratic.
+    """
+    blocks = []
+    _diff_range(a, 0, len(a), b, 0, len(b), blocks)
+    merged = []
+    for i, j, n in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + n)
+        elif n:
+            merged.append((i, j, n))
+    merged.append((len(a), len(b), 0))
+    return merged
+
+def _diff_range(a, alo, ahi, b, blo, bhi, blocks):
+    # Common prefix and suffix first, they are cheap and usually most of a stream
+    start_a, start_b = alo, blo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > start_a:
+        blocks.append((start_a, start_b, alo - start_a))
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - 1 - suffix] == b[bhi - 1 - suffix]:
+        suffix += 1
+    ahi -= suffix
+    bhi -= suffix
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                _diff_range(a, alo, i, b, blo, j, blocks)
+                blocks.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            _diff_range(a, alo, ahi, b, blo, bhi, blocks)
+        elif (ahi - alo) * (bhi - blo) <= _DIFF_FALLBACK_CELLS:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            blocks.extend((alo + i, blo + j, n) for i, j, n in matcher.get_matching_blocks()[:-1])
+        # Otherwise the gap is left as a replacement
+    if suffix:
+        blocks.append((ahi, bhi, suffix))
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi):
+    """Positions of tokens unique on both sides, longest run in the same order"""
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, None, 1, 0] if entry is None else [entry[0], None, entry[2] + 1, 0]
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] = j
+            entry[3] += 1
+    pairs = sorted((i, j) for i, j, in_a, in_b in counts.values() if in_a == 1 and in_b == 1)
+    # Longest increasing subsequence of the b positions (patience sorting)
+    tails, tail_pairs, previous = [], [], {}
+    for pair in pairs:
+        k = bisect.bisect_left(tails, pair[1])
+        previous[pair] = tail_pairs[k - 1] if k else None
+        if k == len(tails):
+            tails.append(pair[1])
+            tail_pairs.append(pair)
+        else:
+            tails[k] = pair[1]
+            tail_pairs[k] = pair
+    anchors = []
+    pair = tail_pairs[-1] if tail_pairs else None
+    while pair is not None:
+        anchors.append(pair)
+        pair = previous[pair]
+    anchors.reverse()
+    return anchors
+
+class ResponseComparer(QObject):
+    """Token-level comparison of the latest responses of all panes, off the GUI thread.
+
+    Updates are throttled and coalesced: at most one comparison runs at a time, on the
+    newest texts. Token lists and pairwise diffs are cached per provider and only
+    redone for the responses that changed.
+    """
+    comparisonReady = pyqtSignal(dict)
+    _computed = pyqtSignal(dict)
+    THROTTLE_MS = 250
+    # Consensus shading: all others agree / some do / none do
+    COLORS = {'agree': '#1f4d2b', 'partial': '#5c5220', 'unique': '#6b2d2d',
+              'insert': '#1f4d2b', 'delete': '#6b2d2d'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.texts = {}
+        self.base = None  # None: consensus view, else the provider the others are diffed against
+        self.enabled = False
+        self._running = False
+        self._dirty = False
+        # Only touched on the worker thread
+        self._streams = {}
+        self._pairs = {}
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compare")
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.THROTTLE_MS)
+        self._timer.timeout.connect(self._submit)
+        self._computed.connect(self._on_computed)
+
+    def reset(self):
+        self.texts = {}
+        self._schedule()
+
+    def update(self, provider, text):
+        self.texts[provider] = text
+        self._schedule()
+
+    def set_base(self, base):
+        self.base = base
+        self._schedule()
+
+    def set_enabled(self, enabled):
+        """Only compare while somebody is looking"""
+        self.enabled = enabled
+        self._schedule()
+
+    def _schedule(self):
+        if not self.enabled:
+            return
+        if self._running:
+            self._dirty = True
+        elif not self._timer.isActive():
+            self._timer.start()
+
+    def _submit(self):
+        self._running = True
+        self._dirty = False
+        self._worker.submit(self._compute, dict(self.texts), self.base)
+
+    def _on_computed(self, result):
+        self._running = False
+        self.comparisonReady.emit(result)
+        if self._dirty:
+            self._schedule()
+
+    def _compute(self, texts, base):
+        started = time.perf_counter()
+        try:
+            result = self._compare(texts, base)
+        except Exception as e:
+            print(f"Error comparing responses: {e}")
+            result = {'html': {}, 'similarity': {}, 'tokens': {}}
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        self._computed.emit(result)
+
+    def _blocks(self, first, second):
+        """Cached matching blocks of two providers' token lists"""
+        key = (first, second) if first < second else (second, first)
+        a, b = self._streams[key[0]], self._streams[key[1]]
+        cached = self._pairs.get(key)
+        versions = (a.version, b.version)
+        if cached is None or cached[0] != versions:
+            cached = (versions, diff_tokens(a.tokens, b.tokens))
+            self._pairs[key] = cached
+        if key == (first, second):
+            return cached[1]
+        return [(j, i, n) for i, j, n in cached[1]]
+
+    def _compare(self, texts, base):
+        for provider in list(self._streams):
+            if provider not in texts:
+                del self._streams[provider]
+        for provider, text in texts.items():
+            self._streams.setdefault(provider, TokenStream()).update(text)
+        providers = [p for p in texts if self._streams[p].tokens]
+        similarity = {}
+        for index, first in enumerate(providers):
+            for second in providers[index + 1:]:
+                matched = sum(n for i, j, n in self._blocks(first, second))
+                total = len(self._streams[first].tokens) + len(self._streams[second].tokens)
+                similarity[f"{first}|{second}"] = round(2 * matched / total, 3) if total else 1.0
+        rendered = {}
+        for provider in providers:
+            if base in providers and provider != base:
+                rendered[provider] = self._render_diff(provider, base)
+            elif base in providers:
+                rendered[provider] = self._render_runs(provider, [(0, len(self._streams[provider].tokens), None)])
+            else:
+                rendered[provider] = self._render_consensus(provider, [p for p in providers if p != provider])
+        return {'html': rendered, 'similarity': similarity,
+                'tokens': {p: len(self._streams[p].tokens) for p in providers}}
+
+    def _render_consensus(self, provider, others):
+        """Shade each token by how many of the other responses contain it in the same place"""
+        count = len(self._streams[provider].tokens)
+        agreement = [0] * count
+        for other in others:
+            for i, j, n in self._blocks(provider, other):
+                for k in range(i, i + n):
+                    agreement[k] += 1
+        runs, start = [], 0
+        for k in range(1, count + 1):
+            if k == count or agreement[k] != agreement[start]:
+                votes = agreement[start]
+                kind = ('agree' if votes == len(others) else 'unique' if votes == 0 else 'partial') if others else None
+                runs.append((start, k, kind))
+                start = k
+        return self._render_runs(provider, runs)
+
+    def _render_diff(self, provider, base):
+        """This response against the base one: its extra tokens and the base's missing ones"""
+        stream, base_stream = self._streams[provider], self._streams[base]
+        parts, i0, j0 = [], 0, 0
+        for i, j, n in self._blocks(provider, base):
+            if j > j0:
+                parts.append(self._span(base_stream.segment(j0, j), 'delete'))
+            if i > i0:
+                parts.append(self._span(stream.segment(i0, i), 'insert'))
+            if n:
+                parts.append(self._span(stream.segment(i, i + n), None))
+            i0, j0 = i + n, j + n
+        return "".join(parts)
+
+    def _render_runs(self, provider, runs):
+        stream = self._streams[provider]
+        return "".join(self._span(stream.segment(first, last), kind) for first, last, kind in runs)
+
+    def _span(self, text, kind):
+        text = html.escape(text)
+        if kind is None:
+            return text
+        style = f"background-color: {self.COLORS[kind]};"
+        if kind == 'delete':
+            style += " text-decoration: line-through;"
+        return f'<span style="{style}">{text}</span>'
+
+class ComparisonView(QDialog):
+    """Side-by-side view of the latest responses with consensus shading or token diffs"""
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.main_window = window
+        self.comparer = window.comparer
+        self.setWindowTitle("Compare Responses")
+        self.resize(1400, 800)
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        self.base_combo = QComboBox()
+        self.base_combo.addItem("Consensus", None)
+        for name in window.all_targets:
+            self.base_combo.addItem(f"Diff against {name}", name)
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #888;")
+        self.summary_label.setWordWrap(True)
+        top_layout.addWidget(self.base_combo)
+        top_layout.addWidget(self.summary_label, 1)
+        layout.addLayout(top_layout)
+        legend = QLabel(
+            f'<span style="background-color: {ResponseComparer.COLORS["agree"]};">&nbsp;all agree&nbsp;</span> '
+            f'<span style="background-color: {ResponseComparer.COLORS["partial"]};">&nbsp;some agree&nbsp;</span> '
+            f'<span style="background-color: {ResponseComparer.COLORS["unique"]};">&nbsp;only this one&nbsp;</span> '
+            '— in diff mode green is extra, struck through is missing compared to the base')
+        layout.addWidget(legend)
+
+        self.splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(self.splitter, 1)
+        self.panels = {}
+        self._shown = {}  # Provider -> HTML currently displayed
+
+        self.base_combo.currentIndexChanged.connect(lambda: self.comparer.set_base(self.base_combo.currentData()))
+        self.comparer.comparisonReady.connect(self.show_comparison)
+
+    def panel(self, provider):
+        if provider not in self.panels:
+            container = QWidget()
+            panel_layout = QVBoxLayout(container)
+            panel_layout.setContentsMargins(2, 2, 2, 2)
+            title = QLabel(provider)
+            title.setStyleSheet("font-weight: bold;")
+            view = QTextEdit()
+            view.setReadOnly(True)
+            panel_layout.addWidget(title)
+            panel_layout.addWidget(view, 1)
+            self.splitter.addWidget(container)
+            self.panels[provider] = (container, title, view)
+        return self.panels[provider]
+
+    def show_comparison(self, result):
+        for provider, (container, title, view) in self.panels.items():
+            container.setVisible(provider in result['html'])
+        for provider, body in result['html'].items():
+            container, title, view = self.panel(provider)
+            title.setText(f"{provider} · {result['tokens'][provider]} tokens")
+            if self._shown.get(provider) == body:
+                continue  # setHtml is the costly part left on the GUI thread
+            self._shown[provider] = body
+            # Keep the reader's place while a stream grows
+            scroll = view.verticalScrollBar().value()
+            view.setHtml(f'<div style="white-space: pre-wrap;">{body}</div>')
+            view.verticalScrollBar().setValue(scroll)
+        pairs = sorted(result['similarity'].items(), key=lambda item: -item[1])
+        self.summary_label.setText(
+            "Similarity: " + ", ".join(f"{pair.replace('|', ' ~ ')} {value:.0%}" for pair, value in pairs) +
+            f"  ({result.get('elapsed_ms', 0):.0f} ms)" if pairs else "Waiting for responses...")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.comparer.set_enabled(True)
+
+    def hideEvent(self, event):
+        self.comparer.set_enabled(False)
+        super().hideEvent(event)
+
+def process_rss_bytes(pid):
+    """Resident memory of a process in bytes, None if it can't be read here"""
+    if not pid:
+        return None
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class PromptScheduler(QObject):
+    """Queues prompts per pane and hands a pane its next prompt only once it is idle.
+
+    A pane is idle when the response tracker has no answer in flight for it and the
+    provider runtime's completion detector (active capture, busy selectors) agrees.
+    Optional limits: `max_active` panes generating at once and per-provider
+    `rate_limits` such as {"Claude": {"per_minute": 5}}.
+    """
+    queueChanged = pyqtSignal(dict)  # provider -> prompts still queued
+    # How soon to ask a pane again that still reported itself busy
+    BUSY_RECHECK_MS = 1000
+    RATE_WINDOW_S = 60
+
+    def __init__(self, window, max_active=0, rate_limits=None):
+        super().__init__(window)
+        self.window = window
+        self.max_active = max_active
+        self.rate_limits = rate_limits or {}
+        self.queues = {}  # Provider -> deque of (broadcast id, payload json)
+        self.dispatching = set()  # Providers being woken/probed for their next prompt
+        self.loading = set()  # Providers whose page is (re)loading and can't take a prompt yet
+        self.sent_at = {}  # Provider -> send times within the rate window
+        self._retry = QTimer(self)
+        self._retry.setSingleShot(True)
+        self._retry.timeout.connect(self.pump)
+        window.response_tracker.responseFinished.connect(lambda *_: self.pump())
+        window.runtimeEventReceived.connect(self._on_runtime_event)
+
+    def enqueue(self, provider, broadcast_id, payload_json):
+        self.queues.setdefault(provider, deque()).append((broadcast_id, payload_json))
+
+    def depth(self):
+        return {provider: len(queue) for provider, queue in self.queues.items() if queue}
+
+    def clear(self):
+        self.queues.clear()
+        self.queueChanged.emit({})
+
+    def reset(self):
+        """Forget queues and pane states, e.g. when the panes are swapped for another profile's"""
+        self.dispatching.clear()
+        self.loading.clear()
+        self.clear()
+
+    def hold_reason(self, provider):
+        """Why a provider's queued prompts are waiting, for the queue display"""
+        if provider in self.loading:
+            return "loading"
+        if self.window.response_tracker.is_busy(provider):
+            return "answering"
+        if self._rate_wait(provider) > 0:
+            return "rate limited"
+        return "waiting"
+
+    def send_now(self):
+        """Hand every held pane its next prompt right away, giving up the answer it waits for"""
+        panes = {info['name']: info for info in self.window.browsers}
+        for provider, queue in self.queues.items():
+            browser_info = panes.get(provider)
+            if not queue or browser_info is None or provider in self.dispatching or provider in self.loading:
+                continue
+            # Held in dispatching so the pump triggered by abandoning doesn't send as well
+            self.dispatching.add(provider)
+            self.window.response_tracker.abandon(provider, 'skipped')
+            broadcast_id, payload_json = queue.popleft()
+            self.sent_at.setdefault(provider, deque()).append(time.monotonic())
+
+            def dispatch(info=browser_info, broadcast_id=broadcast_id, payload_json=payload_json):
+                self.window.dispatch_prompt(info, payload_json, broadcast_id)
+                self.dispatching.discard(info['name'])
+            self.window.lifecycle.wake(browser_info, dispatch)
+        self.queueChanged.emit(self.depth())
+
+    def pane_loading(self, provider):
+        """Hold prompts for a pane until its page (and provider runtime) is there"""
+        self.loading.add(provider)
+
+    def pane_loaded(self, provider):
+        self.loading.discard(provider)
+        self.pump()
+
+    def _busy(self, provider):
+        return (provider in self.dispatching or provider in self.loading
+                or self.window.response_tracker.is_busy(provider))
+
+    def _rate_wait(self, provider):
+        """Seconds until the provider's rate limit allows another send"""
+        limit = self.rate_limits.get(provider, {}).get('per_minute', 0)
+        if not limit:
+            return 0
+        times = self.sent_at.setdefault(provider, deque())
+        now = time.monotonic()
+        while times and now - times[0] >= self.RATE_WINDOW_S:
+            times.popleft()
+        return self.RATE_WINDOW_S - (now - times[0]) if len(times) >= limit else 0
+
+    def _schedule_retry(self, delay_ms):
+        if not self._retry.isActive() or self._retry.remainingTime() > delay_ms:
+            self._retry.start(int(delay_ms))
+
+    def pump(self):
+        """Dispatch the next queued prompt to every idle pane the limits allow"""
+        panes = {info['name']: info for info in self.window.browsers}
+        active = sum(1 for provider in panes if self._busy(provider))
+        for provider, queue in self.queues.items():
+            if not queue or self._busy(provider):
+                continue
+            browser_info = panes.get(provider)
+            if browser_info is None:
+                queue.clear()  # Pane was closed
+                continue
+            if self.max_active and active >= self.max_active:
+                break
+            wait_s = self._rate_wait(provider)
+            if wait_s > 0:
+                self._schedule_retry(wait_s * 1000)
+                continue
+            active += 1
+            self.dispatching.add(provider)
+            # Frozen pages don't run scripts, wake the pane before asking it anything
+            self.window.lifecycle.wake(browser_info, lambda info=browser_info: self._probe(info))
+        self.queueChanged.emit(self.depth())
+
+    def _probe(self, browser_info):
+        provider = browser_info['name']
+
+        def on_busy(busy):
+            queue = self.queues.get(provider)
+            if provider in self.loading:
+                # Navigated away meanwhile, pane_loaded() pumps again once it is back
+                self.dispatching.discard(provider)
+                return
+            if busy or not queue:
+                self.dispatching.discard(provider)
+                if busy:
+                    self._schedule_retry(self.BUSY_RECHECK_MS)
+                return
+            broadcast_id, payload_json = queue.popleft()
+            self.sent_at.setdefault(provider, deque()).append(time.monotonic())
+            self.window.dispatch_prompt(browser_info, payload_json, broadcast_id)
+            self.dispatching.discard(provider)
+            self.queueChanged.emit(self.depth())
+        browser_info['browser'].page().runJavaScript(build_busy_call(provider), _RUNTIME_WORLD_ID, on_busy)
+
+    def _on_runtime_event(self, provider, event):
+        # A failed send frees the pane without a response
+        if event.get('type') == 'send_outcome' and event['outcome'] not in ('clicked', 'enter_fallback'):
+            self.pump()
+
+def process_cpu_seconds(pid):
+    """Total user + system CPU time a process has used, None if it can't be read here"""
+    if not pid:
+        return None
+    if psutil is not None:
+        try:
+            times = psutil.Process(pid).cpu_times()
+            return times.user + times.system
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces, fields are counted after its closing paren
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class RendererResourceMonitor(QObject):
+    """Samples each pane's renderer process and acts on memory/CPU budgets"""
+    sampled = pyqtSignal(dict)  # provider -> {'pid', 'rss_mb', 'cpu_percent', 'over_budget'}
+    SAMPLE_INTERVAL_MS = 5000
+
+    def __init__(self, window, rss_mb=0, cpu_percent=0, sustain_samples=3, action='warn'):
+        super().__init__(window)
+        self.window = window
+        self.rss_budget_mb = rss_mb
+        self.cpu_budget_percent = cpu_percent
+        self.sustain_samples = max(1, sustain_samples)
+        self.action = action if action in ('warn', 'freeze', 'reload') else 'warn'
+        self.samples = {}
+        self._cpu_marks = {}  # pid -> (cpu seconds, monotonic time) of the previous sample
+        self._strikes = {}  # provider -> consecutive samples over budget
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.sample)
+
+    def start(self):
+        self._timer.start(self.SAMPLE_INTERVAL_MS)
+
+    def _cpu_percent(self, pid, now):
+        cpu = process_cpu_seconds(pid)
+        previous = self._cpu_marks.get(pid)
+        self._cpu_marks[pid] = (cpu, now)
+        if cpu is None or previous is None or previous[0] is None or now <= previous[1]:
+            return None
+        return round((cpu - previous[0]) / (now - previous[1]) * 100, 1)
+
+    def sample(self):
+        now = time.monotonic()
+        samples = {}
+        per_pid = {}
+        for browser_info in self.window.browsers:
+            name = browser_info['name']
+            try:
+                pid = browser_info['browser'].page().renderProcessPid()
+            except RuntimeError:
+                continue
+            if not pid:
+                continue
+            # Panes may share a renderer, read each process once per sample
+            if pid not in per_pid:
+                rss = process_rss_bytes(pid)
+                per_pid[pid] = (round(rss / (1024 * 1024)) if rss else None, self._cpu_percent(pid, now))
+            rss_mb, cpu_percent = per_pid[pid]
+            over = ((self.rss_budget_mb and rss_mb and rss_mb > self.rss_budget_mb) or
+                    (self.cpu_budget_percent and cpu_percent and cpu_percent > self.cpu_budget_percent))
+            samples[name] = {'pid': pid, 'rss_mb': rss_mb, 'cpu_percent': cpu_percent, 'over_budget': bool(over)}
+            self._strikes[name] = self._strikes.get(name, 0) + 1 if over else 0
+            if self._strikes[name] >= self.sustain_samples:
+                self._strikes[name] = 0
+                self._enforce(browser_info, samples[name])
+        # Forget processes that went away
+        self._cpu_marks = {pid: mark for pid, mark in self._cpu_marks.items() if pid in per_pid}
+        self.samples = samples
+        self.sampled.emit(samples)
+
+    def _enforce(self, browser_info, sample):
+        name = browser_info['name']
+        message = f"{name} over budget: {sample['rss_mb']} MB, {sample['cpu_percent']}% CPU"
+        debug_log(f"{message} (action: {self.action})")
+        if self.action == 'warn' or self.window.response_tracker.is_busy(name):
+            self.window.statusBar().showMessage(message, 15000)
+        elif self.action == 'freeze':
+            self.window.lifecycle.park(browser_info, QWebEnginePage.LifecycleState.Frozen)
+            self.window.statusBar().showMessage(f"{message} - paused", 15000)
+        elif self.action == 'reload':
+            self.window.lifecycle.wake(browser_info)
+            browser_info['browser'].reload()
+            self.window.statusBar().showMessage(f"{message} - reloaded", 15000)
+
+    def summary(self):
+        """Compact per-pane 'MB / CPU%' line for the control panel"""
+        parts = []
+        for name, sample in self.samples.items():
+            rss = f"{sample['rss_mb']} MB" if sample['rss_mb'] is not None else "? MB"
+            cpu = f"{sample['cpu_percent']:.0f}%" if sample['cpu_percent'] is not None else "-"
+            parts.append(f"{name} {rss} {cpu}" + (" ⚠" if sample['over_budget'] else ""))
+        return " · ".join(parts)
+
+class PaneSnapshot(QLabel):
+    """Static screenshot shown in place of a frozen pane, click to resume it"""
+    clicked = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScaledContents(True)
+        self.setMinimumSize(1, 1)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setToolTip("Paused to save memory - click to resume")
+        self.hide()
+
+    def mousePressEvent(self, event):
+        self.clicked.emit()
+        super().mousePressEvent(event)
+
+class PaneLifecycleManager(QObject):
+    """Freezes idle panes and discards the least recently used ones over a memory budget"""
+    # How often idle time and memory are checked
+    CHECK_INTERVAL_MS = 30000
+
+    def __init__(self, window, freeze_after_min=15, memory_budget_mb=0):
+        super().__init__(window)
+        self.window = window
+        self.freeze_after_s = freeze_after_min * 60
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.check)
+        QApplication.instance().focusChanged.connect(self._on_focus_changed)
+
+    def start(self):
+        if self.freeze_after_s > 0 or self.memory_budget > 0:
+            self._timer.start(self.CHECK_INTERVAL_MS)
+            QApplication.instance().installEventFilter(self)
+
+    def touch(self, browser_info):
+        browser_info['last_active'] = time.monotonic()
+
+    def eventFilter(self, obj, event):
+        # Reading a pane (scrolling it, pointing into it) counts as activity, not just focusing it
+        if event.type() in (QEvent.Type.Wheel, QEvent.Type.Enter) and isinstance(obj, QWidget):
+            for browser_info in self.window.browsers:
+                try:
+                    if browser_info['container'].isAncestorOf(obj):
+                        self.touch(browser_info)
+                        break
+                except RuntimeError:
+                    continue
+        return False
+
+    def _can_park(self, browser_info):
+        """Panes that are generating, focused or being inspected must stay active"""
+        browser = browser_info['browser']
+        if self.window.response_tracker.is_busy(browser_info['name']):
+            return False
+        if browser.dev_tools_view is not None and browser.dev_tools_view.isVisible():
+            return False
+        focus = QApplication.focusWidget()
+        return not (focus and browser_info['container'].isAncestorOf(focus))
+
+    def check(self):
+        now = time.monotonic()
+        live = []
+        for browser_info in self.window.browsers:
+            try:
+                state = browser_info['browser'].page().lifecycleState()
+            except RuntimeError:
+                continue
+            browser_info.setdefault('last_active', now)
+            if state == QWebEnginePage.LifecycleState.Discarded:
+                continue
+            live.append(browser_info)
+            if (state == QWebEnginePage.LifecycleState.Active and self.freeze_after_s > 0
+                    and now - browser_info['last_active'] > self.freeze_after_s and self._can_park(browser_info)):
+                self.park(browser_info, QWebEnginePage.LifecycleState.Frozen)
+
+        if self.memory_budget > 0:
+            self._enforce_memory_budget(live)
+
+    def _enforce_memory_budget(self, live):
+        # Renderer processes can be shared between panes, count each pid once; its memory
+        # is only freed once every pane using it has been discarded
+        usage = {}
+        panes_on = defaultdict(int)
+        for browser_info in live:
+            pid = browser_info['browser'].page().renderProcessPid()
+            panes_on[pid] += 1
+            if pid and pid not in usage:
+                usage[pid] = process_rss_bytes(pid) or 0
+        total = sum(usage.values())
+        for browser_info in sorted(live, key=lambda info: info['last_active']):
+            if total <= self.memory_budget:
+                break
+            if not self._can_park(browser_info):
+                continue
+            pid = browser_info['browser'].page().renderProcessPid()
+            panes_on[pid] -= 1
+            if panes_on[pid] == 0:
+                total -= usage.pop(pid, 0)
+            debug_log(f"Discarding pane {browser_info['name']} - renderer memory over budget")
+            self.park(browser_info, QWebEnginePage.LifecycleState.Discarded)
+
+    def park(self, browser_info, state):
+        """Swap a pane for its snapshot, then freeze or discard the hidden page"""
+        browser = browser_info['browser']
+        snapshot = browser_info['snapshot']
+        if not browser.isHidden():
+            # Only hidden pages may leave the Active state
+            if browser.isVisible():
+                snapshot.setPixmap(browser.grab())
+            browser.hide()
+            snapshot.show()
+
+        def apply_state():
+            try:
+                page = browser.page()
+                if page.lifecycleState() != state and browser.isHidden():
+                    page.setLifecycleState(state)
+            except RuntimeError:
+                pass
+        QTimer.singleShot(0, apply_state)
+
+    def wake(self, browser_info, then=None):
+        """Make a pane active and visible again, calling 'then' once it can take a prompt"""
+        self.touch(browser_info)
+        browser = browser_info['browser']
+        snapshot = browser_info['snapshot']
+        if browser.isHidden():
+            snapshot.hide()
+            snapshot.clear()
+            browser.show()
+        page = browser.page()
+        state = page.lifecycleState()
+        if state == QWebEnginePage.LifecycleState.Active:
+            if then:
+                then()
+            return
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        if then is None:
+            return
+        if state == QWebEnginePage.LifecycleState.Discarded:
+            # A discarded page reloads on activation, wait until it is there again
+            def on_loaded(ok):
+                page.loadFinished.disconnect(on_loaded)
+                then()
+            page.loadFinished.connect(on_loaded)
+        else:
+            then()
+
+    def _remember_focus(self, name):
+        """Count switches into a pane; the focused and most used panes load first next time"""
+        config = self.window.config
+        if config.get('last_focused_provider') == name:
+            return
+        usage = dict(config.get('pane_usage', {}))
+        usage[name] = usage.get(name, 0) + 1
+        config.set('pane_usage', usage)
+        config.set('last_focused_provider', name)
+
+    def _on_focus_changed(self, old, new):
+        if new is None:
+            return
+        for browser_info in self.window.browsers:
+            try:
+                if browser_info['container'].isAncestorOf(new):
+                    self.wake(browser_info)
+                    self._remember_focus(browser_info['name'])
+                    return
+            except RuntimeError:
+                continue
+
+class PaneLoadScheduler(QObject):
+    """Loads panes in priority order with at most `max_concurrent` loading at once.
+
+    A load slot is released at the pane's first contentful paint (reported by the
+    provider runtime), its loadFinished, or after `timeout_ms`, whichever comes first,
+    so fast machines aren't held back by a fixed delay and slow ones aren't swamped.
+    """
+
+    def __init__(self, window, max_concurrent=2, timeout_ms=8000):
+        super().__init__(window)
+        self.window = window
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout_ms = timeout_ms
+        self.queue = []  # (rank, seq, browser info, url)
+        self.loading = {}  # Provider name -> (timeout timer, page, loadFinished connection)
+        self._seq = 0
+        window.runtimeEventReceived.connect(self._on_runtime_event)
+
+    def request(self, browser_info, url, rank=0):
+        self._seq += 1
+        self.queue.append((rank, self._seq, browser_info, url))
+
+    def cancel(self, browser_info):
+        """Drop a pane's load that hasn't started yet, e.g. because something else loads it now"""
+        self.queue = [entry for entry in self.queue if entry[2] is not browser_info]
+
+    def clear(self):
+        self.queue.clear()
+        for name in list(self.loading):
+            self._disconnect(self.loading.pop(name))
+
+    def _next(self):
+        """Pop the best queued load: panes visible in the window first, then by rank"""
+        def key(entry):
+            try:
+                hidden = not entry[2]['container'].isVisibleTo(self.window)
+            except RuntimeError:
+                hidden = True
+            return (hidden,) + entry[:2]
+        entry = min(self.queue, key=key)
+        self.queue.remove(entry)
+        return entry
+
+    def pump(self):
+        while self.queue and len(self.loading) < self.max_concurrent:
+            _rank, _seq, browser_info, url = self._next()
+            name = browser_info['name']
+            try:
+                browser = browser_info['browser']
+                page = browser.page()
+                # Connected per load and dropped on release, so reloads don't pile up slots
+                connection = page.loadFinished.connect(lambda ok, n=name: self._release(n))
+            except RuntimeError:
+                continue  # Pane closed while queued
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda n=name: self._release(n, timed_out=True))
+            timer.start(self.timeout_ms)
+            self.loading[name] = (timer, page, connection)
+            browser.load(QUrl(url))
+
+    @staticmethod
+    def _disconnect(entry):
+        timer, page, connection = entry
+        timer.stop()
+        timer.deleteLater()
+        try:
+            page.loadFinished.disconnect(connection)
+        except (RuntimeError, TypeError):
+            pass  # Page already deleted
+
+    def _release(self, name, timed_out=False):
+        entry = self.loading.pop(name, None)
+        if entry is None:
+            return
+        self._disconnect(entry)
+        if timed_out:
+            debug_log(f"Pane {name} still loading after {self.timeout_ms} ms, starting the next one")
+        self.pump()
+
+    def _on_runtime_event(self, name, event):
+        if event.get('type') == 'first_paint':
+            self._release(name)
+
+class ProfilePool(QObject):
+    """Keeps the most recently used profiles alive but hidden and frozen for fast switching.
+
+    An entry holds everything a profile's panes need (profile, interceptor, pane infos,
+    lite providers). Entries beyond `size` or over the renderer memory budget are torn
+    down oldest first. Switch latencies, warm and cold, are appended to a JSONL file.
+    """
+    # Give up waiting for a cold switch's panes after this long
+    COLD_SWITCH_TIMEOUT_MS = 60000
+
+    def __init__(self, window, size=2, memory_budget_mb=0, metrics_path=None):
+        super().__init__(window)
+        self.window = window
+        self.size = size
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.metrics_path = metrics_path
+        self.entries = OrderedDict()  # Profile name -> entry, least recently used first
+        self.history = {'warm': deque(maxlen=20), 'cold': deque(maxlen=20)}
+
+    def __contains__(self, profile_name):
+        return profile_name in self.entries
+
+    def stash(self, profile_name, entry):
+        """Detach a profile's panes from the window and freeze them, evicting over the limits"""
+        if self.size <= 0:
+            self.dispose(entry)
+            return
+        for browser_info in entry['browsers']:
+            try:
+                browser_info['container'].setParent(None)
+                self.window.lifecycle.park(browser_info, QWebEnginePage.LifecycleState.Frozen)
+            except RuntimeError:
+                continue
+        self.entries[profile_name] = entry
+        self.entries.move_to_end(profile_name)
+        while len(self.entries) > self.size:
+            self.evict(next(iter(self.entries)))
+        if self.memory_budget > 0:
+            self._enforce_memory_budget()
+
+    def take(self, profile_name):
+        """Remove and return a pooled profile's entry, None if it isn't pooled"""
+        return self.entries.pop(profile_name, None)
+
+    def evict(self, profile_name):
+        entry = self.entries.pop(profile_name, None)
+        if entry is not None:
+            debug_log(f"Evicting pooled profile {profile_name}")
+            self.dispose(entry)
+
+    @staticmethod
+    def dispose(entry):
+        # Pages first, the profile must outlive them
+        for browser_info in entry['browsers']:
+            try:
+                browser_info['container'].setParent(None)
+                browser_info['container'].deleteLater()
+                browser_info['browser'].deleteLater()
+            except RuntimeError:
+                pass
+        try:
+            if entry['profile']:
+                entry['profile'].deleteLater()
+        except RuntimeError:
+            pass
+
+    def _entry_rss(self, entry):
+        pids = set()
+        for browser_info in entry['browsers']:
+            try:
+                pid = browser_info['browser'].page().renderProcessPid()
+            except RuntimeError:
+                continue
+            if pid:
+                pids.add(pid)
+        return sum(process_rss_bytes(pid) or 0 for pid in pids)
+
+    def _enforce_memory_budget(self):
+        usage = {name: self._entry_rss(entry) for name, entry in self.entries.items()}
+        total = sum(usage.values())
+        for name in list(self.entries):
+            if total <= self.memory_budget:
+                break
+            total -= usage[name]
+            debug_log(f"Pooled profiles over memory budget ({total / (1024 * 1024):.0f} MB left)")
+            self.evict(name)
+
+    def measure_switch(self, profile_name, started, warm):
+        """Record the switch once the panes are usable: next paint when warm, all loads when cold"""
+        if warm:
+            QTimer.singleShot(0, lambda: self._record(profile_name, started, warm))
+            return
+        pending = {}  # Page -> its loadFinished connection
+        done = []
+
+        def disconnect(page):
+            try:
+                page.loadFinished.disconnect(pending.pop(page))
+            except (RuntimeError, TypeError):
+                pass  # Page already deleted
+
+        def finish():
+            for page in list(pending):
+                disconnect(page)
+            if not done:
+                done.append(True)
+                self._record(profile_name, started, warm)
+
+        def on_loaded(page):
+            if page not in pending:
+                return
+            disconnect(page)
+            if not pending:
+                finish()
+
+        for browser_info in self.window.browsers:
+            page = browser_info['browser'].page()
+            pending[page] = page.loadFinished.connect(lambda ok, page=page: on_loaded(page))
+        if not pending:
+            finish()
+        QTimer.singleShot(self.COLD_SWITCH_TIMEOUT_MS, finish)
+
+    def _record(self, profile_name, started, warm):
+        kind = 'warm' if warm else 'cold'
+        metrics = {
+            'profile': profile_name,
+            'kind': kind,
+            'switch_ms': round((time.perf_counter() - started) * 1000, 1),
+            'panes': len(self.window.browsers),
+            'pooled': list(self.entries),
+            'timestamp': time.time(),
+        }
+        self.history[kind].append(metrics['switch_ms'])
+        if self.metrics_path:
+            try:
+                with open(self.metrics_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(metrics) + "\n")
+            except OSError as e:
+                print(f"Error saving profile switch metrics: {e}")
+        debug_log(f"Profile switch to {profile_name}: {kind} {metrics['switch_ms']} ms")
+        self.window.statusBar().showMessage(f"Switched to '{profile_name}' in {metrics['switch_ms']:.0f} ms "
+                                            f"({kind}) · {self.summary()}", 8000)
+
+    def summary(self):
+        parts = []
+        for kind in ('warm', 'cold'):
+            values = self.history[kind]
+            if values:
+                parts.append(f"avg {kind} {sum(values) / len(values):.0f} ms")
+        return ", ".join(parts)
+
 class CustomWebEnginePage(QWebEnginePage):
+    # Emitted with the decoded event dict whenever the provider runtime reports something
+    runtimeEvent = pyqtSignal(dict)
     # Track if user agent was set on this profile to avoid redundant calls
     _ua_set_profiles = set()
     
@@ -79,10 +2574,15 @@ class CustomWebEnginePage(QWebEnginePage):
             profile.setHttpUserAgent(_USER_AGENT)
             CustomWebEnginePage._ua_set_profiles.add(profile_id)
         self._popup_windows = []
+        # Bridge for the provider runtime, exposed only to the runtime's isolated world
+        self._bridge = PaneBridge(self)
+        self._bridge.eventPosted.connect(self.runtimeEvent)
+        self._channel = QWebChannel(self)
+        self._channel.registerObject("mvcBridge", self._bridge)
+        self.setWebChannel(self._channel, _RUNTIME_WORLD_ID)
     
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceID):
-        # Silence console messages entirely for performance
-        # Prevents expensive string passing between processes
+        # Silence console messages for performance; runtime events only come over the bridge
         pass
     
     def acceptNavigationRequest(self, url, nav_type, is_main_frame):
@@ -179,41 +2679,723 @@ class CustomWebEngineView(QWebEngineView):
         menu.addAction(inspect_action)
         menu.exec(event.globalPos())
 
-    def _open_google_search(self, text):
-        query = quote_plus(text)
-        url = f"https://www.google.com/search?q={query}"
-        webbrowser.open(url)
+    def _open_google_search(self, text):
+        query = quote_plus(text)
+        url = f"https://www.google.com/search?q={query}"
+        webbrowser.open(url)
+
+    def open_dev_tools(self):
+        if self.dev_tools_view is None:
+            self.dev_tools_view = QWebEngineView()
+            self.dev_tools_view.setWindowTitle("Developer Tools")
+            self.dev_tools_view.setGeometry(100, 100, 800, 600)
+        self.page().setDevToolsPage(self.dev_tools_view.page())
+        self.dev_tools_view.show()
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance of a and b, None once it exceeds limit"""
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+class PromptIndex:
+    """Prompts by recency with a sorted prefix index and a trigram index for fuzzy search.
+
+    Posting lists are arrays of ids in insertion order, so the newest matches come from
+    their tail; ids of removed prompts are skipped on lookup and dropped on rebuild.
+    """
+    # Trigrams are taken from the start of each prompt only, long pastes would bloat the index
+    INDEX_CHARS = 2000
+    # Fuzzy candidates must share this share of the query's trigrams before the typo check
+    FUZZY_MIN_OVERLAP = 0.5
+    # Candidates checked for typos per search, best trigram overlap first
+    FUZZY_CHECKS = 500
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self):
+        self.texts = {}  # id -> text, oldest first
+        self.ids = {}  # text -> id
+        self.prefix = []  # sorted (casefolded text, id)
+        self.trigrams = {}  # trigram -> array of ids
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.texts)
+
+    @classmethod
+    def build(cls, texts):
+        """Index texts given oldest first; a repeated prompt keeps its latest position"""
+        index = cls()
+        for text in texts:
+            old = index.ids.pop(text, None)
+            if old is not None:
+                del index.texts[old]
+            index.texts[index._next_id] = text
+            index.ids[text] = index._next_id
+            index._next_id += 1
+        # Plain lists while building, packed into arrays once complete
+        postings = defaultdict(list)
+        for prompt_id, text in index.texts.items():
+            folded = text.casefold()
+            index.prefix.append((folded, prompt_id))
+            for gram in cls._grams(folded):
+                postings[gram].append(prompt_id)
+        index.trigrams = {gram: array('I', ids) for gram, ids in postings.items()}
+        index.prefix.sort()
+        return index
+
+    @staticmethod
+    def _grams(folded):
+        folded = folded[:PromptIndex.INDEX_CHARS]
+        return set(map(''.join, zip(folded, folded[1:], folded[2:])))
+
+    def _index_trigrams(self, folded, prompt_id):
+        for gram in self._grams(folded):
+            postings = self.trigrams.get(gram)
+            if postings is None:
+                postings = self.trigrams[gram] = array('I')
+            postings.append(prompt_id)
+
+    def add(self, text):
+        """Add a prompt as the newest one, moving it there if it's already known"""
+        old = self.ids.get(text)
+        if old is not None:
+            self.remove(old)
+        prompt_id = self._next_id
+        self._next_id += 1
+        self.texts[prompt_id] = text
+        self.ids[text] = prompt_id
+        folded = text.casefold()
+        bisect.insort(self.prefix, (folded, prompt_id))
+        self._index_trigrams(folded, prompt_id)
+
+    def remove(self, prompt_id):
+        text = self.texts.pop(prompt_id)
+        del self.ids[text]
+        i = bisect.bisect_left(self.prefix, (text.casefold(), prompt_id))
+        del self.prefix[i]
+
+    def oldest(self):
+        return next(iter(self.texts))
+
+    def newest(self):
+        return next(reversed(self.texts.values()), None)
+
+    def with_prefix(self, prefix):
+        """Texts starting with prefix (case-insensitive), newest first"""
+        if not prefix:
+            return list(reversed(self.texts.values()))
+        folded = prefix.casefold()
+        ids = []
+        for i in range(bisect.bisect_left(self.prefix, (folded, -1)), len(self.prefix)):
+            entry, prompt_id = self.prefix[i]
+            if not entry.startswith(folded):
+                break
+            ids.append(prompt_id)
+        return [self.texts[prompt_id] for prompt_id in sorted(ids, reverse=True)]
+
+    def search(self, query, limit=50):
+        """Prompts matching every word of the query in any order, best first.
+
+        Prompts containing all words come first, newest first; then prompts where some
+        words only match with a typo or two, closest first.
+        """
+        words = query.casefold().split()
+        if not words:
+            return list(reversed(self.texts.values()))[:limit]
+        results = self._search_exact(words, limit)
+        if len(results) < limit:
+            exact = {self.ids[text] for text in results}
+            results += self._search_fuzzy(words, limit - len(results), exact)
+        return results
+
+    def _search_exact(self, words, limit):
+        # Walk the shortest posting list among the query's trigrams, newest first
+        candidates = None
+        for word in words:
+            for gram in self._grams(word):
+                postings = self.trigrams.get(gram)
+                if postings is None:
+                    return []
+                if candidates is None or len(postings) < len(candidates):
+                    candidates = postings
+        if candidates is None:
+            candidates = list(self.texts)  # Only one- and two-letter words: scan
+        results = []
+        for prompt_id in reversed(candidates):
+            text = self.texts.get(prompt_id)
+            if text is None:
+                continue
+            folded = text.casefold()
+            if all(word in folded for word in words):
+                results.append(text)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _search_fuzzy(self, words, limit, exclude):
+        """Prompts sharing most of the query's trigrams whose words are within a few edits"""
+        grams = set()
+        for word in words:
+            grams |= self._grams(word)
+        if not grams:
+            return []  # Short words only match exactly
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self.trigrams.get(gram, ()))
+        needed = len(grams) * self.FUZZY_MIN_OVERLAP
+        # Most shared trigrams first, newer first among equals
+        ranked = sorted(((count, prompt_id) for prompt_id, count in overlap.items()
+                         if count >= needed and prompt_id not in exclude and prompt_id in self.texts),
+                        reverse=True)
+        scored = []
+        for count, prompt_id in ranked[:self.FUZZY_CHECKS]:
+            folded = self.texts[prompt_id].casefold()
+            tokens = set(self._WORD_RE.findall(folded[:self.INDEX_CHARS]))
+            edits = 0
+            for word in words:
+                if word in folded:
+                    continue
+                distance = self._closest(word, tokens)
+                if distance is None:
+                    break
+                edits += distance
+            else:
+                scored.append((edits, -count, -prompt_id))
+        scored.sort()
+        return [self.texts[-negative_id] for _edits, _count, negative_id in scored[:limit]]
+
+    @staticmethod
+    def _closest(word, tokens):
+        """Fewest edits turning word into one of tokens, None if more than it may take"""
+        allowed = 1 if len(word) < 8 else 2
+        if len(word) < 4:
+            return None  # Too short to tell a typo from a different word
+        best = None
+        for token in tokens:
+            if abs(len(token) - len(word)) > allowed:
+                continue
+            distance = _edit_distance(word, token, allowed)
+            if distance is not None and (best is None or distance < best):
+                best = distance
+                if best == 1:
+                    break
+        return best
+
+class PromptHistory(QObject):
+    """Past prompts kept in a JSONL file, indexed for recall and search.
+
+    The file is read on a background thread shortly after startup; anything that needs
+    the history before then reads it on the spot.
+    """
+    FILE_NAME = "prompt_history.jsonl"
+    _indexLoaded = pyqtSignal(object)
+
+    def __init__(self, path, max_entries=50000, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.max_entries = max_entries
+        self.index = None
+        self._pending = []  # Prompts sent before the history was loaded
+        self._read_result = None
+        self._read_lock = threading.Lock()
+        self._indexLoaded.connect(self._adopt)
+        # Appends happen on one worker, in order, off the GUI thread; finished on quit
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-writer")
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(lambda: self._writer.shutdown(wait=True))
+
+    def load_async(self):
+        if self.index is None:
+            threading.Thread(target=lambda: self._indexLoaded.emit(self._read()),
+                             name="history-loader", daemon=True).start()
+
+    def ensure_loaded(self):
+        if self.index is None:
+            self._adopt(self._read())
+        return self.index
+
+    def _read(self):
+        with self._read_lock:
+            if self._read_result is None:
+                start = time.monotonic()
+                texts, lines = [], 0
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            lines += 1
+                            try:
+                                texts.append(json.loads(line)['text'])
+                            except (ValueError, KeyError, TypeError):
+                                continue
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Error loading prompt history: {e}")
+                index = PromptIndex.build(texts)
+                while len(index) > self.max_entries:
+                    index.remove(index.oldest())
+                if lines > 2 * max(len(index), 100):
+                    # Mostly repeats and trimmed prompts: rewrite the live entries only
+                    index = PromptIndex.build(index.texts.values())
+                    try:
+                        atomic_write_text(self.path, "".join(
+                            json.dumps({'text': text}) + "\n" for text in index.texts.values()))
+                    except OSError as e:
+                        print(f"Error compacting prompt history: {e}")
+                debug_log(f"Prompt history: {len(index)} prompts in {time.monotonic() - start:.2f} s")
+                self._read_result = index
+            return self._read_result
+
+    def _adopt(self, index):
+        if self.index is not None:
+            return
+        self.index = index
+        pending, self._pending = self._pending, []
+        for text in pending:
+            self.add(text)
+
+    def add(self, text):
+        if self.index is None:
+            self._pending.append(text)
+            return
+        if self.index.newest() == text:
+            return
+        self.index.add(text)
+        if len(self.index) > self.max_entries:
+            self.index.remove(self.index.oldest())
+        self._writer.submit(self._append, json.dumps({'ts': round(time.time(), 3), 'text': text}) + "\n")
+
+    def _append(self, line):
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Error saving prompt history: {e}")
+
+    def recall_candidates(self, prefix):
+        return self.ensure_loaded().with_prefix(prefix)
+
+    def search(self, query, limit=50):
+        return self.ensure_loaded().search(query, limit)
+
+class PromptHistorySearch(QFrame):
+    """Ctrl+R popup over the prompt box: incremental search through past prompts"""
+    chosen = pyqtSignal(str)
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent, Qt.WindowType.Popup)
+        self.history = history
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Search prompt history...")
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.results)
+        self.query_edit.textChanged.connect(self.update_results)
+        self.query_edit.installEventFilter(self)
+        self.results.itemActivated.connect(lambda item: self._choose())
+
+    def update_results(self, query):
+        self.results.clear()
+        for text in self.history.search(query):
+            item = QListWidgetItem(" ".join(text.split())[:300])
+            item.setData(Qt.ItemDataRole.UserRole, text)
+            self.results.addItem(item)
+        self.results.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        if obj is self.query_edit and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            row = self.results.currentRow()
+            if key == Qt.Key.Key_Down or (key == Qt.Key.Key_R and event.modifiers() == Qt.KeyboardModifier.ControlModifier):
+                # Ctrl+R again steps to the next older match, like a shell
+                self.results.setCurrentRow(min(row + 1, self.results.count() - 1))
+                return True
+            if key == Qt.Key.Key_Up:
+                self.results.setCurrentRow(max(row - 1, 0))
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self._choose()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _choose(self):
+        item = self.results.currentItem()
+        if item is not None:
+            self.chosen.emit(item.data(Qt.ItemDataRole.UserRole))
+        self.close()
+
+    def popup(self, anchor, query=""):
+        """Open above the anchor widget, as wide as it"""
+        self.resize(anchor.width(), 320)
+        self.move(anchor.mapToGlobal(QPoint(0, -self.height())))
+        self.query_edit.setText(query)
+        self.update_results(query)
+        self.show()
+        self.query_edit.setFocus()
+
+class PromptTextEdit(QTextEdit):
+    ctrlEnterPressed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Prompts are sent as plain text; skipping rich text keeps large pastes fast
+        self.setAcceptRichText(False)
+        self.history = None  # PromptHistory, set by the window to enable recall
+        self._recall = None  # Browsing state while Up/Down walk through the history
+        self._search_popup = None
+        self.textChanged.connect(self._on_text_changed)
+
+    def keyPressEvent(self, event: QKeyEvent):
+        key, modifiers = event.key(), event.modifiers()
+        if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and modifiers == Qt.KeyboardModifier.ControlModifier:
+            self.ctrlEnterPressed.emit()
+        elif self.history is not None and key == Qt.Key.Key_R and modifiers == Qt.KeyboardModifier.ControlModifier:
+            self.open_history_search()
+        elif (self.history is not None and key in (Qt.Key.Key_Up, Qt.Key.Key_Down)
+              and modifiers == Qt.KeyboardModifier.NoModifier and self._at_edge(key)):
+            self.recall(older=key == Qt.Key.Key_Up)
+        else: super().keyPressEvent(event)
+
+    def _at_edge(self, key):
+        """True when the cursor can't move further up (or down) inside the text"""
+        cursor = QTextCursor(self.textCursor())
+        operation = QTextCursor.MoveOperation.Up if key == Qt.Key.Key_Up else QTextCursor.MoveOperation.Down
+        return not cursor.movePosition(operation)
+
+    def recall(self, older):
+        """Step through past prompts starting with what was typed before browsing began"""
+        if self._recall is None:
+            draft = self.toPlainText()
+            self._recall = {'matches': self.history.recall_candidates(draft), 'pos': -1, 'draft': draft}
+        state = self._recall
+        pos = state['pos'] + (1 if older else -1)
+        if pos >= len(state['matches']) or pos < -1:
+            return
+        state['pos'] = pos
+        self._set_recalled(state['matches'][pos] if pos >= 0 else state['draft'], at_start=older)
+
+    def _set_recalled(self, text, at_start):
+        state = self._recall
+        self._recall = None  # Keep _on_text_changed from ending the browse
+        self.setPlainText(text)
+        self._recall = state
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Start if at_start else QTextCursor.MoveOperation.End)
+        self.setTextCursor(cursor)
+
+    def _on_text_changed(self):
+        # Typing ends history browsing; the next Up starts over from the new text
+        if self._recall is not None:
+            self._recall = None
+
+    def open_history_search(self):
+        if self._search_popup is None:
+            self._search_popup = PromptHistorySearch(self.history, self)
+            self._search_popup.chosen.connect(self._use_history_entry)
+        self._search_popup.popup(self, self.textCursor().selectedText())
+
+    def _use_history_entry(self, text):
+        self.setPlainText(text)
+        self.moveCursor(QTextCursor.MoveOperation.End)
+        self.setFocus()
+
+def get_app_data_dir():
+    """Application data directory for profiles, configs and logs"""
+    return os.path.join(os.path.expanduser("~"), ".MultiVibeChat")
+
+def atomic_write_text(path, text):
+    """Write text to path via a temp file + rename, so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# What a new profile can inherit from the default profile. Entries are relative to the
+# profile's storage path; missing ones are skipped (layouts differ between Qt versions).
+# Caches, GPU/code caches and service worker storage are never cloned.
+_PROFILE_CLONE_PARTS = {
+    'cookies': ['Cookies', 'Cookies-journal', 'Network/Cookies', 'Network/Cookies-journal',
+                'Network Persistent State', 'TransportSecurity', 'Network/TransportSecurity'],
+    'local_storage': ['Local Storage', 'Session Storage'],
+    'indexeddb': ['IndexedDB', 'WebStorage', 'blob_storage', 'databases', 'QuotaManager', 'QuotaManager-journal'],
+    'preferences': ['user_prefs.json', 'Preferences', 'Visited Links', 'Trust Tokens'],
+}
+_PROFILE_CLONE_DEFAULT_PARTS = ('cookies', 'local_storage', 'indexeddb', 'preferences')
+
+# File kinds that are never rewritten once created, so the clone may share them via hardlinks
+_IMMUTABLE_SUFFIXES = ('.ldb', '.sst', '.blob')
+_IMMUTABLE_DIR_SUFFIXES = ('.indexeddb.blob', 'blob_storage')
+
+_FICLONE = 0x40049409  # Linux ioctl: share extents copy-on-write (btrfs, XFS, bcachefs)
+
+def _reflink(source, destination):
+    """Copy-on-write clone of a file, False where the platform/filesystem can't do it"""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(source, 'rb') as src_file, open(destination, 'wb') as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        shutil.copystat(source, destination)
+        return True
+    except OSError:
+        try:
+            os.remove(destination)
+        except OSError:
+            pass
+        return False
+
+class ProfileCloner(QObject):
+    """Creates a new profile from selected parts of another one on a worker thread.
+
+    Files are reflinked where the filesystem allows, immutable LevelDB/blob files are
+    hardlinked, everything else is copied. The clone is assembled in a temp directory
+    and renamed into place, so an interrupted clone never leaves a half profile behind.
+    """
+    progress = pyqtSignal(int, int)  # bytes done, bytes total
+    finished = pyqtSignal(bool, str)  # success, summary or error
+
+    def __init__(self, source, destination, parts=_PROFILE_CLONE_DEFAULT_PARTS, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.destination = destination
+        self.parts = [part for part in parts if part in _PROFILE_CLONE_PARTS]
+        self.stats = {'reflinked': 0, 'hardlinked': 0, 'copied': 0, 'bytes': 0}
+
+    def start(self):
+        threading.Thread(target=self.run, name="profile-cloner", daemon=True).start()
+
+    def _plan(self):
+        """List (relative path, size) of every file the selected parts cover"""
+        files = []
+        for part in self.parts:
+            for entry in _PROFILE_CLONE_PARTS[part]:
+                path = os.path.join(self.source, entry)
+                if os.path.isfile(path):
+                    files.append((entry, os.path.getsize(path)))
+                elif os.path.isdir(path):
+                    for root, _dirs, names in os.walk(path):
+                        for name in names:
+                            full = os.path.join(root, name)
+                            try:
+                                files.append((os.path.relpath(full, self.source), os.path.getsize(full)))
+                            except OSError:
+                                continue
+        return files
+
+    @staticmethod
+    def _is_immutable(relative_path):
+        if relative_path.endswith(_IMMUTABLE_SUFFIXES):
+            return True
+        parts = relative_path.replace('\\', '/').split('/')[:-1]
+        return any(part.endswith(_IMMUTABLE_DIR_SUFFIXES) for part in parts)
+
+    def _clone_file(self, relative_path, staging):
+        source = os.path.join(self.source, relative_path)
+        destination = os.path.join(staging, relative_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if _reflink(source, destination):
+            self.stats['reflinked'] += 1
+            return
+        if self._is_immutable(relative_path):
+            try:
+                os.link(source, destination)
+                self.stats['hardlinked'] += 1
+                return
+            except OSError:
+                pass
+        shutil.copy2(source, destination)
+        self.stats['copied'] += 1
+
+    def run(self):
+        staging = self.destination + ".cloning"
+        try:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+            os.makedirs(staging)
+            files = self._plan()
+            total = sum(size for _path, size in files)
+            done = 0
+            self.progress.emit(0, total)
+            for relative_path, size in files:
+                try:
+                    self._clone_file(relative_path, staging)
+                except OSError as e:
+                    # Files can vanish or be locked while the source profile is in use
+                    debug_log(f"Skipping {relative_path} while cloning: {e}")
+                    continue
+                done += size
+                self.stats['bytes'] += size
+                self.progress.emit(done, total)
+            os.replace(staging, self.destination)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            self.finished.emit(False, f"Cloning failed: {e}")
+            return
+        stats = self.stats
+        self.finished.emit(True, f"Cloned {stats['bytes'] / (1024 * 1024):.1f} MB "
+                                 f"({stats['reflinked']} reflinked, {stats['hardlinked']} hardlinked, "
+                                 f"{stats['copied']} copied)")
+
+class ConfigService(QObject):
+    """In-memory config with debounced, atomic write-behind.
+
+    The file is read once; reads are served from memory. Each set() restarts a short
+    debounce timer, after which a snapshot is written on a background thread. A
+    read-only instance keeps its changes in memory, for processes sharing the file
+    with another writer.
+    """
+    FILE_NAME = ".multi_vibe_chat_config.json"
+    DEBOUNCE_MS = 500
+
+    def __init__(self, path, legacy_paths=(), read_only=False, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.read_only = read_only
+        self._data = {}
+        # One worker keeps writes in order; the debounce timer coalesces bursts of changes
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-writer")
+        self._pending_write = None
+        self._dirty = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._write_behind)
+        self._read(legacy_paths)
+        if self._dirty and not self.read_only:
+            self._timer.start()  # Persist a migrated legacy config at its new location
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    @classmethod
+    def load_default(cls, read_only=False):
+        """Config in the app data dir, migrating the one older source runs kept next to the script"""
+        app_data_dir = get_app_data_dir()
+        os.makedirs(app_data_dir, exist_ok=True)
+        legacy = os.path.join(os.path.dirname(os.path.abspath(__file__)), cls.FILE_NAME)
+        return cls(os.path.join(app_data_dir, cls.FILE_NAME), legacy_paths=[legacy], read_only=read_only)
+
+    def _read(self, legacy_paths):
+        for path in [self.path, *legacy_paths]:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._data = data
+                    if path != self.path:
+                        debug_log(f"Migrating config from {path}")
+                        self._dirty = True
+                    return
+            except Exception as e:
+                print(f"Error loading config {path}: {e}")
+
+    def get(self, key, default=None):
+        """Value from memory - treat containers as read-only and set() a new one to change it"""
+        return self._data.get(key, default)
 
-    def open_dev_tools(self):
-        if self.dev_tools_view is None:
-            self.dev_tools_view = QWebEngineView()
-            self.dev_tools_view.setWindowTitle("Developer Tools")
-            self.dev_tools_view.setGeometry(100, 100, 800, 600)
-        self.page().setDevToolsPage(self.dev_tools_view.page())
-        self.dev_tools_view.show()
+    def set(self, key, value):
+        # Containers may have been changed in place by the caller, only skip unchanged scalars
+        if not isinstance(value, (dict, list)) and key in self._data and self._data[key] == value:
+            return
+        self._data[key] = value
+        if self.read_only:
+            return
+        self._dirty = True
+        self._timer.start()
 
-class PromptTextEdit(QTextEdit):
-    ctrlEnterPressed = pyqtSignal()
-    def keyPressEvent(self, event: QKeyEvent):
-        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            self.ctrlEnterPressed.emit()
-        else: super().keyPressEvent(event)
+    def _write_behind(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        # Serialize on the GUI thread so the worker never sees a dict being mutated
+        text = json.dumps(self._data, indent=2)
+        self._pending_write = self._writer.submit(self._write_file, text)
+
+    def _write_file(self, text):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            atomic_write_text(self.path, text)
+        except OSError as e:
+            print(f"Error saving config: {e}")
+
+    def flush(self):
+        """Persist pending changes now and wait for the writer (used on shutdown)"""
+        self._timer.stop()
+        if self._dirty:
+            self._write_behind()
+        if self._pending_write is not None:
+            self._pending_write.result()
+            self._pending_write = None
 
 class MultiVibeChat(QMainWindow):
-    # Pre-computed list of domains for preconnect (speeds up initial connections)
-    _PRECONNECT_DOMAINS = [
-        'chatgpt.com', 'claude.ai', 'x.com', 'aistudio.google.com', 'kimi.com',
-        'cdn.oaistatic.com', 'cdn.openai.com'  # Common CDNs
-    ]
+    # Delivers the compiled blocklist from its loader thread to the GUI thread
+    blocklistLoaded = pyqtSignal(object)
+    # Every provider runtime event: provider name, event
+    runtimeEventReceived = pyqtSignal(str, dict)
+    # Attachment payload encoded off the GUI thread: attach id, payload JSON, error
+    attachmentsEncoded = pyqtSignal(int, str, str)
+    # Learned hosts preconnected per enabled provider at startup
+    _PRECONNECT_HOSTS_PER_PROVIDER = 6
     
-    def __init__(self, profile_name='default'):
+    def __init__(self, profile_name='default', config=None):
         super().__init__()
         self.profile_name = profile_name
+        # Shared in-memory config, loaded once; writes are persisted in the background
+        self.config = config if config is not None else ConfigService.load_default()
         self.browsers = [] 
         self.is_grid_layout = False  # Default to Nx1 horizontal layout
         self.url_bars_visible = False  # Track URL bar visibility for Alt toggle
         self.broadcast_enabled = True  # Toggle for unified prompt delivery
         self._pending_loads = {}  # Track deferred browser loads
+        self._broadcast_seq = 0  # Id of the latest broadcast, echoed back by the runtime
+        self.send_outcomes = {}  # Provider name -> send outcome event of the latest broadcast
+        self._attach_seq = 0  # Id of the latest attachment broadcast
+        self.attach_outcomes = {}  # Provider name -> attach outcome event of the latest one
+        self._attach_description = ""
+        # Streams pane responses back and measures TTFT / throughput per provider
+        self.response_tracker = ResponseTracker(
+            metrics_path=os.path.join(self.get_app_data_dir(), "response_metrics.jsonl"), parent=self)
+        self.response_tracker.responseFinished.connect(self.on_response_finished)
+        # Cross-provider diff/consensus of the latest broadcast's answers, computed in the background
+        self.comparer = ResponseComparer(self)
+        self.response_tracker.responseUpdated.connect(self.on_response_updated)
+        self.comparison_view = None
+        self.exporter = None  # Running conversation export, if any
+        # Per-pane phase timeline of every broadcast (dispatch -> input -> click -> first token -> done)
+        self.timeline = BroadcastTimeline(
+            trace_path=os.path.join(self.get_app_data_dir(), "broadcast_trace.jsonl"), parent=self)
+        self.timeline.timelineChanged.connect(self.update_timeline_overlay)
+        # Freezes idle panes and discards the least recently used ones over the memory budget
+        self.lifecycle = PaneLifecycleManager(self, **self.load_lifecycle_settings())
+        # Per-pane renderer RSS/CPU with optional budgets (warn, freeze or reload)
+        self.resource_monitor = RendererResourceMonitor(self, **self.load_resource_budgets())
+        self.resource_monitor.sampled.connect(self.update_resource_label)
+        # Loads pane pages a few at a time in priority order
+        self.pane_loader = PaneLoadScheduler(self, **self.load_pane_loading_settings())
+        # Per-pane prompt queues, dispatched as panes finish generating
+        self.scheduler = PromptScheduler(self, **self.load_scheduler_settings())
+        self.scheduler.queueChanged.connect(self.update_queue_label)
+        # Recently used profiles kept alive (hidden and frozen) for near-instant switching
+        self.profile_pool = ProfilePool(
+            self, **self.load_profile_pool_settings(),
+            metrics_path=os.path.join(self.get_app_data_dir(), "profile_switch_metrics.jsonl"))
         self.all_targets = {
             'ChatGPT': 'https://chatgpt.com/', 
             'Claude': 'https://claude.ai/new',
@@ -221,87 +3403,36 @@ class MultiVibeChat(QMainWindow):
             'AI Studio': 'https://aistudio.google.com/prompts/new_chat',
             'Kimi K2': 'https://www.kimi.com/en'
         }
+        # Optional per-provider URL overrides, e.g. a local mock server for benchmarks
+        self.all_targets.update({k: v for k, v in self.config.get('target_urls', {}).items()
+                                 if k in self.all_targets})
         self.enabled_ais = self.load_enabled_ais()  # Load saved AI selection
         self.targets = {k: v for k, v in self.all_targets.items() if k in self.enabled_ais}
-        self.prompt_templates = {
-            'ChatGPT': """var input = document.querySelector('div#prompt-textarea[contenteditable="true"]'); if (input) {{ input.innerHTML = '<p>{prompt}</p>'; input.dispatchEvent(new Event('input', {{ bubbles: true }})); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[data-testid="send-button"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
-            'Claude': """var input = document.querySelector('div.ProseMirror[contenteditable="true"]'); if (input) {{ input.innerHTML = '<p>{prompt}</p>'; input.dispatchEvent(new Event('input', {{ bubbles: true }})); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[aria-label="Send message"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
-            'Grok': """var input = document.querySelector('textarea[placeholder="Ask anything"]'); if (input) {{ input.focus(); document.execCommand('insertText', false, `{prompt}`); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[aria-label="Grok something"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
-            'AI Studio': """
-            // Try multiple selectors for Google AI Studio input field
-            var input = document.querySelector('ms-autosize-textarea textarea') ||
-                       document.querySelector('textarea[placeholder*="Type something"]') ||
-                       document.querySelector('textarea[aria-label*="prompt"]') ||
-                       document.querySelector('.text-input-field textarea') ||
-                       document.querySelector('textarea');
-            
-            if (input) {{ 
-                input.focus();
-                input.value = `{prompt}`;
-                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                input.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                
-                // Wait and try multiple methods to submit
-                let attempts = 0;
-                const interval = setInterval(() => {{
-                    // Try to find the run/send button
-                    var btn = document.querySelector('ms-run-button button') ||
-                             document.querySelector('button[aria-label*="Run"]') ||
-                             document.querySelector('button[aria-label*="Send"]') ||
-                             document.querySelector('.run-button button') ||
-                             document.querySelector('button.send-button');
-                    
-                    if (btn && !btn.disabled) {{
-                        btn.click();
-                        clearInterval(interval);
-                    }} else if (attempts > 20) {{
-                        // Fallback: simulate Enter key press on the textarea
-                        input.dispatchEvent(new KeyboardEvent('keydown', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
-                        input.dispatchEvent(new KeyboardEvent('keypress', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
-                        input.dispatchEvent(new KeyboardEvent('keyup', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
-                        clearInterval(interval);
-                    }}
-                    attempts++;
-                }}, 100);
-            }}
-            """,
-            'Kimi K2': """
-            // Kimi K2 uses a contenteditable div with Lexical editor
-            var input = document.querySelector('#chat-container > div.layout-content-main > div > div.chat-editor > div.chat-input > div.chat-input-editor-container > div.chat-input-editor') ||
-                       document.querySelector('div.chat-input-editor[contenteditable="true"]') ||
-                       document.querySelector('div[data-lexical-editor="true"]') ||
-                       document.querySelector('.chat-input-editor');
-            
-            if (input) {{
-                input.focus();
-                
-                // Select all existing content and replace with new text using execCommand
-                // This is the most reliable way to work with Lexical editor
-                var sel = window.getSelection();
-                var range = document.createRange();
-                range.selectNodeContents(input);
-                sel.removeAllRanges();
-                sel.addRange(range);
-                
-                // Insert text using execCommand (replaces selected content)
-                document.execCommand('insertText', false, `{prompt}`);
-                
-                // Wait for the send button to become active and click it
-                let attempts = 0;
-                const interval = setInterval(() => {{
-                    var btn = document.querySelector('.send-button-container:not(.disabled)');
-                    if (btn && !btn.classList.contains('disabled')) {{
-                        btn.click();
-                        clearInterval(interval);
-                    }} else if (attempts > 30) {{
-                        clearInterval(interval);
-                    }}
-                    attempts++;
-                }}, 100);
-            }}
-            """
-        }
+        # Built-in tracker list right away, large filter lists are compiled in the background
+        self.blocklist = DomainBlocklist(_BLOCK_LIST)
+        self.blocklistLoaded.connect(self.apply_blocklist)
+        self.attachmentsEncoded.connect(self.broadcast_attachments)
+        # Created by handle_profile_logic once the profile's storage is ready
+        self.profile = None
+        self.interceptor = None
+        self.host_stats = HostStats()
+        # Persist learned preconnect hosts now and then, and on exit
+        self._host_stats_timer = QTimer(self)
+        self._host_stats_timer.timeout.connect(lambda: self.host_stats.save())
+        self._host_stats_timer.start(60000)
+        QApplication.instance().aboutToQuit.connect(lambda: self.host_stats.save())
+        self.lite_providers = self.load_lite_providers()
+        # Every prompt and captured answer of this profile, searchable offline
+        self.archive = ConversationArchive(
+            ConversationArchive.path_for(self.profile_storage_path(self.profile_name)), self)
+        QApplication.instance().aboutToQuit.connect(lambda: self.archive.close(wait=True))
+        self.search_dialog = None
+        # Recall (Up/Down) and Ctrl+R search over past prompts, read in the background
+        self.prompt_history = PromptHistory(
+            os.path.join(self.get_app_data_dir(), PromptHistory.FILE_NAME),
+            **self.load_prompt_history_settings(), parent=self)
         self.init_ui()
+        self.load_blocklists()
 
     def init_ui(self):
         self.setWindowTitle(f"Multi Vibe Chat - Profile: {self.profile_name}")
@@ -312,11 +3443,6 @@ class MultiVibeChat(QMainWindow):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.setCentralWidget(self.main_container)
 
-        self.handle_profile_logic()
-        
-        # Trigger preconnect to AI domains for faster initial load
-        self._preconnect_domains()
-
         # Create browser container that will be rebuilt when AI selection changes
         self.browser_container = QWidget()
         self.browser_layout = QVBoxLayout(self.browser_container)
@@ -324,9 +3450,6 @@ class MultiVibeChat(QMainWindow):
         
         self.view_stack = QStackedLayout()
         self.browser_layout.addLayout(self.view_stack)
-        
-        # Build the initial browser panes
-        self.rebuild_browser_panes()
 
         self.main_layout.addWidget(self.browser_container, 1)
 
@@ -338,6 +3461,7 @@ class MultiVibeChat(QMainWindow):
 
         self.prompt_text = PromptTextEdit()
         self.prompt_text.setPlaceholderText("Enter prompt for all AIs (Ctrl+Enter to send)...")
+        self.prompt_text.history = self.prompt_history
         
         # --- FIX: Replaced fixed pixel height with dynamic, font-based height ---
         font_metrics = self.prompt_text.fontMetrics()
@@ -354,19 +3478,42 @@ class MultiVibeChat(QMainWindow):
 
         top_button_layout = QHBoxLayout()
         send_btn, refresh_btn = QPushButton("Send to All"), QPushButton("Refresh All")
+        attach_btn = QPushButton("📎 Attach to All")
+        attach_btn.setToolTip("Upload file(s) to every pane at once")
         self.layout_switch_btn = QPushButton("Switch to Grid")
         self.focus_mode_btn = QPushButton("LOG IN MODE: OFF")
         self.focus_mode_btn.setCheckable(True)
         self.focus_mode_btn.setStyleSheet("QPushButton { background-color: #2196F3; color: white; font-weight: bold; } QPushButton:checked { background-color: #4CAF50; color: white; }")
         google_signin_btn = QPushButton("🔐 Google Login (legacy)")
         google_signin_btn.setStyleSheet("background-color: #808080; color: white; font-weight: bold;")
+        # Lite mode: per-provider request policy for constrained machines
+        self.lite_btn = QPushButton("⚡ Lite")
+        self.lite_btn.setToolTip("Skip fonts, media and third-party images on selected providers")
+        self.lite_menu = QMenu(self.lite_btn)
+        self.lite_btn.setMenu(self.lite_menu)
+        self.update_lite_menu()
+        self.timeline_btn = QPushButton("⏱ Timeline")
+        self.timeline_btn.setCheckable(True)
+        self.timeline_btn.setToolTip("Show the live latency timeline of the last broadcast")
+        export_btn = QPushButton("💾 Export All")
+        export_btn.setToolTip("Save the conversation open in every pane as Markdown and JSONL")
+        compare_btn = QPushButton("⚖ Compare")
+        compare_btn.setToolTip("Compare the latest answers side by side: consensus or token diffs")
+        search_btn = QPushButton("🔎 Search")
+        search_btn.setToolTip("Search past prompts and answers of this profile (Ctrl+Shift+F)")
         ai_select_btn = QPushButton("🤖 Select AIs")
         ai_select_btn.setStyleSheet("background-color: #9C27B0; color: white; font-weight: bold;")
         top_button_layout.addWidget(send_btn)
+        top_button_layout.addWidget(attach_btn)
         top_button_layout.addWidget(refresh_btn)
         top_button_layout.addWidget(self.layout_switch_btn)
         top_button_layout.addWidget(self.focus_mode_btn)
         top_button_layout.addWidget(ai_select_btn)
+        top_button_layout.addWidget(self.lite_btn)
+        top_button_layout.addWidget(self.timeline_btn)
+        top_button_layout.addWidget(compare_btn)
+        top_button_layout.addWidget(export_btn)
+        top_button_layout.addWidget(search_btn)
         top_button_layout.addWidget(google_signin_btn)
 
         profile_bar_layout = QHBoxLayout()
@@ -386,9 +3533,32 @@ class MultiVibeChat(QMainWindow):
         
         right_panel_layout.addLayout(top_button_layout)
         right_panel_layout.addLayout(profile_bar_layout)
+
+        # Live renderer memory/CPU per pane
+        self.resource_label = QLabel()
+        self.resource_label.setStyleSheet("color: #888; font-size: 11px;")
+        right_panel_layout.addWidget(self.resource_label)
+
+        # Prompts waiting for busy panes
+        queue_layout = QHBoxLayout()
+        self.queue_label = QLabel()
+        self.queue_label.setStyleSheet("color: #FFB74D; font-size: 11px;")
+        self.send_now_btn = QPushButton("Send Now")
+        self.send_now_btn.setToolTip("Send the next queued prompt to every held pane without waiting")
+        self.send_now_btn.clicked.connect(self.scheduler.send_now)
+        self.clear_queue_btn = QPushButton("Clear Queue")
+        self.clear_queue_btn.clicked.connect(self.scheduler.clear)
+        queue_layout.addWidget(self.queue_label, 1)
+        queue_layout.addWidget(self.send_now_btn)
+        queue_layout.addWidget(self.clear_queue_btn)
+        self.queue_label.hide()
+        self.send_now_btn.hide()
+        self.clear_queue_btn.hide()
+        right_panel_layout.addLayout(queue_layout)
         main_control_layout.addWidget(right_panel)
 
         send_btn.clicked.connect(self.broadcast_prompts)
+        attach_btn.clicked.connect(lambda: self.attach_files())
         self.prompt_text.ctrlEnterPressed.connect(self.broadcast_prompts)
         refresh_btn.clicked.connect(self.refresh_all)
         self.layout_switch_btn.clicked.connect(self.switch_layout)
@@ -396,9 +3566,78 @@ class MultiVibeChat(QMainWindow):
         google_signin_btn.clicked.connect(self.open_google_signin)
         switch_profile_btn.clicked.connect(self.switch_profile)
         ai_select_btn.clicked.connect(self.open_ai_selection)
+        self.timeline_btn.toggled.connect(self.toggle_timeline_overlay)
+        compare_btn.clicked.connect(self.open_comparison)
+        export_btn.clicked.connect(lambda: self.export_conversations())
+        search_btn.clicked.connect(self.open_search)
+        search_action = QAction(self)
+        search_action.setShortcut("Ctrl+Shift+F")
+        search_action.triggered.connect(self.open_search)
+        self.addAction(search_action)
+
+        # Live latency timeline line, hidden unless toggled on
+        self.timeline_label = QLabel()
+        self.timeline_label.setStyleSheet("font-family: monospace; padding: 2px 6px; color: #aaa;")
+        self.timeline_label.hide()
+        self.main_layout.addWidget(self.timeline_label)
         
         self.main_layout.addWidget(control_panel)
 
+        self.lifecycle.start()
+        self.resource_monitor.start()
+
+        startup_trace.mark('ui_built')
+        # Profile and panes come after the window's first paint (see paintEvent); the
+        # timer covers windows that never paint, such as offscreen batch runs
+        self._panes_started = False
+        QTimer.singleShot(500, self._start_panes)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._panes_started and not startup_trace.has('first_paint'):
+            startup_trace.mark('first_paint')
+            QTimer.singleShot(0, self._start_panes)
+
+    def _start_panes(self):
+        if self._panes_started:
+            return
+        self._panes_started = True
+        # Panes are built once the profile is ready, which may involve a background clone
+        self.open_profile(self.on_profile_ready)
+
+    def on_profile_ready(self):
+        startup_trace.mark('profile_ready')
+        self.rebuild_browser_panes()
+        startup_trace.mark('panes_created')
+        self._trace_pane_loads()
+        # Warm up connections for the panes still waiting to load
+        self._preconnect_domains()
+        # Nothing needs the prompt history until the first keystroke
+        QTimer.singleShot(1000, self.prompt_history.load_async)
+
+    def _trace_pane_loads(self):
+        """Mark when the first pane is interactive and when all panes have loaded"""
+        pending = {info['name'] for info in self.browsers}
+        trace_path = os.path.join(self.get_app_data_dir(), "startup_trace.jsonl")
+        if not pending:
+            startup_trace.finish(trace_path)
+            return
+
+        def on_loaded(ok, name):
+            if name not in pending:
+                return
+            pending.discard(name)
+            if not startup_trace.has('first_pane_loaded'):
+                startup_trace.mark('first_pane_loaded')
+                startup_trace.mark(f'interactive:{name}')
+            if not pending:
+                startup_trace.mark('all_panes_loaded')
+                startup_trace.finish(trace_path)
+        for info in self.browsers:
+            info['browser'].page().loadFinished.connect(lambda ok, n=info['name']: on_loaded(ok, n))
+        # Don't wait forever on a pane that never finishes loading
+        QTimer.singleShot(60000, lambda: startup_trace.finish(trace_path))
+
     def keyPressEvent(self, event: QKeyEvent):
         # Toggle URL bar visibility on Alt key press (not hold)
         if event.key() == Qt.Key.Key_Alt and not event.isAutoRepeat():
@@ -419,10 +3658,8 @@ class MultiVibeChat(QMainWindow):
         # Do nothing on Alt release - we toggle on press now
         super().keyReleaseEvent(event)
 
-    def create_browser_pane(self, name, delay_ms=0):
-        """Create a browser pane, optionally with delayed load for staggered initialization"""
-        from PyQt6.QtCore import QTimer
-        
+    def create_browser_pane(self, name):
+        """Create a browser pane; its page is loaded by the pane load scheduler"""
         container = QWidget()
         layout = QVBoxLayout(container)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -436,55 +3673,85 @@ class MultiVibeChat(QMainWindow):
         browser = CustomWebEngineView()
         page = CustomWebEnginePage(self.profile, browser)
         browser.setPage(page)
+        page.runtimeEvent.connect(lambda event, n=name: self.handle_runtime_event(n, event))
         
         # Set black background to avoid white flash during page load
         page.setBackgroundColor(QColor(0, 0, 0))
         browser.setStyleSheet("background-color: #000000;")
         
-        # Stagger page loads to avoid overwhelming the system
-        target_url = self.targets[name]
-        if delay_ms > 0:
-            QTimer.singleShot(delay_ms, lambda: browser.load(QUrl(target_url)))
-        else:
-            browser.load(QUrl(target_url))
-        
         # Update URL bar when page URL changes
         browser.urlChanged.connect(lambda url, bar=url_bar: bar.setText(url.toString()))
         
         # Navigate when user presses Enter in URL bar
         url_bar.returnPressed.connect(lambda b=browser, bar=url_bar: self.navigate_to_url(b, bar))
 
+        # Screenshot stand-in shown while the page is frozen or discarded
+        snapshot = PaneSnapshot()
+
         layout.addWidget(url_bar)
         layout.addWidget(browser)
+        layout.addWidget(snapshot)
         
-        browser_info = {'name': name, 'browser': browser, 'url_bar': url_bar, 'container': container}
+        browser_info = {'name': name, 'browser': browser, 'url_bar': url_bar, 'container': container,
+                        'snapshot': snapshot, 'last_active': time.monotonic()}
+        snapshot.clicked.connect(lambda info=browser_info: self.lifecycle.wake(info))
+        # A (re)loading page drops whatever it was answering and can't take prompts until loaded
+        self.scheduler.pane_loading(name)
+        page.loadStarted.connect(lambda info=browser_info: self.on_pane_load_started(info))
+        page.loadFinished.connect(lambda ok, info=browser_info: self.on_pane_load_finished(info))
         self.browsers.append(browser_info)
         return container
+
+    def on_pane_load_started(self, browser_info):
+        browser_info['loading'] = True
+        if not any(info is browser_info for info in self.browsers):
+            return  # Stashed pane of another profile
+        self.response_tracker.abandon(browser_info['name'], 'page_reloaded')
+        self.scheduler.pane_loading(browser_info['name'])
+
+    def on_pane_load_finished(self, browser_info):
+        browser_info['loading'] = False
+        if any(info is browser_info for info in self.browsers):
+            self.scheduler.pane_loaded(browser_info['name'])
     
+    def preconnect_hosts(self):
+        """Hosts to warm up: the learned top hosts of each enabled provider, else its own host"""
+        hosts = []
+        for url in self.targets.values():
+            target_host = QUrl(url).host()
+            learned = self.host_stats.top_hosts(site_of(target_host), self._PRECONNECT_HOSTS_PER_PROVIDER)
+            for host in learned or [target_host]:
+                if host not in hosts:
+                    hosts.append(host)
+        return hosts
+
     def _preconnect_domains(self):
         """Warm up connections to AI domains for faster page loads"""
-        from PyQt6.QtCore import QTimer
-        # Use a hidden browser to trigger DNS prefetch and connection warmup
-        preconnect_html = '<html><head>'
-        for domain in self._PRECONNECT_DOMAINS:
-            preconnect_html += f'<link rel="preconnect" href="https://{domain}" crossorigin>'
-            preconnect_html += f'<link rel="dns-prefetch" href="https://{domain}">'
-        preconnect_html += '</head><body></body></html>'
-        
-        # Create a temporary hidden view to execute preconnect
-        self._preconnect_view = QWebEngineView()
-        self._preconnect_view.setHtml(preconnect_html)
-        # Clean up after a short delay
-        QTimer.singleShot(3000, self._cleanup_preconnect)
+        hosts = self.preconnect_hosts()
+        if not hosts:
+            return
+        # Use a windowless page to trigger DNS prefetch and connection warmup; fonts and
+        # CORS fetches use separate credential-less sockets, hence the crossorigin variant
+        links = "".join(f'<link rel="dns-prefetch" href="https://{host}">'
+                        f'<link rel="preconnect" href="https://{host}">'
+                        f'<link rel="preconnect" href="https://{host}" crossorigin>' for host in hosts)
+        debug_log(f"Preconnecting {len(hosts)} hosts: {', '.join(hosts)}")
+        
+        # On the panes' own profile - connections aren't shared between profiles
+        self._cleanup_preconnect()
+        self._preconnect_page = QWebEnginePage(self.profile, self)
+        # Done once the link hints are processed, the warmed sockets belong to the profile
+        self._preconnect_page.loadFinished.connect(lambda ok: QTimer.singleShot(0, self._cleanup_preconnect))
+        self._preconnect_page.setHtml(f"<html><head>{links}</head><body></body></html>")
     
     def _cleanup_preconnect(self):
         """Clean up preconnect resources"""
-        if hasattr(self, '_preconnect_view'):
+        if hasattr(self, '_preconnect_page'):
             try:
-                self._preconnect_view.deleteLater()
+                self._preconnect_page.deleteLater()
             except RuntimeError:
                 pass
-            del self._preconnect_view
+            del self._preconnect_page
     
     def navigate_to_url(self, browser, url_bar):
         """Navigate browser to URL entered in the URL bar"""
@@ -510,6 +3777,9 @@ class MultiVibeChat(QMainWindow):
 
     def rebuild_browser_panes(self):
         """Rebuild browser panes based on currently enabled AIs, preserving existing browsers"""
+        if self.profile is None:
+            # Profile still being created, panes are built once it is ready
+            return
         # Get current and new AI names
         current_ai_names = {browser_info['name'] for browser_info in self.browsers if browser_info.get('browser')}
         new_ai_names = set(self.targets.keys())
@@ -545,14 +3815,16 @@ class MultiVibeChat(QMainWindow):
         
         self.browsers = browsers_to_keep
         
-        # Add browsers for newly selected AIs with staggered loading
-        # Delay each subsequent browser by 150ms to avoid network/CPU contention
-        delay_increment = 150
-        for idx, ai_name in enumerate(ais_to_add):
-            if ai_name in self.targets:
-                # Create new browser pane with staggered delay
-                self.create_browser_pane(ai_name, delay_ms=idx * delay_increment)
-                # Note: create_browser_pane already appends to self.browsers
+        # Add browsers for newly selected AIs; their pages load through the scheduler,
+        # a few at a time, the pane focused last and the most used ones first
+        last_focused = self.config.get('last_focused_provider')
+        usage = self.config.get('pane_usage', {})
+        order = list(self.targets)
+        for ai_name in sorted(ais_to_add, key=order.index):
+            self.create_browser_pane(ai_name)
+            # Note: create_browser_pane already appends to self.browsers
+            rank = (ai_name != last_focused, -usage.get(ai_name, 0), order.index(ai_name))
+            self.pane_loader.request(self.browsers[-1], self.targets[ai_name], rank)
         
         # Clear view stack
         while self.view_stack.count() > 0:
@@ -591,6 +3863,9 @@ class MultiVibeChat(QMainWindow):
                 # URL bar has been deleted, skip it
                 continue
 
+        # Start loading now that the panes are laid out
+        self.pane_loader.pump()
+
     def create_layouts_with_existing_containers(self, ai_names):
         """Create both grid and horizontal layouts, containers will be moved between them as needed"""
         # Create a mapping of AI names to their browser containers
@@ -856,34 +4131,139 @@ class MultiVibeChat(QMainWindow):
         dialog.exec()
 
     def load_enabled_ais(self):
-        """Load the enabled AI list from config file."""
-        try:
-            config_path = self.get_config_path()
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    enabled = config.get('enabled_ais', None)
-                    if enabled:
-                        # Filter to only include valid AI names
-                        return [ai for ai in enabled if ai in self.all_targets]
-        except Exception as e:
-            print(f"Error loading enabled AIs: {e}")
+        """Load the enabled AI list from config."""
+        enabled = self.config.get('enabled_ais')
+        if enabled:
+            # Filter to only include valid AI names
+            return [ai for ai in enabled if ai in self.all_targets]
         # Default: all AIs enabled
         return list(self.all_targets.keys())
 
+    def load_blocklists(self):
+        """Compile the filter lists in ~/.MultiVibeChat/blocklists off the GUI thread"""
+        directory = os.path.join(self.get_app_data_dir(), "blocklists")
+        os.makedirs(directory, exist_ok=True)
+
+        def worker():
+            start = time.monotonic()
+            blocklist = DomainBlocklist.load_directory(directory)
+            debug_log(f"Blocklist ready: {len(blocklist)} domains in {time.monotonic() - start:.2f} s")
+            self.blocklistLoaded.emit(blocklist)
+        threading.Thread(target=worker, name="blocklist-loader", daemon=True).start()
+
+    def apply_blocklist(self, blocklist):
+        self.blocklist = blocklist
+        if self.interceptor is not None:
+            self.interceptor.blocklist = blocklist
+
+    def load_lifecycle_settings(self):
+        """Load pane freeze/discard settings from config."""
+        settings = {'freeze_after_min': 0, 'memory_budget_mb': 0}
+        settings.update({k: v for k, v in self.config.get('lifecycle', {}).items() if k in settings})
+        return settings
+
+    def load_profile_pool_settings(self):
+        """Load the warm profile pool size and memory budget from config."""
+        settings = {'size': 2, 'memory_budget_mb': 0}
+        settings.update({k: v for k, v in self.config.get('profile_pool', {}).items() if k in settings})
+        return settings
+
+    def load_pane_loading_settings(self):
+        """Load the pane load concurrency cap and per-pane timeout from config."""
+        settings = {'max_concurrent': 2, 'timeout_ms': 8000}
+        settings.update({k: v for k, v in self.config.get('pane_loading', {}).items() if k in settings})
+        return settings
+
+    def load_scheduler_settings(self):
+        """Load the prompt queue's concurrency and rate limits from config."""
+        settings = {'max_active': 0, 'rate_limits': {}}
+        settings.update({k: v for k, v in self.config.get('scheduler', {}).items() if k in settings})
+        return settings
+
+    def load_virtualization_settings(self):
+        """Load which providers get long-thread DOM virtualization from config."""
+        settings = {'providers': list(self.all_targets), 'keep_recent': 8, 'intrinsic_px': 600}
+        settings.update({k: v for k, v in self.config.get('dom_virtualization', {}).items() if k in settings})
+        return settings
+
+    def load_prompt_history_settings(self):
+        """Load the prompt history size limit from config."""
+        settings = {'max_entries': 50000}
+        settings.update({k: v for k, v in self.config.get('prompt_history', {}).items() if k in settings})
+        return settings
+
+    def update_queue_label(self, depth):
+        if not depth:
+            self.queue_label.hide()
+            self.send_now_btn.hide()
+            self.clear_queue_btn.hide()
+            return
+        self.queue_label.setText("Queued: " + " · ".join(
+            f"{name} {count} ({self.scheduler.hold_reason(name)})" for name, count in depth.items()))
+        self.queue_label.show()
+        self.send_now_btn.show()
+        self.clear_queue_btn.show()
+
+    def load_resource_budgets(self):
+        """Load renderer resource budgets from config."""
+        budgets = {'rss_mb': 0, 'cpu_percent': 0, 'sustain_samples': 3, 'action': 'warn'}
+        budgets.update({k: v for k, v in self.config.get('resource_budgets', {}).items() if k in budgets})
+        return budgets
+
+    def update_resource_label(self, samples):
+        self.resource_label.setText(self.resource_monitor.summary())
+        over = any(sample['over_budget'] for sample in samples.values())
+        self.resource_label.setStyleSheet(f"color: {'#e57373' if over else '#888'}; font-size: 11px;")
+
     def save_enabled_ais(self):
-        """Save the enabled AI list to config file."""
-        try:
-            config_path = self.get_config_path()
-            config = {}
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-            config['enabled_ais'] = self.enabled_ais
-            with open(config_path, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error saving enabled AIs: {e}")
+        """Save the enabled AI list to config."""
+        self.config.set('enabled_ais', self.enabled_ais)
+
+    def load_lite_providers(self):
+        """Load the providers running in lite mode for the current profile."""
+        providers = self.config.get('lite_mode', {}).get(self.profile_name, [])
+        return [ai for ai in providers if ai in self.all_targets]
+
+    def save_lite_providers(self):
+        """Save the lite mode providers of the current profile to config."""
+        lite_mode = dict(self.config.get('lite_mode', {}))
+        lite_mode[self.profile_name] = self.lite_providers
+        self.config.set('lite_mode', lite_mode)
+
+    def build_interception_policy(self):
+        """Interception policy for the lite mode providers of the current profile"""
+        hosts = set()
+        for name in self.lite_providers:
+            host = QUrl(self.all_targets[name]).host()
+            hosts.add(host[4:] if host.startswith('www.') else host)
+        return InterceptionPolicy(hosts, self.config.get('lite_block', _LITE_DEFAULT_BLOCK))
+
+    def update_lite_menu(self):
+        """Rebuild the lite mode menu from the current profile's selection"""
+        self.lite_menu.clear()
+        all_action = self.lite_menu.addAction("All providers")
+        all_action.setCheckable(True)
+        all_action.setChecked(len(self.lite_providers) == len(self.all_targets))
+        all_action.toggled.connect(lambda checked: self.set_lite_providers(list(self.all_targets) if checked else []))
+        self.lite_menu.addSeparator()
+        for name in self.all_targets:
+            action = self.lite_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name in self.lite_providers)
+            action.toggled.connect(lambda checked, n=name: self.set_lite_providers(
+                [p for p in self.all_targets if (p == n and checked) or (p != n and p in self.lite_providers)]))
+        count = len(self.lite_providers)
+        self.lite_btn.setText(f"⚡ Lite ({count})" if count else "⚡ Lite")
+
+    def set_lite_providers(self, providers):
+        """Switch lite mode for the given providers of this profile, effective for new requests"""
+        self.lite_providers = providers
+        self.save_lite_providers()
+        if self.interceptor is not None:
+            self.interceptor.policy = self.build_interception_policy()
+        # Deferred so the menu isn't rebuilt while one of its actions is still emitting
+        QTimer.singleShot(0, self.update_lite_menu)
+        self.statusBar().showMessage("Lite mode updated - reload panes to apply it to loaded content", 8000)
 
     def toggle_focus_mode(self, enabled):
         """Pause automatic broadcasting when focus mode is enabled"""
@@ -903,24 +4283,222 @@ class MultiVibeChat(QMainWindow):
         
         prompt = self.prompt_text.toPlainText().strip()
         if not prompt: return
-        js_safe_prompt = prompt.replace('\\', '\\\\').replace('`', '\\`').replace('\n', '\\n').replace("'", "\\'")
+        self.prompt_history.add(prompt)
+        self.broadcast_text(prompt)
+        self.prompt_text.clear()
+
+    def broadcast_text(self, prompt):
+        """Send a prompt to every provider pane, returning the broadcast id"""
+        self._broadcast_seq += 1
+        self.send_outcomes = {}
+        # Encode once - json.dumps output is a valid JS literal, no manual escaping needed
+        payload_json = json.dumps({'id': self._broadcast_seq, 'text': prompt})
+        self.timeline.begin(self._broadcast_seq, len(prompt))
+        self.archive.add_prompt(self._broadcast_seq, prompt)
+        self.comparer.reset()
         
+        # Each pane gets the prompt once it has finished its previous answer
+        for ai_info in self.browsers:
+            if ai_info['name'] in _PROVIDER_ADAPTERS:
+                self.scheduler.enqueue(ai_info['name'], self._broadcast_seq, payload_json)
+        self.scheduler.pump()
+        return self._broadcast_seq
+
+    def send_prompt(self, ai_info, prompt):
+        """Send a prompt to a single pane as a broadcast of its own, returning its id"""
+        self._broadcast_seq += 1
+        broadcast_id = self._broadcast_seq
+        payload_json = json.dumps({'id': broadcast_id, 'text': prompt})
+        self.archive.add_prompt(broadcast_id, prompt)
+        self.lifecycle.wake(ai_info, lambda: self.dispatch_prompt(ai_info, payload_json, broadcast_id))
+        return broadcast_id
+
+    def dispatch_prompt(self, ai_info, payload_json, broadcast_id):
+        """Hand an encoded prompt payload to one pane's provider runtime"""
+        name = ai_info['name']
+        self.response_tracker.start(name, broadcast_id)
+
+        def on_sent(result):
+            # Anything but 'dispatched' means no runtime took the prompt (page blank or navigating)
+            if result != 'dispatched':
+                debug_log(f"Send to {name} not dispatched ({result!r})")
+                self.response_tracker.abandon(name, 'not_dispatched', broadcast_id)
+        ai_info['browser'].page().runJavaScript(build_send_call(name, payload_json), _RUNTIME_WORLD_ID, on_sent)
+        if self.timeline.current and self.timeline.current['id'] == broadcast_id:
+            self.timeline.stamp(name, 'dispatched')
+
+    def attach_files(self, paths=None):
+        """Pick files and upload them to every pane; they are read and encoded only once"""
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+
+        if paths is None:
+            paths, _ = QFileDialog.getOpenFileNames(self, "Attach to All Panes")
+        if not paths:
+            return
+        total = sum(os.path.getsize(path) for path in paths)
+        if total > _ATTACH_MAX_BYTES:
+            QMessageBox.warning(self, "Attach to All",
+                                f"{total / 2 ** 20:.0f} MB is more than the {_ATTACH_MAX_BYTES // 2 ** 20} MB limit.")
+            return
+        self._attach_seq += 1
+        attach_id = self._attach_seq
+        names = ", ".join(os.path.basename(path) for path in paths)
+        self._attach_description = f"{names} ({total / 2 ** 20:.1f} MB)"
+        self.statusBar().showMessage(f"Reading {self._attach_description}...")
+
+        def worker():
+            try:
+                self.attachmentsEncoded.emit(attach_id, encode_attachments(attach_id, paths), "")
+            except (OSError, ValueError) as e:
+                self.attachmentsEncoded.emit(attach_id, "", str(e))
+        threading.Thread(target=worker, name="attachment-reader", daemon=True).start()
+
+    def broadcast_attachments(self, attach_id, payload_json, error):
+        """Hand an encoded attachment payload to every pane's provider runtime"""
+        if attach_id != self._attach_seq:
+            return  # Superseded by a newer attachment
+        if error:
+            print(f"Error reading attachments: {error}")
+            self.statusBar().showMessage(f"Could not read {self._attach_description}: {error}", 10000)
+            return
+        self.attach_outcomes = {}
+        for ai_info in self.browsers:
+            if ai_info['name'] in _PROVIDER_ADAPTERS:
+                call = build_attach_call(ai_info['name'], payload_json)
+                self.lifecycle.wake(ai_info, lambda info=ai_info, call=call:
+                                    info['browser'].page().runJavaScript(call, _RUNTIME_WORLD_ID))
+        self.update_attach_status()
+        # Panes still loading have no runtime to answer, report them after a while
+        QTimer.singleShot(15000, lambda: self.update_attach_status(attach_id, final=True))
+
+    def update_attach_status(self, attach_id=None, final=False):
+        if attach_id is not None and attach_id != self._attach_seq:
+            return
+        summary = []
         for ai_info in self.browsers:
             name = ai_info['name']
-            browser = ai_info['browser']
-            if name in self.prompt_templates:
-                browser.page().runJavaScript(self.prompt_templates[name].format(prompt=js_safe_prompt))
-                
-        self.prompt_text.clear()
+            outcome = self.attach_outcomes.get(name, {}).get('outcome')
+            if outcome in ('input', 'drop'):
+                summary.append(f"{name} ✓")
+            elif outcome is not None:
+                summary.append(f"{name} ✗ {outcome}")
+            elif final:
+                summary.append(f"{name} ✗ no response")
+            else:
+                summary.append(f"{name} …")
+        self.statusBar().showMessage(f"📎 {self._attach_description}: " + " · ".join(summary), 15000)
+
+    def handle_runtime_event(self, name, event):
+        """Handle an event reported by the provider runtime of one pane"""
+        self.response_tracker.handle_event(name, event)
+        self.timeline.handle_event(name, event)
+        self.runtimeEventReceived.emit(name, event)
+        if event.get('type') == 'attach_outcome':
+            if event.get('id') == self._attach_seq:
+                self.attach_outcomes[name] = event
+                self.update_attach_status()
+                if event['outcome'] not in ('input', 'drop'):
+                    debug_log(f"Attach to {name} ended with '{event['outcome']}'")
+        elif event.get('type') == 'send_outcome':
+            if event.get('id') != self._broadcast_seq:
+                return  # Late report from an older broadcast
+            self.send_outcomes[name] = event
+            summary = []
+            for provider, outcome in self.send_outcomes.items():
+                if outcome['outcome'] == 'clicked':
+                    summary.append(f"{provider} {outcome['elapsed_ms']} ms")
+                else:
+                    summary.append(f"{provider} {outcome['outcome']}")
+            self.statusBar().showMessage("Sent: " + " · ".join(summary), 10000)
+            if event['outcome'] != 'clicked':
+                debug_log(f"Send to {name} ended with '{event['outcome']}' after {event['elapsed_ms']} ms")
+
+    def toggle_timeline_overlay(self, enabled):
+        """Show or hide the live broadcast timeline line"""
+        self.timeline_label.setVisible(enabled)
+        self.update_timeline_overlay()
+
+    def update_timeline_overlay(self):
+        if self.timeline_label.isVisible():
+            self.timeline_label.setText(self.timeline.summary())
+
+    def on_response_updated(self, name, text):
+        if self.response_tracker.broadcast_of(name) == self._broadcast_seq:
+            self.comparer.update(name, text)
+
+    def on_response_finished(self, name, text, metrics):
+        """Archive a completed pane response and show its latency numbers"""
+        self.archive.add_response(name, text, metrics)
+        if metrics['broadcast_id'] == self._broadcast_seq:
+            self.comparer.update(name, text)
+        if metrics['ttft_s'] is None:
+            self.statusBar().showMessage(f"{name}: no response captured ({metrics['reason']})", 10000)
+            return
+        averages = self.response_tracker.averages(name)
+        self.statusBar().showMessage(
+            f"{name}: TTFT {metrics['ttft_s']:.2f} s · {metrics['chars_per_s'] or 0:.0f} chars/s · "
+            f"total {metrics['total_s']:.1f} s (avg TTFT {averages['ttft_s']:.2f} s)", 15000)
+
+    def export_conversations(self, out_dir=None):
+        """Stream every pane's conversation to a new export folder, one file pair per provider"""
+        from PyQt6.QtWidgets import QFileDialog
+        from PyQt6.QtCore import QStandardPaths
+
+        if self.exporter is not None:
+            self.statusBar().showMessage("An export is already running", 5000)
+            return
+        if out_dir is None:
+            parent_dir = QFileDialog.getExistingDirectory(
+                self, "Export Conversations To",
+                QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DocumentsLocation))
+            if not parent_dir:
+                return
+            out_dir = os.path.join(parent_dir, time.strftime("MultiVibeChat-export-%Y%m%d-%H%M%S"))
+        self.exporter = ConversationExporter(self, out_dir, self)
+        self.exporter.progress.connect(lambda text: self.statusBar().showMessage(text))
+        self.exporter.finished.connect(self.on_export_finished)
+        self.exporter.start()
+
+    def on_export_finished(self, out_dir, counts):
+        failed = self.exporter.failed
+        self.exporter.deleteLater()
+        self.exporter = None
+        summary = " · ".join(f"{name} {count}" + (" (incomplete)" if name in failed else "")
+                             for name, count in counts.items())
+        self.statusBar().showMessage(f"Exported to {out_dir}: {summary or 'no panes'}", 15000)
+
+    def open_comparison(self):
+        """Show the live comparison of the latest broadcast's answers"""
+        if self.comparison_view is None:
+            self.comparison_view = ComparisonView(self)
+        self.comparison_view.show()
+        self.comparison_view.raise_()
+        self.comparison_view.activateWindow()
+
+    def open_search(self):
+        """Show the conversation search panel for the current profile"""
+        if self.search_dialog is None:
+            self.search_dialog = ArchiveSearchDialog(self)
+            self.search_dialog.set_archive(self.archive)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
+        self.search_dialog.query_edit.setFocus()
+        self.search_dialog.query_edit.selectAll()
 
     def refresh_all(self):
         for ai_info in self.browsers:
+            self.lifecycle.wake(ai_info)
             ai_info['browser'].reload()
     
     def open_google_signin(self):
         """Open a dedicated Google sign-in dialog"""
         from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton
         from PyQt6.QtCore import Qt
+
+        if self.profile is None:
+            # Still cloning the profile
+            return
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Sign in with Google")
@@ -971,34 +4549,88 @@ class MultiVibeChat(QMainWindow):
         debug_log(f"Current profile: {self.profile_name}")
         debug_log(f"New profile: {new_profile_name}")
 
+        clone_parts = None
+        if not os.path.exists(self.profile_storage_path(new_profile_name)):
+            clone_parts = self.ask_clone_parts(new_profile_name)
+            if clone_parts is None:
+                return
+
         # Save the new profile as the last used
         self.save_last_profile(new_profile_name)
 
         # Apply the switch without restarting the app (avoids PyInstaller temp conflicts)
-        self.apply_profile_switch(new_profile_name)
+        self.apply_profile_switch(new_profile_name, clone_parts)
+
+    def ask_clone_parts(self, new_profile_name):
+        """Let the user pick what a new profile inherits from the default one, None on cancel"""
+        from PyQt6.QtWidgets import QDialog, QVBoxLayout, QCheckBox, QLabel, QDialogButtonBox
 
-    def apply_profile_switch(self, new_profile_name):
-        """Switch profiles in-process by rebuilding all browsers with a new QWebEngineProfile."""
+        if not os.path.exists(self.profile_storage_path('default')):
+            return []
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Create Profile '{new_profile_name}'")
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Copy from the default profile:"))
+        labels = {
+            'cookies': "Cookies (stay logged in)",
+            'local_storage': "Local and session storage",
+            'indexeddb': "IndexedDB and site databases",
+            'preferences': "Preferences",
+        }
+        selected = self.config.get('clone_parts', list(_PROFILE_CLONE_DEFAULT_PARTS))
+        checkboxes = {}
+        for part, label in labels.items():
+            checkbox = QCheckBox(label)
+            checkbox.setChecked(part in selected)
+            layout.addWidget(checkbox)
+            checkboxes[part] = checkbox
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return None
+        parts = [part for part, checkbox in checkboxes.items() if checkbox.isChecked()]
+        self.config.set('clone_parts', parts)
+        return parts
+
+    def apply_profile_switch(self, new_profile_name, clone_parts=None):
+        """Switch profiles in-process, reusing the pooled panes of recently used profiles.
+
+        The outgoing profile is parked in the pool (hidden and frozen); a pooled target
+        profile is swapped back in without reloading, any other one is built from scratch.
+        """
         debug_log("Applying profile switch in-process")
+        started = time.perf_counter()
+        old_profile_name = self.profile_name
 
         # Update profile name and window title
         self.profile_name = new_profile_name
         self.setWindowTitle(f"Multi Vibe Chat - Profile: {self.profile_name}")
 
-        # Clear existing browsers and containers
-        for browser_info in list(self.browsers):
-            try:
-                container = browser_info.get('container')
-                if container:
-                    container.setParent(None)
-                    container.deleteLater()
-                browser = browser_info.get('browser')
-                if browser:
-                    browser.setParent(None)
-                    browser.deleteLater()
-            except RuntimeError:
-                pass
+        # Queued prompts and loads were meant for the outgoing profile's panes
+        self.scheduler.reset()
+        self.pane_loader.clear()
+
+        # Each profile keeps its own conversation archive
+        self.archive.close()
+        self.archive = ConversationArchive(
+            ConversationArchive.path_for(self.profile_storage_path(new_profile_name)), self)
+        if self.search_dialog is not None:
+            self.search_dialog.set_archive(self.archive)
+
+        # Parked panes are frozen and never report done, stop waiting for their answers
+        for browser_info in self.browsers:
+            self.response_tracker.abandon(browser_info['name'], 'profile_switched')
 
+        # Park the outgoing profile's panes (or dispose of them when pooling is off)
+        if self.profile is not None:
+            self.host_stats.save()
+            self.profile_pool.stash(old_profile_name, {
+                'profile': self.profile,
+                'interceptor': self.interceptor,
+                'browsers': self.browsers,
+            })
         self.browsers = []
 
         # Clear view stack widgets
@@ -1011,55 +4643,56 @@ class MultiVibeChat(QMainWindow):
             else:
                 break
 
-        # Dispose old profile and create a new one
-        try:
-            if hasattr(self, 'profile') and self.profile:
-                self.profile.deleteLater()
-        except RuntimeError:
-            pass
+        self.profile = None
+        self.interceptor = None
 
-        self.handle_profile_logic()
+        def rebuild():
+            self.update_lite_menu()
 
-        # Rebuild browsers with the new profile
-        self.rebuild_browser_panes()
+            # Rebuild browsers with the new profile
+            self.rebuild_browser_panes()
 
-        # Update profile combo list if needed
-        existing_profiles = self.find_existing_profiles()
-        if new_profile_name not in existing_profiles:
-            self.profile_combo.addItem(new_profile_name)
-        self.profile_combo.setCurrentText(new_profile_name)
+            # Update profile combo list if needed
+            existing_profiles = self.find_existing_profiles()
+            if new_profile_name not in existing_profiles:
+                self.profile_combo.addItem(new_profile_name)
+            self.profile_combo.setCurrentText(new_profile_name)
+
+        entry = self.profile_pool.take(new_profile_name)
+        if entry is not None:
+            self.profile = entry['profile']
+            self.interceptor = entry['interceptor']
+            self.interceptor.blocklist = self.blocklist
+            self.host_stats = self.interceptor.host_stats
+            self.lite_providers = self.load_lite_providers()
+            self.browsers = entry['browsers']
+            rebuild()
+            for browser_info in self.browsers:
+                self.lifecycle.wake(browser_info)
+            self.profile_pool.measure_switch(new_profile_name, started, warm=True)
+            return
+
+        def rebuild_cold():
+            rebuild()
+            self.profile_pool.measure_switch(new_profile_name, started, warm=False)
+
+        self.open_profile(rebuild_cold, clone_parts)
 
     def get_app_data_dir(self):
         """Get the application data directory for storing profiles and configs."""
-        return os.path.join(os.path.expanduser("~"), ".MultiVibeChat")
+        return get_app_data_dir()
 
     def get_config_path(self):
         """Get path to the config file that stores the last profile."""
-        app_data_dir = self.get_app_data_dir()
-        os.makedirs(app_data_dir, exist_ok=True)
-        return os.path.join(app_data_dir, ".multi_vibe_chat_config.json")
+        return self.config.path
 
     def load_last_profile(self):
-        """Load the last used profile from config file."""
-        try:
-            config_path = self.get_config_path()
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    return config.get('last_profile', 'default')
-        except Exception as e:
-            print(f"Error loading last profile: {e}")
-        return 'default'
+        """Load the last used profile from config."""
+        return self.config.get('last_profile', 'default')
 
     def save_last_profile(self, profile_name):
         """Save the current profile as the last used."""
-        try:
-            config_path = self.get_config_path()
-            config = {'last_profile': profile_name}
-            with open(config_path, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error saving last profile: {e}")
+        self.config.set('last_profile', profile_name)
 
     def setup_download_handling(self):
         """Set up download handling to save files to user's Downloads folder"""
@@ -1114,15 +4747,24 @@ class MultiVibeChat(QMainWindow):
         elif download.state() == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted:
             print(f"Download failed: {download.downloadFileName()}")
 
-    def handle_profile_logic(self):
+    def profile_storage_path(self, profile_name):
+        return os.path.join(self.get_app_data_dir(), f".multi_vibe_chat_profile_{profile_name}")
+
+    def open_profile(self, then, clone_parts=None):
+        """Prepare the current profile's storage, cloning it from default if new, then set it up.
+
+        Cloning runs on a worker thread with progress in the status bar; `then` is called on
+        the GUI thread once the QWebEngineProfile exists.
+        """
         # Use consistent app data directory for persistent storage
         # This ensures profiles work in both development and packaged versions
         app_data_dir = self.get_app_data_dir()
         os.makedirs(app_data_dir, exist_ok=True)
         
+        self.lite_providers = self.load_lite_providers()
         legacy_path = os.path.join(app_data_dir, ".multi_ai_browser_profile")
-        default_path = os.path.join(app_data_dir, ".multi_vibe_chat_profile_default")
-        current_path = os.path.join(app_data_dir, f".multi_vibe_chat_profile_{self.profile_name}")
+        default_path = self.profile_storage_path('default')
+        current_path = self.profile_storage_path(self.profile_name)
 
         if not os.path.exists(default_path) and os.path.exists(legacy_path):
             try:
@@ -1130,13 +4772,42 @@ class MultiVibeChat(QMainWindow):
             except Exception as e:
                 print(f"Migration failed: {e}")
 
-        if self.profile_name != 'default' and not os.path.exists(current_path):
-            if os.path.exists(default_path):
-                try:
-                    shutil.copytree(default_path, current_path)
-                except Exception as e:
-                    print(f"Cloning failed: {e}")
-        
+        if self.profile_name == 'default' or os.path.exists(current_path) or not os.path.exists(default_path):
+            self.handle_profile_logic()
+            then()
+            return
+
+        if clone_parts is None:
+            clone_parts = self.config.get('clone_parts', list(_PROFILE_CLONE_DEFAULT_PARTS))
+        profile_name = self.profile_name
+        cloner = ProfileCloner(default_path, current_path, clone_parts, self)
+        started = time.perf_counter()
+
+        def on_progress(done, total):
+            if total:
+                self.statusBar().showMessage(
+                    f"Creating profile '{profile_name}': {done * 100 // total}% "
+                    f"of {total / (1024 * 1024):.1f} MB")
+
+        def on_finished(ok, summary):
+            cloner.deleteLater()
+            if not ok:
+                print(f"Error cloning profile: {summary}")
+            debug_log(f"Profile '{profile_name}' clone: {summary} in {time.perf_counter() - started:.2f} s")
+            self.statusBar().showMessage(f"Profile '{profile_name}': {summary}", 8000)
+            if profile_name != self.profile_name:
+                # Switched away while cloning
+                return
+            self.handle_profile_logic()
+            then()
+
+        cloner.progress.connect(on_progress)
+        cloner.finished.connect(on_finished)
+        self.statusBar().showMessage(f"Creating profile '{profile_name}'...")
+        cloner.start()
+
+    def handle_profile_logic(self):
+        current_path = self.profile_storage_path(self.profile_name)
         self.profile = QWebEngineProfile(f"persistent-profile-{self.profile_name}", self)
         self.profile.setPersistentStoragePath(current_path)
         # Enable and tune disk cache for faster page loads
@@ -1152,7 +4823,10 @@ class MultiVibeChat(QMainWindow):
         self.profile.setHttpAcceptLanguage("en-US,en;q=0.9")
         
         # HTTP header interceptor
-        self.interceptor = RequestInterceptor(self.profile)
+        self.host_stats = HostStats.load(os.path.join(current_path, HostStats.FILE_NAME))
+        self.interceptor = RequestInterceptor(self.profile, blocklist=self.blocklist,
+                                              policy=self.build_interception_policy(),
+                                              host_stats=self.host_stats)
         self.profile.setUrlRequestInterceptor(self.interceptor)
         
         # Set up download handling to save files to user's Downloads folder
@@ -1202,6 +4876,408 @@ try{delete navigator.__proto__.webdriver}catch(e){}
         user_script.setRunsOnSubFrames(False)
         self.profile.scripts().insert(user_script)
 
+        # Provider runtime: parsed once per page load, each send then only passes a JSON payload
+        self.profile.scripts().insert(build_provider_runtime_script())
+
+        # Optional: keep long threads light by letting the browser skip off-screen turns
+        virtualization = self.load_virtualization_settings()
+        if virtualization['providers']:
+            self.profile.scripts().insert(build_virtualization_script(**virtualization))
+
+def load_batch_prompts(path):
+    """Prompts of a batch file: one per line, or {"prompt": ...} objects in a .jsonl file"""
+    prompts = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            prompts.append(json.loads(line)['prompt'] if path.endswith('.jsonl') else line)
+    return prompts
+
+class BatchRunner(QObject):
+    """Runs every prompt through every enabled provider pane, streaming results to JSONL.
+
+    Each provider works through the prompts in order, starting a fresh chat for each,
+    with at most `concurrency` panes busy at once. Records are flushed as they arrive,
+    so a rerun with the same output file skips everything already answered.
+    """
+    finished = pyqtSignal()
+    # Upper bound for one (prompt, provider) job on top of the runtime's own capture timeout
+    JOB_TIMEOUT_MS = _CAPTURE_TIMEOUT_MS + 60000
+
+    def __init__(self, window, prompts, out_path, concurrency=2, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.prompts = prompts
+        self.out_path = out_path
+        self.concurrency = max(1, concurrency)
+        self.queues = {}  # Provider -> prompt indices still to run
+        self.running = {}  # Provider -> job state
+        self.total = 0
+        self.completed = 0
+        window.response_tracker.responseFinished.connect(self._on_response_finished)
+        window.runtimeEventReceived.connect(self._on_runtime_event)
+
+    @staticmethod
+    def prompt_key(index, prompt):
+        return f"{index}:{hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]}"
+
+    def _answered(self):
+        """(prompt key, provider) pairs already answered in the output file"""
+        done = set()
+        try:
+            with open(self.out_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+                    if record.get('status') == 'ok':
+                        done.add((record['prompt_key'], record['provider']))
+        except FileNotFoundError:
+            pass
+        return done
+
+    def start(self):
+        if self.window.profile is None:
+            # Profile still being cloned, the panes don't exist yet
+            QTimer.singleShot(500, self.start)
+            return
+        done = self._answered()
+        for browser_info in self.window.browsers:
+            provider = browser_info['name']
+            if provider not in _PROVIDER_ADAPTERS:
+                continue
+            self.queues[provider] = deque(
+                index for index, prompt in enumerate(self.prompts)
+                if (self.prompt_key(index, prompt), provider) not in done)
+        self.total = sum(len(queue) for queue in self.queues.values())
+        print(f"Batch: {len(self.prompts)} prompts x {len(self.queues)} providers, "
+              f"{self.total} to run ({len(done)} already answered)")
+        self._pump()
+
+    def _pane(self, provider):
+        for browser_info in self.window.browsers:
+            if browser_info['name'] == provider:
+                return browser_info
+        return None
+
+    def _pump(self):
+        for provider, queue in list(self.queues.items()):
+            if len(self.running) >= self.concurrency:
+                break
+            if provider not in self.running and queue:
+                # Round robin: a provider that just got a job waits behind the others
+                self.queues[provider] = self.queues.pop(provider)
+                self._start_job(provider, queue.popleft())
+        if not self.running and not any(self.queues.values()):
+            print(f"Batch finished: {self.completed} results written to {self.out_path}")
+            self.finished.emit()
+
+    def _start_job(self, provider, index):
+        browser_info = self._pane(provider)
+        job = {'index': index, 'id': None, 'started': time.monotonic(), 'timer': QTimer(self)}
+        self.running[provider] = job
+        job['timer'].setSingleShot(True)
+        job['timer'].timeout.connect(lambda: self._finish(provider, job, '', 'error', 'job_timeout'))
+        job['timer'].start(self.JOB_TIMEOUT_MS)
+        page = browser_info['browser'].page()
+
+        # Fresh chat for every prompt so answers don't depend on earlier ones
+        def on_loaded(ok):
+            page.loadFinished.disconnect(on_loaded)
+            if self.running.get(provider) is not job:
+                return
+            if not ok:
+                self._finish(provider, job, '', 'error', 'load_failed')
+                return
+            job['id'] = self.window.send_prompt(browser_info, self.prompts[index])
+
+        def load_fresh_chat():
+            if self.running.get(provider) is not job:
+                return
+            page.loadFinished.connect(on_loaded)
+            browser_info['browser'].load(QUrl(self.window.targets[provider]))
+
+        def after_pending_load(ok):
+            page.loadFinished.disconnect(after_pending_load)
+            self.window.lifecycle.wake(browser_info, load_fresh_chat)
+
+        # The pane's initial load must not race ours: a queued one is dropped, one in flight
+        # is waited for - loading over it would abort it and its loadFinished(False) would
+        # read as this job's failure. A discarded pane is woken (reloaded) first likewise.
+        self.window.pane_loader.cancel(browser_info)
+        if browser_info.get('loading'):
+            page.loadFinished.connect(after_pending_load)
+        else:
+            self.window.lifecycle.wake(browser_info, load_fresh_chat)
+
+    def _on_runtime_event(self, provider, event):
+        job = self.running.get(provider)
+        if (job and event.get('id') == job['id'] and event.get('type') == 'send_outcome'
+                and event['outcome'] not in ('clicked', 'enter_fallback')):
+            self._finish(provider, job, '', 'error', event['outcome'])
+
+    def _on_response_finished(self, provider, text, metrics):
+        job = self.running.get(provider)
+        if job and metrics.get('broadcast_id') == job['id']:
+            status = 'ok' if text else 'error'
+            self._finish(provider, job, text, status, metrics.get('reason'), metrics)
+
+    def _finish(self, provider, job, text, status, reason, metrics=None):
+        if self.running.get(provider) is not job:
+            return
+        del self.running[provider]
+        job['timer'].stop()
+        job['timer'].deleteLater()
+        prompt = self.prompts[job['index']]
+        record = {
+            'prompt_key': self.prompt_key(job['index'], prompt),
+            'prompt_index': job['index'],
+            'prompt': prompt,
+            'provider': provider,
+            'status': status,
+            'reason': reason,
+            'text': text,
+            'metrics': metrics,
+            'elapsed_s': round(time.monotonic() - job['started'], 3),
+            'timestamp': time.time(),
+        }
+        try:
+            with open(self.out_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error writing batch result: {e}")
+        self.completed += 1
+        print(f"[{self.completed}/{self.total}] {provider} #{job['index']}: {status}"
+              f"{f' ({reason})' if status != 'ok' else ''} in {record['elapsed_s']:.1f} s")
+        # Let the page settle before reusing the pane
+        QTimer.singleShot(0, self._pump)
+
+# Local socket name prefix of the orchestrator controller, suffixed with its pid
+_ORCHESTRATOR_SERVER = "multi-vibe-chat-orchestrator"
+
+def worker_command(server_name, profile_name, headless=False):
+    """Command line that starts a worker process for one profile"""
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, os.path.abspath(__file__)]
+    command += ['--worker', server_name, '--profile', profile_name]
+    if headless:
+        command.append('--headless')
+    return command
+
+class MessageChannel(QObject):
+    """Newline-delimited JSON messages over a QLocalSocket"""
+    messageReceived = pyqtSignal(dict)
+    disconnected = pyqtSignal()
+
+    def __init__(self, socket, parent=None):
+        super().__init__(parent)
+        self.socket = socket
+        self._buffer = b""
+        socket.readyRead.connect(self._read)
+        socket.disconnected.connect(self.disconnected)
+
+    def send(self, message):
+        if self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState:
+            self.socket.write((json.dumps(message) + "\n").encode('utf-8'))
+
+    def _read(self):
+        self._buffer += bytes(self.socket.readAll())
+        while b"\n" in self._buffer:
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            try:
+                self.messageReceived.emit(json.loads(line))
+            except ValueError as e:
+                print(f"Error decoding orchestrator message: {e}")
+
+class Orchestrator(QObject):
+    """Runs one worker process per profile and fans prompts out to them over local IPC.
+
+    Each worker hosts its own MultiVibeChat (own GIL, own WebEngine), so page bridging,
+    interception and GUI work of different accounts run in parallel. Responses come back
+    as they finish and are appended to a JSONL results file.
+    """
+    workersChanged = pyqtSignal()
+    resultReceived = pyqtSignal(dict)
+
+    def __init__(self, profiles, headless=False, results_path=None, parent=None):
+        super().__init__(parent)
+        self.profiles = profiles
+        self.headless = headless
+        self.results_path = results_path
+        self.server_name = f"{_ORCHESTRATOR_SERVER}-{os.getpid()}"
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.processes = {}  # Profile name -> Popen
+        self.workers = {}  # Profile name -> MessageChannel, once the worker said hello
+        self.jobs = {}  # Job id -> {'text', 'started', 'results'}
+        self._job_seq = 0
+
+    def start(self):
+        QLocalServer.removeServer(self.server_name)
+        if not self.server.listen(self.server_name):
+            raise RuntimeError(f"Cannot listen on {self.server_name}: {self.server.errorString()}")
+        for profile_name in self.profiles:
+            command = worker_command(self.server_name, profile_name, self.headless)
+            debug_log(f"Starting worker: {command}")
+            self.processes[profile_name] = subprocess.Popen(command)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            channel = MessageChannel(socket, self)
+            channel.messageReceived.connect(lambda message, c=channel: self._on_message(c, message))
+            channel.disconnected.connect(lambda c=channel: self._on_disconnected(c))
+
+    def _on_message(self, channel, message):
+        kind = message.get('type')
+        if kind == 'hello':
+            self.workers[message['profile']] = channel
+            debug_log(f"Worker {message['profile']} connected (pid {message.get('pid')})")
+            self.workersChanged.emit()
+        elif kind == 'response':
+            job = self.jobs.get(message.get('job'))
+            if job is None:
+                return
+            message['elapsed_s'] = round(time.perf_counter() - job['started'], 3)
+            job['results'].append(message)
+            if self.results_path:
+                try:
+                    with open(self.results_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps({**message, 'prompt': job['text'], 'timestamp': time.time()}) + "\n")
+                except OSError as e:
+                    print(f"Error saving orchestrator results: {e}")
+            self.resultReceived.emit(message)
+
+    def _on_disconnected(self, channel):
+        for profile_name, worker in list(self.workers.items()):
+            if worker is channel:
+                del self.workers[profile_name]
+                debug_log(f"Worker {profile_name} disconnected")
+        channel.deleteLater()
+        self.workersChanged.emit()
+
+    def broadcast(self, text):
+        """Send a prompt to every connected worker, returning the job id"""
+        self._job_seq += 1
+        self.jobs[self._job_seq] = {'text': text, 'started': time.perf_counter(), 'results': []}
+        for channel in self.workers.values():
+            channel.send({'type': 'broadcast', 'job': self._job_seq, 'text': text})
+        return self._job_seq
+
+    def shutdown(self):
+        for channel in self.workers.values():
+            channel.send({'type': 'quit'})
+            channel.socket.flush()
+        for profile_name, process in self.processes.items():
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                debug_log(f"Worker {profile_name} did not exit, terminating")
+                process.terminate()
+        self.server.close()
+
+class OrchestratorWorker(QObject):
+    """Worker side of the orchestrator: relays prompts into a window and responses back"""
+
+    def __init__(self, window, server_name, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.jobs = {}  # Broadcast id -> controller job id
+        socket = QLocalSocket(self)
+        self.channel = MessageChannel(socket, self)
+        self.channel.messageReceived.connect(self._on_message)
+        # The controller going away ends the worker
+        self.channel.disconnected.connect(QApplication.instance().quit)
+        socket.connected.connect(lambda: self.channel.send(
+            {'type': 'hello', 'profile': window.profile_name, 'pid': os.getpid()}))
+        window.response_tracker.responseFinished.connect(self._on_response_finished)
+        socket.connectToServer(server_name)
+
+    def _on_message(self, message):
+        kind = message.get('type')
+        if kind == 'broadcast':
+            broadcast_id = self.window.broadcast_text(message['text'])
+            self.jobs[broadcast_id] = message['job']
+        elif kind == 'quit':
+            QApplication.instance().quit()
+
+    def _on_response_finished(self, provider, text, metrics):
+        job = self.jobs.get(metrics.get('broadcast_id'))
+        if job is None:
+            return  # Prompt typed into the worker window itself
+        self.channel.send({'type': 'response', 'job': job, 'profile': self.window.profile_name,
+                           'provider': provider, 'text': text, 'metrics': metrics})
+
+class OrchestratorWindow(QMainWindow):
+    """Controller window: one prompt box for every worker profile, results as they arrive"""
+
+    def __init__(self, orchestrator):
+        super().__init__()
+        self.orchestrator = orchestrator
+        self.setWindowTitle(f"Multi Vibe Chat - Orchestrator ({', '.join(orchestrator.profiles)})")
+        self.setGeometry(100, 100, 900, 700)
+
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        self.workers_label = QLabel()
+        layout.addWidget(self.workers_label)
+        self.results_view = QTextEdit()
+        self.results_view.setReadOnly(True)
+        layout.addWidget(self.results_view, 1)
+
+        prompt_layout = QHBoxLayout()
+        self.prompt_text = PromptTextEdit()
+        self.prompt_text.setPlaceholderText("Enter prompt for all profiles (Ctrl+Enter to send)...")
+        self.prompt_text.setFixedHeight(int(self.prompt_text.fontMetrics().height() * 2.5) + 6)
+        # Same prompt history as the regular window
+        self.prompt_history = PromptHistory(os.path.join(get_app_data_dir(), PromptHistory.FILE_NAME), parent=self)
+        self.prompt_text.history = self.prompt_history
+        QTimer.singleShot(1000, self.prompt_history.load_async)
+        send_btn = QPushButton("Send to All Profiles")
+        prompt_layout.addWidget(self.prompt_text, 1)
+        prompt_layout.addWidget(send_btn)
+        layout.addLayout(prompt_layout)
+        self.setCentralWidget(container)
+
+        send_btn.clicked.connect(self.broadcast_prompts)
+        self.prompt_text.ctrlEnterPressed.connect(self.broadcast_prompts)
+        orchestrator.workersChanged.connect(self.update_workers_label)
+        orchestrator.resultReceived.connect(self.show_result)
+        self.update_workers_label()
+
+    def update_workers_label(self):
+        connected = [name for name in self.orchestrator.profiles if name in self.orchestrator.workers]
+        self.workers_label.setText(f"Workers: {len(connected)}/{len(self.orchestrator.profiles)} connected"
+                                   + (f" ({', '.join(connected)})" if connected else ""))
+
+    def broadcast_prompts(self):
+        prompt = self.prompt_text.toPlainText().strip()
+        if not prompt or not self.orchestrator.workers:
+            return
+        self.prompt_history.add(prompt)
+        job = self.orchestrator.broadcast(prompt)
+        self.results_view.append(f"<b>#{job}</b> sent to {len(self.orchestrator.workers)} profiles")
+        self.prompt_text.clear()
+
+    def show_result(self, message):
+        metrics = message.get('metrics', {})
+        ttft = metrics.get('ttft_s')
+        preview = message['text'][:300].replace('\n', ' ')
+        self.results_view.append(
+            f"#{message['job']} {message['profile']} / {message['provider']} "
+            f"({message['elapsed_s']:.1f} s, TTFT {ttft if ttft is not None else '-'} s): {preview}")
+
+    def closeEvent(self, event):
+        self.orchestrator.shutdown()
+        super().closeEvent(event)
+
 def debug_log(message):
     """Write debug messages to a log file in user's home directory"""
     try:
@@ -1223,35 +5299,49 @@ def main():
     
     parser = argparse.ArgumentParser(description="Multi Vibe Chat")
     parser.add_argument('--profile', type=str, default=None, help='Profile name to use.')
+    parser.add_argument('--orchestrate', type=str, default=None, metavar='PROFILES',
+                        help='Comma-separated profiles to run as worker processes behind one controller.')
+    parser.add_argument('--headless', action='store_true',
+                        help='Render offscreen (with --orchestrate: applies to the workers).')
+    parser.add_argument('--trace-startup', action='store_true',
+                        help='Print startup phase timings and append them to startup_trace.jsonl.')
+    parser.add_argument('--worker', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--batch', type=str, default=None, metavar='PROMPTS',
+                        help='Run each prompt of a file through all enabled AIs offscreen, then exit.')
+    parser.add_argument('--out', type=str, default='results.jsonl',
+                        help='Batch results file; rerunning with the same file resumes the batch.')
+    parser.add_argument('--concurrency', type=int, default=2, help='Batch: panes working at the same time.')
     args = parser.parse_args()
     
     debug_log(f"Parsed args.profile: {args.profile}")
+
+    if args.batch or (args.headless and not args.orchestrate):
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
     
     app = QApplication(sys.argv)
+    startup_trace.echo = args.trace_startup
+    startup_trace.mark('qapplication')
+
+    if args.orchestrate:
+        profiles = [name.strip() for name in args.orchestrate.split(',') if name.strip()]
+        orchestrator = Orchestrator(profiles, headless=args.headless,
+                                    results_path=os.path.join(get_app_data_dir(), "orchestrator_results.jsonl"))
+        orchestrator.start()
+        controller = OrchestratorWindow(orchestrator)
+        controller.show()
+        sys.exit(app.exec())
     
+    # Config is read once here and shared with the window. Orchestrator workers share the
+    # file with each other and the user's own windows, so they never write it back
+    # (last writer would win, e.g. over pane_usage and last_focused_provider)
+    config = ConfigService.load_default(read_only=bool(args.worker))
+    debug_log(f"Config path: {config.path}")
+    startup_trace.mark('config_loaded')
+
     # If no profile specified via command line, load the last used profile
     if args.profile is None:
-        # Get app data directory consistently
-        if hasattr(sys, '_MEIPASS'):
-            # Running from PyInstaller bundle
-            app_data_dir = os.path.join(os.path.expanduser("~"), ".MultiVibeChat")
-        else:
-            # Running from source - keep data in script directory
-            app_data_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        os.makedirs(app_data_dir, exist_ok=True)
-        config_path = os.path.join(app_data_dir, ".multi_vibe_chat_config.json")
-        debug_log(f"Config path: {config_path}")
-        profile_name = 'default'
-        try:
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    profile_name = config.get('last_profile', 'default')
-                    debug_log(f"Loaded profile from config: {profile_name}")
-        except Exception as e:
-            debug_log(f"Error loading last profile: {e}")
-            print(f"Error loading last profile: {e}")
+        profile_name = config.get('last_profile', 'default')
+        debug_log(f"Loaded profile from config: {profile_name}")
     else:
         profile_name = args.profile
         debug_log(f"Using profile from args: {profile_name}")
@@ -1259,10 +5349,23 @@ def main():
     debug_log(f"Final profile_name: {profile_name}")
     
     try:
-        browser_app = MultiVibeChat(profile_name=profile_name)
-        # Save this profile as the last used
-        browser_app.save_last_profile(profile_name)
+        browser_app = MultiVibeChat(profile_name=profile_name, config=config)
+        startup_trace.mark('window_created')
+        if args.batch:
+            prompts = load_batch_prompts(args.batch)
+            runner = BatchRunner(browser_app, prompts, args.out, args.concurrency, browser_app)
+            runner.finished.connect(app.quit)
+            browser_app.show()
+            runner.start()
+            sys.exit(app.exec())
+        if args.worker:
+            # Workers take prompts from the controller and leave the last used profile alone
+            browser_app.orchestrator_worker = OrchestratorWorker(browser_app, args.worker, browser_app)
+        else:
+            # Save this profile as the last used
+            browser_app.save_last_profile(profile_name)
         browser_app.show()
+        startup_trace.mark('window_shown')
         debug_log("App window shown successfully")
         sys.exit(app.exec())
     except Exception as e:
@@ -0,0 +1,402 @@
+# End-to-end performance suite: runs the real app offscreen against the local mock
+# providers (benchmarks/mock_providers.py) with all other network access blocked.
+#
+# Measures per scenario, each in a fresh process with a throwaway home directory:
+#   startup    cold start (import, window, first/all panes loaded), pane load times,
+#              renderer RSS for 1..N panes
+#   broadcast  broadcast-to-submit latency per pane, first token, capture done, and
+#              streaming capture overhead (page event-loop lag with vs. without capture)
+#   large      1 KB to 1 MB prompts: insert time and strategy per pane, submit latency
+#              and whether the page received the whole prompt, with the large-prompt
+#              strategies on and off
+#   dom        long threads (hundreds of turns): forced-layout cost, keystroke cost and
+#              scroll frame times per pane, with DOM virtualization of old turns on and off
+#
+# Usage:
+#   python benchmarks/bench_e2e.py                      # everything, table output
+#   python benchmarks/bench_e2e.py --json e2e.json      # also save raw results for CI diffs
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+from time import perf_counter, sleep
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from mock_providers import MockProviderServer, PROVIDER_PAGES
+
+PROVIDERS = list(PROVIDER_PAGES)
+# Chromium resolves nothing but the mock server, so a run can't touch the network
+NO_NETWORK_FLAGS = ' --host-resolver-rules="MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"'
+SCENARIO_TIMEOUT_S = 180
+
+
+# --- child side: one scenario in a fresh process ----------------------------------------
+
+def child_setup(args):
+    """Import the app into a throwaway home and build a window on the mock providers"""
+    started = perf_counter()
+    os.environ['HOME'] = os.environ['USERPROFILE'] = args.home
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import MVC3
+    imported = perf_counter()
+    if args.large_threshold:
+        MVC3._LARGE_PROMPT_CHARS = args.large_threshold
+    os.environ['QTWEBENGINE_CHROME_FLAGS'] += NO_NETWORK_FLAGS
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+
+    config = MVC3.ConfigService(os.path.join(args.home, "bench_config.json"))
+    config.set('enabled_ais', PROVIDERS[:args.panes])
+    config.set('target_urls', json.loads(args.targets))
+    if args.no_virtualize:
+        config.set('dom_virtualization', {'providers': []})
+    window = MVC3.MultiVibeChat(profile_name='default', config=config)
+    window.show()
+    timings = {'import_s': imported - started, 'window_s': perf_counter() - started}
+    return MVC3, app, window, started, timings
+
+
+def wait_until(app, predicate, timeout_s):
+    deadline = perf_counter() + timeout_s
+    while not predicate():
+        if perf_counter() > deadline:
+            return False
+        app.processEvents()
+        sleep(0.002)
+    return True
+
+
+def wait_loaded(app, window, started, timeout_s=60):
+    # Panes are created after the window's first paint
+    wait_until(app, lambda: len(window.browsers) == len(window.targets), timeout_s)
+    loaded = {}
+    for info in window.browsers:
+        info['browser'].page().loadFinished.connect(
+            lambda ok, name=info['name']: loaded.setdefault(name, perf_counter() - started))
+    wait_until(app, lambda: len(loaded) == len(window.browsers), timeout_s)
+    return loaded
+
+
+def page_stats(app, pages):
+    """window.__mockStats of every mock page, by provider"""
+    stats = {}
+    for name, page in pages.items():
+        page.runJavaScript("window.__mockStats", 0, lambda value, n=name: stats.__setitem__(n, value))
+    wait_until(app, lambda: len(stats) == len(pages), 10)
+    return stats
+
+
+def renderer_rss_mb(MVC3, window):
+    pids = {info['browser'].page().renderProcessPid() for info in window.browsers}
+    renderers = sum(MVC3.process_rss_bytes(pid) or 0 for pid in pids if pid)
+    own = MVC3.process_rss_bytes(os.getpid()) or 0
+    return renderers / 2 ** 20, own / 2 ** 20
+
+
+def scenario_startup(args):
+    MVC3, app, window, started, result = child_setup(args)
+    loaded = wait_loaded(app, window, started)
+    result['pane_load_s'] = loaded
+    result['first_load_s'] = min(loaded.values()) if loaded else None
+    result['all_loaded_s'] = max(loaded.values()) if loaded else None
+    # Let renderers settle before sampling memory
+    wait_until(app, lambda: perf_counter() - started > result['all_loaded_s'] + 1.0, 2.0)
+    result['renderer_rss_mb'], result['app_rss_mb'] = renderer_rss_mb(MVC3, window)
+    result['panes'] = len(window.browsers)
+    result['startup_phases_ms'] = {phase: round(at * 1000, 1) for phase, at in MVC3.startup_trace.phases}
+    return result
+
+
+def scenario_broadcast(args):
+    MVC3, app, window, started, result = child_setup(args)
+    wait_loaded(app, window, started)
+    pages = {info['name']: info['browser'].page() for info in window.browsers}
+    events = []
+    window.runtimeEventReceived.connect(lambda name, event: events.append((perf_counter(), name, event)))
+    finished = []
+    window.response_tracker.responseFinished.connect(lambda name, text, metrics: finished.append(name))
+    prompt = "Summarise the benchmark results. " * (args.prompt_chars // 34 + 1)
+    prompt = prompt[:args.prompt_chars]
+
+    rounds = []
+    for _ in range(args.rounds):
+        events.clear()
+        finished.clear()
+        sent_at = perf_counter()
+        broadcast_id = window.broadcast_text(prompt)
+        wait_until(app, lambda: len(finished) == len(pages), 120)
+        round_result = {}
+        for at, name, event in events:
+            if event.get('id') != broadcast_id:
+                continue
+            pane = round_result.setdefault(name, {'chunks': 0})
+            ms = round((at - sent_at) * 1000, 1)
+            if event['type'] == 'send_outcome':
+                pane['submit_ms'] = ms
+                pane['outcome'] = event['outcome']
+            elif event['type'] == 'response_chunk':
+                pane.setdefault('first_token_ms', ms)
+                pane['chunks'] += 1
+            elif event['type'] == 'response_done':
+                pane['done_ms'] = ms
+        for name, stats in page_stats(app, pages).items():
+            round_result.setdefault(name, {})['page'] = stats
+        rounds.append(round_result)
+
+    # Same responses streamed by the pages alone, no runtime capture attached
+    baseline = []
+    for _ in range(args.rounds):
+        before = {name: (stats or {}).get('streams', 0) for name, stats in page_stats(app, pages).items()}
+        for page in pages.values():
+            page.runJavaScript(f"window.__mockStream({json.dumps(prompt)}); 0", 0)
+        deadline = perf_counter() + 60
+        while perf_counter() < deadline:
+            stats = page_stats(app, pages)
+            if all((s or {}).get('streams', 0) > before[n] for n, s in stats.items()):
+                break
+        baseline.append(stats)
+    result['rounds'] = rounds
+    result['baseline'] = baseline
+    return result
+
+
+def make_large_prompt(size):
+    """Source-file-like text full of characters the old template escaping mangled"""
+    line = "    html = f'<p class=\"x\">{a}</p>'  # `tick` \\back\\slash, don't <b>break</b>\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def scenario_large(args):
+    MVC3, app, window, started, result = child_setup(args)
+    wait_loaded(app, window, started)
+    pages = {info['name']: info['browser'].page() for info in window.browsers}
+    events = []
+    window.runtimeEventReceived.connect(lambda name, event: events.append((perf_counter(), name, event)))
+    done = set()
+    window.response_tracker.responseFinished.connect(lambda name, text, metrics: done.add(name))
+
+    def on_event(name, event):
+        # Panes that never submitted won't answer either
+        if event.get('type') == 'send_outcome' and event['outcome'] not in ('clicked', 'enter_fallback'):
+            done.add(name)
+    window.runtimeEventReceived.connect(on_event)
+
+    result['threshold'] = MVC3._LARGE_PROMPT_CHARS
+    result['sizes'] = {}
+    for size in args.large_sizes:
+        prompt = make_large_prompt(size)
+        expected = len("".join(prompt.split()))
+        events.clear()
+        done.clear()
+        sent_at = perf_counter()
+        broadcast_id = window.broadcast_text(prompt)
+        wait_until(app, lambda: len(done) == len(pages), 120)
+        panes = {}
+        for at, name, event in events:
+            if event.get('id') != broadcast_id:
+                continue
+            pane = panes.setdefault(name, {})
+            ms = round((at - sent_at) * 1000, 1)
+            if event['type'] == 'input_accepted':
+                pane['input_ms'] = ms
+                pane['runtime_input_ms'] = event.get('elapsed_ms')
+                pane['strategy'] = event.get('strategy')
+            elif event['type'] == 'send_outcome':
+                pane['submit_ms'] = ms
+                pane['outcome'] = event['outcome']
+        for name, stats in page_stats(app, pages).items():
+            received = (stats or {}).get('prompt_nonspace')
+            panes.setdefault(name, {})['delivered'] = round(received / expected, 4) if received is not None else None
+        result['sizes'][str(size)] = panes
+    return result
+
+
+def scenario_dom(args):
+    MVC3, app, window, started, result = child_setup(args)
+    wait_loaded(app, window, started)
+    pages = {info['name']: info['browser'].page() for info in window.browsers}
+    for page in pages.values():
+        page.runJavaScript(f"window.__mockFill({args.dom_turns}, {args.dom_chars}); 0", 0)
+    # Give the virtualization pass (debounced after DOM mutations) time to tag old turns
+    wait_until(app, lambda: False, 2)
+    result['virtualized'] = {}
+    for name, page in pages.items():
+        page.runJavaScript("document.querySelectorAll('[data-mvc-virtual]').length", 0,
+                           lambda value, n=name: result['virtualized'].__setitem__(n, value))
+    result['panes'] = {}
+    # One pane at a time, so renderers don't compete for the CPU while measured
+    for name, page in pages.items():
+        page.runJavaScript("window.__mockMeasure(); 0", 0)
+        measured = {}
+        wait_until(app, lambda: measured or page.runJavaScript(
+            "window.__mockMeasureResult", 0, lambda value: value and measured.update(value)) or False, 60)
+        result['panes'][name] = measured
+    return result
+
+
+SCENARIOS = {'startup': scenario_startup, 'broadcast': scenario_broadcast, 'large': scenario_large,
+             'dom': scenario_dom}
+
+
+def run_child(args):
+    result = SCENARIOS[args.child](args)
+    print("RESULT " + json.dumps(result))
+    sys.stdout.flush()
+    os._exit(0)  # Skip WebEngine teardown, it isn't what we measure
+
+
+# --- parent side: mock server, scenario processes, report -------------------------------
+
+def run_scenario(name, server, panes, args, extra=(), timeout_s=SCENARIO_TIMEOUT_S):
+    with tempfile.TemporaryDirectory() as home:
+        command = [sys.executable, os.path.abspath(__file__), '--child', name, '--home', home,
+                   '--panes', str(panes), '--targets', json.dumps(server.target_urls()),
+                   '--rounds', str(args.rounds), '--prompt-chars', str(args.prompt_chars),
+                   '--large-sizes', *map(str, args.large_sizes),
+                   '--dom-turns', str(args.dom_turns), '--dom-chars', str(args.dom_chars), *extra]
+        started = perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout_s)
+        wall_s = perf_counter() - started
+    for line in completed.stdout.splitlines():
+        if line.startswith("RESULT "):
+            result = json.loads(line[len("RESULT "):])
+            result['process_wall_s'] = wall_s
+            return result
+    raise RuntimeError(f"{name} with {panes} panes failed:\n{completed.stderr[-2000:]}")
+
+
+def mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else float('nan')
+
+
+def report_startup(results):
+    print(f"{'panes':>5} {'import s':>9} {'window s':>9} {'first s':>8} {'all s':>7} "
+          f"{'renderer MB':>12} {'MB/pane':>8} {'app MB':>7}")
+    for result in results:
+        panes = result['panes'] or 1
+        print(f"{result['panes']:>5} {result['import_s']:>9.2f} {result['window_s']:>9.2f} "
+              f"{result['first_load_s'] or 0:>8.2f} {result['all_loaded_s'] or 0:>7.2f} "
+              f"{result['renderer_rss_mb']:>12.0f} {result['renderer_rss_mb'] / panes:>8.0f} {result['app_rss_mb']:>7.0f}")
+    full = results[-1]
+    print("pane load (s, all panes): " + ", ".join(f"{name} {s:.2f}" for name, s in full['pane_load_s'].items()))
+
+
+def report_broadcast(result):
+    print(f"{'provider':<10} {'submit ms':>10} {'1st token':>10} {'done ms':>9} {'chunks':>7} "
+          f"{'lag p95':>8} {'base p95':>9} {'stream ms':>10} {'base ms':>8}")
+    for name in PROVIDERS:
+        rounds = [r.get(name, {}) for r in result['rounds']]
+        if not any(rounds):
+            continue
+        base = [b.get(name) or {} for b in result['baseline']]
+        pages = [r.get('page') or {} for r in rounds]
+        print(f"{name:<10} {mean(r.get('submit_ms') for r in rounds):>10.1f} "
+              f"{mean(r.get('first_token_ms') for r in rounds):>10.1f} {mean(r.get('done_ms') for r in rounds):>9.0f} "
+              f"{mean(r.get('chunks') for r in rounds):>7.0f} "
+              f"{mean(p.get('lag_p95_ms') for p in pages):>8.1f} {mean(b.get('lag_p95_ms') for b in base):>9.1f} "
+              f"{mean(p.get('stream_ms') for p in pages):>10.0f} {mean(b.get('stream_ms') for b in base):>8.0f}")
+    print("lag = page event-loop lag while streaming with capture, base = same stream without capture")
+
+
+def report_large(results):
+    large, legacy = results['large'], results['legacy']
+    print(f"{'size':>8} {'provider':<10} {'strategy':<14} {'insert ms':>10} {'old ms':>7} "
+          f"{'submit ms':>10} {'old ms':>7} {'delivered':>10} {'old':>6}")
+    for size, panes in large['sizes'].items():
+        for name in PROVIDERS:
+            if name not in panes:
+                continue
+            new, old = panes[name], legacy['sizes'].get(size, {}).get(name, {})
+            print(f"{int(size):>8} {name:<10} {new.get('strategy') or '-':<14} "
+                  f"{new.get('runtime_input_ms') or float('nan'):>10.0f} {old.get('runtime_input_ms') or float('nan'):>7.0f} "
+                  f"{new.get('submit_ms') or float('nan'):>10.0f} {old.get('submit_ms') or float('nan'):>7.0f} "
+                  f"{(new.get('delivered') or 0):>10.1%} {(old.get('delivered') or 0):>6.1%}")
+    print(f"large-prompt strategies from {large['threshold']:,} chars; old = paragraph/execCommand inserts at every size")
+
+
+def report_dom(results):
+    on, off = results['on'], results['off']
+    print(f"{'provider':<10} {'virtual':>8} {'layout ms':>10} {'off ms':>7} {'type ms':>8} {'off ms':>7} "
+          f"{'frame p95':>10} {'off p95':>8} {'frame max':>10} {'off max':>8}")
+    for name in PROVIDERS:
+        if name not in on['panes']:
+            continue
+        new, old = on['panes'][name] or {}, off['panes'].get(name) or {}
+        nan = float('nan')
+        print(f"{name:<10} {on['virtualized'].get(name) or 0:>8} "
+              f"{new.get('layout_ms', nan):>10.2f} {old.get('layout_ms', nan):>7.2f} "
+              f"{new.get('type_ms', nan):>8.2f} {old.get('type_ms', nan):>7.2f} "
+              f"{new.get('frame_p95_ms', nan):>10.1f} {old.get('frame_p95_ms', nan):>8.1f} "
+              f"{new.get('frame_max_ms', nan):>10.1f} {old.get('frame_max_ms', nan):>8.1f}")
+    print("virtual = turns skipped while off-screen; off = same page without DOM virtualization")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen end-to-end benchmarks against mock providers")
+    parser.add_argument('--panes', type=int, default=len(PROVIDERS), help='Largest pane count to measure')
+    parser.add_argument('--rounds', type=int, default=3, help='Broadcast rounds')
+    parser.add_argument('--prompt-chars', type=int, default=500)
+    parser.add_argument('--chars', type=int, default=2000, help='Mock response size')
+    parser.add_argument('--cps', type=int, default=2000, help='Mock streaming speed, chars/s')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--large-sizes', type=int, nargs='+',
+                        default=[1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024],
+                        help='Prompt sizes for the large scenario')
+    parser.add_argument('--dom-turns', type=int, default=400, help='Conversation turns for the dom scenario')
+    parser.add_argument('--dom-chars', type=int, default=3000, help='Characters per turn for the dom scenario')
+    parser.add_argument('--json', type=str, default=None, help='Write raw results here')
+    # Internal: run one scenario in this process
+    parser.add_argument('--child', choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    parser.add_argument('--home', help=argparse.SUPPRESS)
+    parser.add_argument('--targets', help=argparse.SUPPRESS)
+    parser.add_argument('--large-threshold', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--no-virtualize', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    server = MockProviderServer(chars=args.chars, cps=args.cps).start()
+    results = {}
+    try:
+        if 'startup' in args.scenarios:
+            print("Cold start, pane load and memory by pane count:")
+            results['startup'] = [run_scenario('startup', server, n, args) for n in range(1, args.panes + 1)]
+            report_startup(results['startup'])
+        if 'broadcast' in args.scenarios:
+            print(f"\nBroadcast of a {args.prompt_chars}-char prompt to {args.panes} panes, {args.rounds} rounds:")
+            results['broadcast'] = run_scenario('broadcast', server, args.panes, args)
+            report_broadcast(results['broadcast'])
+        if 'large' in args.scenarios:
+            print(f"\nLarge prompts to {args.panes} panes:")
+            results['large'] = {
+                'large': run_scenario('large', server, args.panes, args, timeout_s=600),
+                # Same run with the large-prompt strategies out of reach
+                'legacy': run_scenario('large', server, args.panes, args,
+                                       extra=['--large-threshold', str(2 ** 40)], timeout_s=600),
+            }
+            report_large(results['large'])
+        if 'dom' in args.scenarios:
+            print(f"\nLong threads, {args.dom_turns} turns of {args.dom_chars} chars in {args.panes} panes:")
+            results['dom'] = {
+                'on': run_scenario('dom', server, args.panes, args),
+                'off': run_scenario('dom', server, args.panes, args, extra=['--no-virtualize']),
+            }
+            report_dom(results['dom'])
+    finally:
+        server.stop()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
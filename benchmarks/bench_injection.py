@@ -0,0 +1,189 @@
+# Micro-benchmark: legacy per-send template formatting vs. preinstalled provider runtime
+#
+# Usage:
+#   python benchmarks/bench_injection.py               # Python-side payload building only
+#   python benchmarks/bench_injection.py --webengine   # also time runJavaScript round trips offscreen
+
+import os
+import sys
+import json
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MVC3
+
+# Snapshot of the templates MultiVibeChat used to format and ship on every send
+LEGACY_TEMPLATES = {
+    'ChatGPT': """var input = document.querySelector('div#prompt-textarea[contenteditable="true"]'); if (input) {{ input.innerHTML = '<p>{prompt}</p>'; input.dispatchEvent(new Event('input', {{ bubbles: true }})); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[data-testid="send-button"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
+    'Claude': """var input = document.querySelector('div.ProseMirror[contenteditable="true"]'); if (input) {{ input.innerHTML = '<p>{prompt}</p>'; input.dispatchEvent(new Event('input', {{ bubbles: true }})); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[aria-label="Send message"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
+    'Grok': """var input = document.querySelector('textarea[placeholder="Ask anything"]'); if (input) {{ input.focus(); document.execCommand('insertText', false, `{prompt}`); let attempts = 0; const interval = setInterval(() => {{ const btn = document.querySelector('button[aria-label="Grok something"]'); if ((btn && !btn.disabled) || attempts > 30) {{ if (btn && !btn.disabled) btn.click(); clearInterval(interval); }} attempts++; }}, 100); }}""",
+    'AI Studio': """
+            var input = document.querySelector('ms-autosize-textarea textarea') ||
+                       document.querySelector('textarea[placeholder*="Type something"]') ||
+                       document.querySelector('textarea[aria-label*="prompt"]') ||
+                       document.querySelector('.text-input-field textarea') ||
+                       document.querySelector('textarea');
+            if (input) {{
+                input.focus();
+                input.value = `{prompt}`;
+                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
+                input.dispatchEvent(new Event('change', {{ bubbles: true }}));
+                let attempts = 0;
+                const interval = setInterval(() => {{
+                    var btn = document.querySelector('ms-run-button button') ||
+                             document.querySelector('button[aria-label*="Run"]') ||
+                             document.querySelector('button[aria-label*="Send"]') ||
+                             document.querySelector('.run-button button') ||
+                             document.querySelector('button.send-button');
+                    if (btn && !btn.disabled) {{
+                        btn.click();
+                        clearInterval(interval);
+                    }} else if (attempts > 20) {{
+                        input.dispatchEvent(new KeyboardEvent('keydown', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
+                        input.dispatchEvent(new KeyboardEvent('keypress', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
+                        input.dispatchEvent(new KeyboardEvent('keyup', {{ key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true }}));
+                        clearInterval(interval);
+                    }}
+                    attempts++;
+                }}, 100);
+            }}
+            """,
+    'Kimi K2': """
+            var input = document.querySelector('#chat-container > div.layout-content-main > div > div.chat-editor > div.chat-input > div.chat-input-editor-container > div.chat-input-editor') ||
+                       document.querySelector('div.chat-input-editor[contenteditable="true"]') ||
+                       document.querySelector('div[data-lexical-editor="true"]') ||
+                       document.querySelector('.chat-input-editor');
+            if (input) {{
+                input.focus();
+                var sel = window.getSelection();
+                var range = document.createRange();
+                range.selectNodeContents(input);
+                sel.removeAllRanges();
+                sel.addRange(range);
+                document.execCommand('insertText', false, `{prompt}`);
+                let attempts = 0;
+                const interval = setInterval(() => {{
+                    var btn = document.querySelector('.send-button-container:not(.disabled)');
+                    if (btn && !btn.classList.contains('disabled')) {{
+                        btn.click();
+                        clearInterval(interval);
+                    }} else if (attempts > 30) {{
+                        clearInterval(interval);
+                    }}
+                    attempts++;
+                }}, 100);
+            }}
+            """,
+}
+
+PROVIDERS = list(LEGACY_TEMPLATES)
+
+
+def legacy_scripts(prompt):
+    """Old path: escape with chained replace, then format the full template per pane"""
+    js_safe_prompt = prompt.replace('\\', '\\\\').replace('`', '\\`').replace('\n', '\\n').replace("'", "\\'")
+    return [LEGACY_TEMPLATES[name].format(prompt=js_safe_prompt) for name in PROVIDERS]
+
+
+def runtime_scripts(prompt):
+    """New path: encode the payload once, ship a short call per pane"""
+    payload_json = json.dumps({'text': prompt})
+    return [MVC3.build_send_call(name, payload_json) for name in PROVIDERS]
+
+
+def make_prompt(size):
+    line = "Explain `x = a\\b` and don't mangle <p>tags</p> please.\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def bench_python(sizes, number):
+    print(f"{'prompt':>10} {'legacy us':>11} {'runtime us':>11} {'speedup':>8} {'legacy KB':>10} {'runtime KB':>11}")
+    for size in sizes:
+        prompt = make_prompt(size)
+        legacy = min(timeit.repeat(lambda: legacy_scripts(prompt), number=number, repeat=5)) / number
+        runtime = min(timeit.repeat(lambda: runtime_scripts(prompt), number=number, repeat=5)) / number
+        legacy_kb = sum(len(s) for s in legacy_scripts(prompt)) / 1024
+        runtime_kb = sum(len(s) for s in runtime_scripts(prompt)) / 1024
+        print(f"{size:>10} {legacy * 1e6:>11.1f} {runtime * 1e6:>11.1f} {legacy / runtime:>7.1f}x "
+              f"{legacy_kb:>10.1f} {runtime_kb:>11.1f}")
+
+
+# Minimal page carrying every selector the adapters look for, buttons stay disabled
+# so neither path actually clicks and the measurement is injection cost only
+BENCH_PAGE = """<html><body>
+<div id="prompt-textarea" contenteditable="true"></div>
+<div class="ProseMirror" contenteditable="true"></div>
+<textarea placeholder="Ask anything"></textarea>
+<div class="chat-input-editor" contenteditable="true"></div>
+<button data-testid="send-button" disabled></button>
+<button aria-label="Send message" disabled></button>
+<button aria-label="Grok something" disabled></button>
+</body></html>"""
+
+
+def bench_webengine(sizes, rounds):
+    """Time runJavaScript round trips (parse + compile + run) in an offscreen page"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from time import perf_counter
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtWebEngineCore import QWebEngineProfile
+    from PyQt6.QtCore import QEventLoop
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    profile = QWebEngineProfile()
+    profile.scripts().insert(MVC3.build_provider_runtime_script())
+    view = MVC3.QWebEngineView()
+    page = MVC3.QWebEnginePage(profile, view)
+    view.setPage(page)
+
+    loop = QEventLoop()
+    page.loadFinished.connect(lambda ok: loop.quit())
+    page.setHtml(BENCH_PAGE)
+    loop.exec()
+
+    def run_all(scripts, world_id):
+        # Wait for every callback so we time the full renderer round trip
+        pending = [len(scripts)]
+        wait = QEventLoop()
+
+        def done(_):
+            pending[0] -= 1
+            if pending[0] == 0:
+                wait.quit()
+        for script in scripts:
+            page.runJavaScript(script, world_id, done)
+        wait.exec()
+
+    print(f"{'prompt':>10} {'legacy ms':>10} {'runtime ms':>11}")
+    for size in sizes:
+        prompt = make_prompt(size)
+        timings = {}
+        for label, builder, world_id in (('legacy', legacy_scripts, 0),
+                                         ('runtime', runtime_scripts, int(MVC3._RUNTIME_WORLD_ID))):
+            start = perf_counter()
+            for _ in range(rounds):
+                run_all(builder(prompt), world_id)
+            timings[label] = (perf_counter() - start) / rounds
+        print(f"{size:>10} {timings['legacy'] * 1e3:>10.2f} {timings['runtime'] * 1e3:>11.2f}")
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt injection paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 1024, 16 * 1024, 128 * 1024])
+    parser.add_argument('--number', type=int, default=200, help='Python-side iterations per repeat')
+    parser.add_argument('--webengine', action='store_true', help='Also time runJavaScript round trips')
+    parser.add_argument('--rounds', type=int, default=50, help='Broadcast rounds for --webengine')
+    args = parser.parse_args()
+
+    print(f"Broadcast to {len(PROVIDERS)} panes, Python-side payload building:")
+    bench_python(args.sizes, args.number)
+    if args.webengine:
+        print("\nrunJavaScript round trips per broadcast (offscreen QtWebEngine):")
+        bench_webengine(args.sizes, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# Throughput benchmark for the RequestInterceptor blocking path over synthetic URL sets
+#
+# Usage:
+#   python benchmarks/bench_interceptor.py --rules 100000 --requests 200000
+
+import os
+import sys
+import random
+import string
+import argparse
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MVC3
+
+TLDS = ['com', 'net', 'org', 'io', 'ai', 'co.uk', 'de']
+
+
+class FakeUrl:
+    def __init__(self, host):
+        self._host = host
+
+    def host(self):
+        return self._host
+
+
+class FakeRequestInfo:
+    """Stand-in for QWebEngineUrlRequestInfo exposing what interceptRequest touches"""
+    __slots__ = ('_url', '_first_party', '_type', 'blocked')
+
+    def __init__(self, host, first_party='chatgpt.com', resource_type=None):
+        self._url = FakeUrl(host)
+        self._first_party = FakeUrl(first_party)
+        self._type = resource_type or MVC3._ResourceType.ResourceTypeScript
+        self.blocked = False
+
+    def requestUrl(self):
+        return self._url
+
+    def firstPartyUrl(self):
+        return self._first_party
+
+    def resourceType(self):
+        return self._type
+
+    def block(self, value):
+        self.blocked = value
+
+    def setHttpHeader(self, name, value):
+        pass
+
+
+def random_domain(rng):
+    label = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+    return f"{label}.{rng.choice(TLDS)}"
+
+
+def make_rules(rng, count):
+    return [random_domain(rng) for _ in range(count)]
+
+
+def make_hosts(rng, rules, count, hit_ratio):
+    """Mix of blocked hosts (rule or subdomain of one) and typical first-party/CDN hosts"""
+    hosts = []
+    first_party = ['chatgpt.com', 'cdn.oaistatic.com', 'claude.ai', 'assets.claude.ai',
+                   'aistudio.google.com', 'fonts.gstatic.com', 'www.kimi.com', 'x.com', 'abs.twimg.com']
+    for _ in range(count):
+        if rng.random() < hit_ratio:
+            rule = rng.choice(rules)
+            hosts.append(rule if rng.random() < 0.5 else f"cdn{rng.randint(1, 9)}.{rule}")
+        elif rng.random() < 0.7:
+            hosts.append(rng.choice(first_party))
+        else:
+            hosts.append(f"static.{random_domain(rng)}")
+    return hosts
+
+
+def legacy_intercept(block_list, host):
+    """The previous implementation: lower/encode, then a linear substring scan"""
+    url_host = host.lower().encode()
+    for block_domain in block_list:
+        if block_domain in url_host:
+            return True
+    return False
+
+
+def bench(label, func, items):
+    start = perf_counter()
+    for item in items:
+        func(item)
+    elapsed = perf_counter() - start
+    print(f"  {label:<34} {len(items) / elapsed:>12,.0f} req/s {elapsed / len(items) * 1e6:>8.2f} us/req")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the request interceptor blocking path")
+    parser.add_argument('--rules', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--hit-ratio', type=float, default=0.2)
+    parser.add_argument('--legacy-rules', type=int, default=1000,
+                        help='Rule count for the linear-scan baseline (it is O(rules) per request)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = make_rules(rng, args.rules)
+    hosts = make_hosts(rng, rules, args.requests, args.hit_ratio)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Write an EasyList-style file so compile and cache load are measured too
+        with open(os.path.join(directory, "easylist.txt"), 'w') as f:
+            f.write("[Adblock Plus 2.0]\n! synthetic\n")
+            f.writelines(f"||{rule}^\n" for rule in rules)
+        start = perf_counter()
+        blocklist = MVC3.DomainBlocklist.load_directory(directory)
+        compile_s = perf_counter() - start
+        start = perf_counter()
+        MVC3.DomainBlocklist.load_directory(directory)
+        cached_s = perf_counter() - start
+    print(f"{len(blocklist):,} rules: compile {compile_s * 1e3:.0f} ms, cached load {cached_s * 1e3:.0f} ms")
+
+    print(f"{len(hosts):,} requests, {args.hit_ratio:.0%} blocked:")
+    bench("suffix index matches()", blocklist.matches, hosts)
+
+    interceptor = MVC3.RequestInterceptor(blocklist=blocklist)
+    types = [MVC3._ResourceType.ResourceTypeScript, MVC3._ResourceType.ResourceTypeImage,
+             MVC3._ResourceType.ResourceTypeXhr, MVC3._ResourceType.ResourceTypeFontResource]
+    infos = [FakeRequestInfo(host, resource_type=types[i % len(types)]) for i, host in enumerate(hosts)]
+    bench("RequestInterceptor.interceptRequest", interceptor.interceptRequest, infos)
+    interceptor.policy = MVC3.InterceptionPolicy({'chatgpt.com'})
+    bench("interceptRequest, lite mode", interceptor.interceptRequest, infos)
+    interceptor.policy = MVC3.InterceptionPolicy()
+    interceptor.host_stats = MVC3.HostStats()
+    main_frame = FakeRequestInfo('chatgpt.com', resource_type=MVC3._ResourceType.ResourceTypeMainFrame)
+    interceptor.interceptRequest(main_frame)
+    bench("interceptRequest, learning hosts", interceptor.interceptRequest, infos)
+
+    legacy_hosts = hosts[:max(1, len(hosts) // 20)]
+    builtin = {d.encode() for d in MVC3._BLOCK_LIST}
+    bench(f"legacy scan, {len(builtin)} rules", lambda h: legacy_intercept(builtin, h), legacy_hosts)
+    legacy_rules = {d.encode() for d in rules[:args.legacy_rules]}
+    bench(f"legacy scan, {len(legacy_rules):,} rules", lambda h: legacy_intercept(legacy_rules, h), legacy_hosts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# Local stand-in for the AI providers: one page per provider carrying the DOM the provider
+# adapters in MVC3.py look for, answering every prompt with a fake response streamed
+# from this server at a configurable speed. No network access needed.
+#
+# Usage:
+#   python benchmarks/mock_providers.py --port 8765 --chars 2000 --cps 800
+#   then open http://127.0.0.1:8765/ for the provider pages
+
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Provider name -> URL path and the markup matching its adapter selectors.
+# 'turn' is appended per answer, its element matching 'text' receives the streamed text.
+# 'busy_on'/'busy_off' run in the page while a response streams (stop buttons etc).
+PROVIDER_PAGES = {
+    'ChatGPT': {
+        'path': '/chatgpt/',
+        'composer': '<div id="prompt-textarea" contenteditable="true"></div>'
+                    '<button data-testid="send-button" disabled>Send</button>',
+        'input': '#prompt-textarea',
+        'send': 'button[data-testid="send-button"]',
+        'turn': '<div data-message-author-role="assistant"></div>',
+        'text': '[data-message-author-role="assistant"]',
+        'busy_on': "send.setAttribute('data-testid', 'stop-button');",
+        'busy_off': "send.setAttribute('data-testid', 'send-button');",
+    },
+    'Claude': {
+        'path': '/claude/',
+        'composer': '<div class="ProseMirror" contenteditable="true"></div>'
+                    '<button aria-label="Send message" disabled>Send</button>',
+        'input': 'div.ProseMirror',
+        'send': 'button[aria-label="Send message"]',
+        'turn': '<div data-is-streaming="true"><div class="font-claude-response"></div></div>',
+        'text': '.font-claude-response',
+        'busy_on': "",
+        'busy_off': "turn.setAttribute('data-is-streaming', 'false');",
+    },
+    'Grok': {
+        'path': '/grok/',
+        'composer': '<textarea placeholder="Ask anything"></textarea>'
+                    '<button aria-label="Grok something" disabled>Send</button>',
+        'input': 'textarea',
+        'send': 'button[aria-label="Grok something"]',
+        'turn': '<div class="response-content-markdown"></div>',
+        'text': '.response-content-markdown',
+        'busy_on': "controls.insertAdjacentHTML('beforeend', '<button id=\"stop\" aria-label=\"Stop model response\">Stop</button>');",
+        'busy_off': "document.getElementById('stop').remove();",
+    },
+    'AI Studio': {
+        'path': '/aistudio/',
+        'composer': '<ms-autosize-textarea><textarea aria-label="Type something"></textarea></ms-autosize-textarea>'
+                    '<ms-run-button><button aria-label="Run" disabled>Run</button></ms-run-button>',
+        'input': 'ms-autosize-textarea textarea',
+        'send': 'ms-run-button button',
+        'turn': '<ms-chat-turn><div class="chat-turn-container model"></div></ms-chat-turn>',
+        'text': '.chat-turn-container.model',
+        'busy_on': "send.setAttribute('aria-label', 'Stop');",
+        'busy_off': "send.setAttribute('aria-label', 'Run');",
+    },
+    'Kimi K2': {
+        'path': '/kimi/',
+        'composer': '<div class="chat-input-editor" contenteditable="true" data-lexical-editor="true"></div>'
+                    '<div class="send-button-container disabled">Send</div>',
+        'input': '.chat-input-editor',
+        'send': '.send-button-container',
+        'turn': '<div class="segment-assistant"><div class="markdown"></div></div>',
+        'text': '.markdown',
+        'busy_on': "controls.insertAdjacentHTML('beforeend', '<div id=\"stop\" class=\"stop-message-btn\">Stop</div>');",
+        'busy_off': "document.getElementById('stop').remove();",
+    },
+}
+
+# Shared page logic: enable the send control on input, stream the answer into a new turn.
+# window.__mockStats reports event-loop lag while streaming, so capture overhead shows up.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(name)s (mock)</title>
+<style>body{background:#111;color:#ddd;font:14px sans-serif} #thread div{white-space:pre-wrap;margin:8px 0}
+[contenteditable]{white-space:pre-wrap}</style>
+</head><body>
+<div id="thread"></div>
+<div id="controls">%(composer)s</div>
+<script>
+(function(){
+var input = document.querySelector(%(input)s);
+var send = document.querySelector(%(send)s);
+var thread = document.getElementById('thread');
+var controls = document.getElementById('controls');
+function value(){ return 'value' in input ? input.value : input.innerText; }
+function setEnabled(on){
+  if ('disabled' in send) send.disabled = !on;
+  else send.classList.toggle('disabled', !on);
+}
+input.addEventListener('input', function(){ setEnabled(value().trim().length > 0); });
+if (!('value' in input)) {
+  // Like the real rich editors: take pasted text in one go and cancel the native paste
+  input.addEventListener('paste', function(event){
+    event.preventDefault();
+    input.textContent = event.clipboardData.getData('text/plain');
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+  });
+}
+window.__mockStats = {streams: 0};
+function stream(prompt){
+  var turn = document.createElement('div');
+  turn.innerHTML = %(turn)s;
+  turn = turn.firstElementChild;
+  thread.appendChild(turn);
+  var target = turn.matches(%(text)s) ? turn : turn.querySelector(%(text)s);
+  %(busy_on)s
+  var started = performance.now(), lags = [], last = started;
+  var sampler = setInterval(function(){
+    var now = performance.now();
+    lags.push(Math.max(0, now - last - 10));
+    last = now;
+  }, 10);
+  return fetch('/stream', {method: 'POST', body: prompt}).then(function(response){
+    var reader = response.body.getReader(), decoder = new TextDecoder();
+    function pump(){
+      return reader.read().then(function(chunk){
+        if (chunk.done) return;
+        target.textContent += decoder.decode(chunk.value, {stream: true});
+        return pump();
+      });
+    }
+    return pump();
+  }).then(function(){
+    clearInterval(sampler);
+    %(busy_off)s
+    lags.sort(function(a, b){ return a - b; });
+    window.__mockStats = {
+      streams: window.__mockStats.streams + 1,
+      prompt_chars: prompt.length,
+      // Whitespace differs between insert strategies, anything else lost means mangling
+      prompt_nonspace: prompt.replace(/\s+/g, '').length,
+      stream_ms: performance.now() - started,
+      lag_p95_ms: lags.length ? lags[Math.floor(lags.length * 0.95)] : 0,
+      lag_max_ms: lags.length ? lags[lags.length - 1] : 0
+    };
+  });
+}
+// Lets benchmarks stream without going through the app's runtime (no capture attached)
+window.__mockStream = stream;
+// A long conversation in one go: `turns` finished answers of `chars` characters each
+window.__mockFill = function(turns, chars){
+  var words = 'the model streams tokens back while the pane captures them and '.split(' ');
+  for (var i = 0; i < turns; i++) {
+    var holder = document.createElement('div');
+    holder.innerHTML = %(turn)s;
+    var turn = holder.firstElementChild;
+    if (turn.hasAttribute('data-is-streaming')) turn.setAttribute('data-is-streaming', 'false');
+    var target = turn.matches(%(text)s) ? turn : turn.querySelector(%(text)s);
+    var paragraphs = [], length = 0;
+    while (length < chars) {
+      var sentence = [];
+      for (var w = 0; w < 60; w++) sentence.push(words[(i + w + length) %% words.length]);
+      paragraphs.push('<p>' + sentence.join(' ') + ' <code>turn ' + i + '</code></p>');
+      length += sentence.join(' ').length;
+    }
+    target.innerHTML = paragraphs.join('');
+    thread.appendChild(turn);
+  }
+  return document.querySelectorAll('#thread *').length;
+};
+// Rendering cost of the page as it stands; the result lands in window.__mockMeasureResult.
+// layout: full relayout forced by a width change, type: one keystroke plus its layout,
+// frames: rAF intervals while scrolling the whole thread from top to bottom
+window.__mockMeasure = function(){
+  window.__mockMeasureResult = null;
+  var result = {}, t, k;
+  void document.body.offsetHeight;
+  t = performance.now();
+  for (k = 0; k < 10; k++) {
+    document.body.style.width = (k %% 2 ? 900 : 960) + 'px';
+    void document.body.offsetHeight;
+  }
+  result.layout_ms = (performance.now() - t) / 10;
+  document.body.style.width = '';
+  t = performance.now();
+  for (k = 0; k < 20; k++) {
+    if ('value' in input) input.value += 'x'; else input.textContent += 'x';
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    void document.body.offsetHeight;
+  }
+  result.type_ms = (performance.now() - t) / 20;
+  if ('value' in input) input.value = ''; else input.textContent = '';
+  var scroller = document.scrollingElement, frames = [], last = null;
+  scroller.scrollTop = 0;
+  function step(now){
+    if (last !== null) frames.push(now - last);
+    last = now;
+    var before = scroller.scrollTop;
+    scroller.scrollTop = before + 300;
+    if (scroller.scrollTop > before && frames.length < 600) {
+      requestAnimationFrame(step);
+      return;
+    }
+    frames.sort(function(a, b){ return a - b; });
+    result.frames = frames.length;
+    result.frame_p50_ms = frames.length ? frames[Math.floor(frames.length * 0.5)] : 0;
+    result.frame_p95_ms = frames.length ? frames[Math.floor(frames.length * 0.95)] : 0;
+    result.frame_max_ms = frames.length ? frames[frames.length - 1] : 0;
+    result.nodes = document.getElementsByTagName('*').length;
+    window.__mockMeasureResult = result;
+  }
+  requestAnimationFrame(step);
+};
+send.addEventListener('click', function(){
+  if (send.disabled || send.classList.contains('disabled')) return;
+  var prompt = value();
+  if ('value' in input) input.value = ''; else input.textContent = '';
+  setEnabled(false);
+  stream(prompt);
+});
+input.addEventListener('keydown', function(event){
+  if (event.key === 'Enter' && !event.shiftKey) send.click();
+});
+})();
+</script>
+</body></html>"""
+
+WORDS = ("the model streams tokens back while the pane captures them and the "
+         "benchmark measures how long every phase takes ").split()
+
+
+def render_page(name):
+    spec = PROVIDER_PAGES[name]
+    values = {key: json.dumps(spec[key]) for key in ('input', 'send', 'turn', 'text')}
+    values.update(name=name, composer=spec['composer'], busy_on=spec['busy_on'], busy_off=spec['busy_off'])
+    return (PAGE_TEMPLATE % values).encode('utf-8')
+
+
+def fake_response(chars, prompt_chars):
+    text = f"Received {prompt_chars} chars. "
+    i = 0
+    while len(text) < chars:
+        text += WORDS[i % len(WORDS)] + " "
+        i += 1
+    return text[:chars]
+
+
+class MockProviderServer:
+    """Threaded HTTP server for the mock provider pages, usable from benchmarks"""
+
+    def __init__(self, port=0, chars=2000, cps=800, ttft_ms=300, chunk_chars=16):
+        self.chars = chars
+        self.cps = cps
+        self.ttft_ms = ttft_ms
+        self.chunk_chars = chunk_chars
+        self.pages = {spec['path']: render_page(name) for name, spec in PROVIDER_PAGES.items()}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/':
+                    links = "".join(f'<p><a href="{spec["path"]}">{name}</a></p>'
+                                    for name, spec in PROVIDER_PAGES.items())
+                    self._send(200, 'text/html; charset=utf-8', links.encode('utf-8'))
+                elif path in server.pages:
+                    self._send(200, 'text/html; charset=utf-8', server.pages[path])
+                else:
+                    self._send(404, 'text/plain', b'not found')
+
+            def do_POST(self):
+                if self.path != '/stream':
+                    self._send(404, 'text/plain', b'not found')
+                    return
+                prompt = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                text = fake_response(server.chars, len(prompt.decode('utf-8', 'replace')))
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                time.sleep(server.ttft_ms / 1000)
+                delay = server.chunk_chars / server.cps if server.cps else 0
+                for start in range(0, len(text), server.chunk_chars):
+                    data = text[start:start + server.chunk_chars].encode('utf-8')
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                    if delay:
+                        time.sleep(delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = None
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.port}{PROVIDER_PAGES[name]['path']}"
+
+    def target_urls(self):
+        """Config 'target_urls' pointing every provider at this server"""
+        return {name: self.url(name) for name in PROVIDER_PAGES}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-providers", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock AI provider pages locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--chars', type=int, default=2000, help='Characters per response')
+    parser.add_argument('--cps', type=int, default=800, help='Streaming speed, characters per second (0: instant)')
+    parser.add_argument('--ttft-ms', type=int, default=300, help='Delay before the first chunk')
+    args = parser.parse_args()
+
+    server = MockProviderServer(args.port, args.chars, args.cps, args.ttft_ms)
+    print(f"Mock providers on http://127.0.0.1:{server.port}/")
+    for name in PROVIDER_PAGES:
+        print(f"  {name:<10} {server.url(name)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()